@@ -1,46 +1,298 @@
+import base64
+import difflib
+import gzip
+import hashlib
+import heapq
 import json
+import zlib
 import os
-from datetime import datetime
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from datetime import datetime, timezone
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Dict, List, Any, Optional, Tuple
 from urllib.parse import quote
 from decimal import Decimal
 import re
 import math
+import threading
+from collections import OrderedDict, deque
+from functools import lru_cache
+import time
+import xml.etree.ElementTree as ET
 
 try:
     import boto3  # type: ignore
+    from botocore.config import Config as BotoConfig  # type: ignore
 except Exception:
     boto3 = None
+    BotoConfig = None
 
-# Initialize AWS services (optional in local dev)
-dynamodb = boto3.resource('dynamodb') if boto3 else None
+try:
+    from amazondax import AmazonDaxClient  # type: ignore
+except Exception:
+    AmazonDaxClient = None
+
+# Optional faster JSON codec for cache blobs, API responses and OpenAI stream chunks.
+# Not in requirements.txt (native wheel); the stdlib json path produces the same data.
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None
+
+# Optional C implementation of token_set_ratio for fuzzy dedup; _token_set_ratio below
+# is the pure-Python equivalent used when it is not packaged.
+try:
+    from rapidfuzz import fuzz as rapidfuzz_fuzz  # type: ignore
+except Exception:
+    rapidfuzz_fuzz = None
+
+# Initialize AWS services (optional in local dev). The cache is an optimization, so fail fast
+# (botocore defaults to 60s connect/read timeouts) and keep connections alive between the
+# read and write of one invocation.
+DYNAMODB_CONNECT_TIMEOUT_SECONDS = float(os.environ.get('DYNAMODB_CONNECT_TIMEOUT_SECONDS', '1'))
+DYNAMODB_READ_TIMEOUT_SECONDS = float(os.environ.get('DYNAMODB_READ_TIMEOUT_SECONDS', '2'))
+_DYNAMODB_CONFIG = BotoConfig(
+    connect_timeout=DYNAMODB_CONNECT_TIMEOUT_SECONDS,
+    read_timeout=DYNAMODB_READ_TIMEOUT_SECONDS,
+    retries={'max_attempts': 2, 'mode': 'standard'},
+    tcp_keepalive=True,
+    max_pool_connections=50,
+) if BotoConfig else None
+dynamodb = boto3.resource('dynamodb', config=_DYNAMODB_CONFIG) if boto3 else None
+
+# Optional DynamoDB Accelerator: when a cluster endpoint is configured (and the amazondax
+# client is packaged), cache reads/writes go through DAX with the same Table API.
+DAX_ENDPOINT = (os.environ.get('DAX_ENDPOINT') or '').strip()
+if DAX_ENDPOINT and AmazonDaxClient is not None:
+    try:
+        dynamodb = AmazonDaxClient.resource(endpoint_url=DAX_ENDPOINT)
+    except Exception as e:
+        print(f"DAX init error, using DynamoDB directly: {str(e)}")
 table_name = os.environ.get('DYNAMODB_TABLE', 'academic-papers-cache')
+# Shared Table resource; creating it per call re-builds the resource wrapper each time.
+_TABLE = dynamodb.Table(table_name) if dynamodb else None
+
+# Optional SQS queue for deferred landscape summaries (deferSummary requests). The search
+# returns straight away with the metadata-only summary; this Lambda, subscribed to the same
+# queue, generates the AI summary and caches it for the next identical search.
+SEARCH_SUMMARY_QUEUE_URL = (os.environ.get('SEARCH_SUMMARY_QUEUE_URL') or '').strip()
+_SQS = boto3.client('sqs') if boto3 and SEARCH_SUMMARY_QUEUE_URL else None
 
 DEFAULT_USER_AGENT = os.environ.get('HTTP_USER_AGENT', 'academic-literature-ai/1.0')
 
+# Pooled keep-alive session for upstream search APIs, Semantic Scholar enrichment and OpenAI.
+# It lives at module scope so warm Lambda invocations reuse TCP/TLS connections; transient
+# 429/5xx get a short retry with backoff (idempotent methods only, so POSTs are not replayed).
+SESSION = requests.Session()
+SESSION.headers.update({'User-Agent': DEFAULT_USER_AGENT})
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=16,
+    max_retries=Retry(
+        total=2,
+        backoff_factor=0.2,
+        status_forcelist=(429, 500, 502, 503, 504),
+        raise_on_status=False,
+    ),
+))
+
 DEEP_OVERVIEW_TTL_SECONDS = int(os.environ.get('DEEP_OVERVIEW_TTL_SECONDS', str(24 * 60 * 60)))
 SEARCH_DEFAULT_LIMIT = int(os.environ.get('SEARCH_DEFAULT_LIMIT', '20'))
 SEARCH_MAX_LIMIT = int(os.environ.get('SEARCH_MAX_LIMIT', '100'))
 SEARCH_OVERFETCH_FACTOR = float(os.environ.get('SEARCH_OVERFETCH_FACTOR', '2.0'))
 SEARCH_SOURCE_MAX_FETCH = int(os.environ.get('SEARCH_SOURCE_MAX_FETCH', '80'))
 SEARCH_HTTP_TIMEOUT_SECONDS = int(os.environ.get('SEARCH_HTTP_TIMEOUT_SECONDS', '20'))
-SEARCH_ENABLE_CROSSREF_DEFAULT = (os.environ.get('SEARCH_ENABLE_CROSSREF_DEFAULT', 'true').strip().lower() in {'1', 'true', 'yes', 'y', 'on'})
+SEARCH_HTTP_CONNECT_TIMEOUT_SECONDS = float(os.environ.get('SEARCH_HTTP_CONNECT_TIMEOUT_SECONDS', '3'))
+# (connect, read): an unreachable host fails fast instead of consuming the whole read budget.
+SEARCH_HTTP_TIMEOUT = (SEARCH_HTTP_CONNECT_TIMEOUT_SECONDS, SEARCH_HTTP_TIMEOUT_SECONDS)
+# Issue a duplicate OpenAlex request if the first has not answered within this many seconds (0 disables).
+SEARCH_HEDGE_AFTER_SECONDS = float(os.environ.get('SEARCH_HEDGE_AFTER_SECONDS', '1.5'))
+AI_SUMMARY_SLIM_MAX_PAPERS = int(os.environ.get('AI_SUMMARY_SLIM_MAX_PAPERS', '5'))
+# Output caps for the search summary JSON: roughly 1.5x what the full (~470 tokens) and
+# slim (~330 tokens) schemas need when filled in. A cap only cuts off a long answer, it does
+# not speed up a normal one, so headroom is free; a truncated answer is unparseable JSON.
+AI_SUMMARY_MAX_TOKENS = int(os.environ.get('AI_SUMMARY_MAX_TOKENS', '700'))
+AI_SUMMARY_SLIM_MAX_TOKENS = int(os.environ.get('AI_SUMMARY_SLIM_MAX_TOKENS', '500'))
+AI_SUMMARY_TTL_SECONDS = int(os.environ.get('AI_SUMMARY_TTL_SECONDS', str(24 * 60 * 60)))
+# Wall-clock caps on a streamed completion (the HTTP timeout only bounds each socket read).
+AI_SUMMARY_DEADLINE_SECONDS = float(os.environ.get('AI_SUMMARY_DEADLINE_SECONDS', '12'))
+DEEP_OVERVIEW_DEADLINE_SECONDS = float(os.environ.get('DEEP_OVERVIEW_DEADLINE_SECONDS', '25'))
+# Below these counts the model adds little over the metadata-only fallback, so skip the call.
+AI_SUMMARY_MIN_PAPERS = int(os.environ.get('AI_SUMMARY_MIN_PAPERS', '3'))
+DEEP_OVERVIEW_MIN_PAPERS = int(os.environ.get('DEEP_OVERVIEW_MIN_PAPERS', '5'))
+# Total abstract characters sent to the deep overview (~4 chars/token, so ~4k input tokens),
+# split evenly across the selected papers; each abstract keeps at least the minimum.
+DEEP_OVERVIEW_ABSTRACT_CHAR_BUDGET = int(os.environ.get('DEEP_OVERVIEW_ABSTRACT_CHAR_BUDGET', '16000'))
+DEEP_OVERVIEW_ABSTRACT_MIN_CHARS = int(os.environ.get('DEEP_OVERVIEW_ABSTRACT_MIN_CHARS', '300'))
+# 'diversity' (source-interleaved heuristic) or 'rrf' (Reciprocal Rank Fusion); clients may override via rankStrategy.
+SEARCH_RELEVANCE_STRATEGY = (os.environ.get('SEARCH_RELEVANCE_STRATEGY', 'diversity') or 'diversity').strip().lower()
+SEARCH_RRF_K = int(os.environ.get('SEARCH_RRF_K', '60'))
+# Stop waiting on slower sources once the finished ones already yield plenty of unique
+# candidates (limit * overfetch * 2). Off by default; never applied to debug requests.
+_TRUE_STRINGS = frozenset(('1', 'true', 'yes', 'y', 'on'))
+_FALSE_STRINGS = frozenset(('0', 'false', 'no', 'n', 'off'))
+
+SEARCH_EARLY_EXIT = (os.environ.get('SEARCH_EARLY_EXIT', 'false').strip().lower() in _TRUE_STRINGS)
+# Start the AI summary from OpenAlex's results while slower sources are still in flight.
+# Hides the OpenAI round-trip, at the cost of summarizing OpenAlex's top papers rather than
+# the final merged ranking. Off by default.
+SEARCH_SPECULATIVE_SUMMARY = (os.environ.get('SEARCH_SPECULATIVE_SUMMARY', 'false').strip().lower() in _TRUE_STRINGS)
+# Gzip large responses for clients sending Accept-Encoding: gzip. Off by default: REST APIs
+# need binary media types configured to decode isBase64Encoded bodies (HTTP APIs do not).
+SEARCH_RESPONSE_GZIP = (os.environ.get('SEARCH_RESPONSE_GZIP', 'false').strip().lower() in _TRUE_STRINGS)
+SEARCH_RESPONSE_GZIP_MIN_BYTES = int(os.environ.get('SEARCH_RESPONSE_GZIP_MIN_BYTES', '4096'))
+SEARCH_ENABLE_CROSSREF_DEFAULT = (os.environ.get('SEARCH_ENABLE_CROSSREF_DEFAULT', 'true').strip().lower() in _TRUE_STRINGS)
+# Second dedup pass for cross-source near-duplicates ("... (Preprint)", "Part II" casing):
+# same year, a shared author surname and title token_set_ratio >= this. 0 disables it.
+SEARCH_FUZZY_DEDUP_MIN_RATIO = float(os.environ.get('SEARCH_FUZZY_DEDUP_MIN_RATIO', '95'))
+
+# Cached blobs are stored as zlib-compressed JSON (Binary attribute) to stay well under
+# DynamoDB's 400KB item limit and cut WCU cost, under '<name>_z' attributes. Items
+# without the marker (legacy uncompressed entries) are still readable.
+CACHE_BLOB_FORMAT = 'z1'
+CACHE_BLOB_LEVEL = 6
+SEARCH_L1_CACHE_SIZE = int(os.environ.get('SEARCH_L1_CACHE_SIZE', '256'))
+SEARCH_L1_CACHE_TTL_SECONDS = int(os.environ.get('SEARCH_L1_CACHE_TTL_SECONDS', str(DEEP_OVERVIEW_TTL_SECONDS)))
+# Per-source response memo keyed on each source's call arguments: request variants that
+# share an upstream call (Crossref or arXiv toggled, a retry of the same search) reuse that
+# source's raw results. OpenAlex and Crossref apply sort and year filters upstream (OpenAlex also
+# min citations), so changing those only reuses Semantic Scholar and arXiv results.
+SEARCH_SOURCE_CACHE_SIZE = int(os.environ.get('SEARCH_SOURCE_CACHE_SIZE', '64'))
+SEARCH_SOURCE_CACHE_TTL_SECONDS = int(os.environ.get('SEARCH_SOURCE_CACHE_TTL_SECONDS', '600'))
+
+class _TTLCache:
+    """Small thread-safe LRU with per-entry expiry, kept in process memory across warm invocations."""
+
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._data: 'OrderedDict[str, Tuple[float, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        if self.maxsize <= 0:
+            return
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+# L1 in front of the DynamoDB search cache: popular queries on a warm container skip the
+# GetItem round-trip entirely.
+_L1_CACHE = _TTLCache(SEARCH_L1_CACHE_SIZE, SEARCH_L1_CACHE_TTL_SECONDS)
+
+_SOURCE_CACHE = _TTLCache(SEARCH_SOURCE_CACHE_SIZE, SEARCH_SOURCE_CACHE_TTL_SECONDS)
+
+# Topic -> OpenAlex concept IDs. Topics repeat a lot, so this saves a /concepts round-trip;
+# empty resolutions are kept only briefly in case the topic was just too new or misspelled.
+_CONCEPT_CACHE = _TTLCache(512, 24 * 60 * 60)
+CONCEPT_NEGATIVE_TTL_SECONDS = 5 * 60
+
+
+def _decimal_scalar(value: Decimal) -> Any:
+    # to_integral_value() comparison avoids a modulo on arbitrary-precision decimals.
+    return int(value) if value == value.to_integral_value() else float(value)
+
 
 def decimal_to_number(obj):
-    """Convert Decimal objects to int or float for JSON serialization"""
-    if isinstance(obj, list):
-        return [decimal_to_number(item) for item in obj]
-    elif isinstance(obj, dict):
-        return {key: decimal_to_number(value) for key, value in obj.items()}
-    elif isinstance(obj, Decimal):
-        if obj % 1 == 0:
-            return int(obj)
-        else:
-            return float(obj)
-    else:
+    """Convert Decimal objects to int or float for JSON serialization.
+
+    Walks the structure with an explicit stack (no per-node recursion), dispatches on the
+    exact type and rewrites Decimals in place, so containers are not copied. Returns `obj`
+    (or the converted scalar when `obj` itself is a Decimal).
+    """
+    t = type(obj)
+    if t is Decimal:
+        return _decimal_scalar(obj)
+    if t is not dict and t is not list:
         return obj
 
+    stack = [obj]
+    while stack:
+        node = stack.pop()
+        for key, value in (node.items() if type(node) is dict else enumerate(node)):
+            vt = type(value)
+            if vt is Decimal:
+                node[key] = _decimal_scalar(value)
+            elif vt is dict or vt is list:
+                stack.append(value)
+    return obj
+
+
+def json_dumps_bytes(value: Any) -> bytes:
+    """Compact JSON as UTF-8 bytes, via orjson when it is packaged."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # e.g. a stray Decimal; the stdlib encoder reports it the usual way
+    return json.dumps(value, separators=(',', ':')).encode('utf-8')
+
+
+def json_loads(data: Any) -> Any:
+    """Parse JSON from str or bytes, via orjson when it is packaged."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def pack_cache_blob(value: Any) -> bytes:
+    """Serialize a cache payload to zlib-compressed JSON bytes."""
+    return zlib.compress(json_dumps_bytes(value), CACHE_BLOB_LEVEL)
+
+
+def unpack_cache_blob(item: Dict[str, Any], blob_attr: str, legacy_attr: str) -> Any:
+    """Read a cache payload written by pack_cache_blob, falling back to the legacy attribute.
+
+    Blob payloads parse straight to ints/floats; only legacy native-attribute items carry
+    DynamoDB Decimals, so only they get the decimal_to_number walk.
+    """
+    if item.get('fmt') == CACHE_BLOB_FORMAT and blob_attr in item:
+        raw = item[blob_attr]
+        # boto3 wraps Binary attributes in boto3.dynamodb.types.Binary
+        raw = bytes(getattr(raw, 'value', raw))
+        return json_loads(zlib.decompress(raw))
+    return decimal_to_number(item.get(legacy_attr))
+
+
+def utc_timestamp(epoch: int) -> str:
+    """ISO-8601 UTC timestamp for cache items (explicit offset, so region TZ never skews ages)."""
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat()
+
+
+def cache_age_seconds(timestamp: str) -> float:
+    # Legacy items carry naive local-time stamps; fromisoformat().timestamp() handles both forms.
+    return time.time() - datetime.fromisoformat(timestamp).timestamp()
+
+
+def cache_item_fresh(item: Dict[str, Any], max_age_seconds: int) -> bool:
+    """True while a cache item is within its lifetime.
+
+    Items carry their integer `ttl` expiry epoch (also used by DynamoDB TTL), so freshness
+    is one int compare; only old items without it fall back to parsing `timestamp`.
+    """
+    ttl = item.get('ttl')
+    if ttl is not None:
+        return int(ttl) > time.time()
+    return cache_age_seconds(item['timestamp']) < max_age_seconds
+
 
 def parse_event_body(event: Dict[str, Any]) -> Dict[str, Any]:
     """Parse request payload from either API Gateway proxy events or direct Lambda test events."""
@@ -52,7 +304,7 @@ def parse_event_body(event: Dict[str, Any]) -> Dict[str, Any]:
         if not body:
             return {}
         try:
-            return json.loads(body)
+            return json_loads(body)
         except Exception:
             return {}
 
@@ -67,6 +319,15 @@ def parse_event_body(event: Dict[str, Any]) -> Dict[str, Any]:
     return {}
 
 
+def _json_get(response: Any) -> Any:
+    """Decode a JSON response body straight from bytes.
+
+    Skips requests' text-decoding step (charset lookup + str copy); both json.loads and
+    orjson read the bytes directly.
+    """
+    return json_loads(response.content)
+
+
 def clamp_int(value: Any, default: int, min_value: int, max_value: int) -> int:
     try:
         parsed = int(value)
@@ -82,9 +343,9 @@ def as_bool(value: Any, default: bool = False) -> bool:
         return value
     if isinstance(value, str):
         v = value.strip().lower()
-        if v in {'1', 'true', 'yes', 'y', 'on'}:
+        if v in _TRUE_STRINGS:
             return True
-        if v in {'0', 'false', 'no', 'n', 'off'}:
+        if v in _FALSE_STRINGS:
             return False
     return bool(value)
 
@@ -107,8 +368,12 @@ def lambda_handler(event, context):
     }
     """
     try:
+        if is_sqs_event(event):
+            return handle_summary_jobs(event)
+
         # Parse request body (supports API Gateway proxy + direct Lambda tests)
         body = parse_event_body(event)
+        gzip_ok = SEARCH_RESPONSE_GZIP and accepts_gzip(event)
         query = (body.get('query', '') or '').strip()
         field = (body.get('field', '') or '').strip()
         limit = clamp_int(body.get('limit'), SEARCH_DEFAULT_LIMIT, 1, SEARCH_MAX_LIMIT)
@@ -122,11 +387,16 @@ def lambda_handler(event, context):
         include_crossref = body.get('includeCrossref', None)
         deep_overview = bool(body.get('deepOverview', False))
         deep_overview_max_papers = body.get('deepOverviewMaxPapers', None)
+        deep_overview_batch = as_bool(body.get('deepOverviewBatch', None), False)
+        defer_summary = as_bool(body.get('deferSummary', None), False)
         force_refresh = bool(body.get('forceRefresh', False))
         debug = bool(body.get('debug', False))
 
         if sort_mode not in {'relevance', 'citations', 'date'}:
             sort_mode = 'relevance'
+        rank_strategy = (body.get('rankStrategy') or SEARCH_RELEVANCE_STRATEGY or 'diversity').strip().lower()
+        if rank_strategy not in RANK_STRATEGIES:
+            rank_strategy = 'diversity'
 
         # Default behavior: arXiv is opt-in (otherwise it can skew results toward physics/CS).
         # If a client explicitly sets includeArxiv, respect it.
@@ -146,7 +416,7 @@ def lambda_handler(event, context):
         if topic and not resolved_concept_ids:
             resolved_concept_ids = resolve_openalex_concepts(topic)
 
-        cache_key = build_cache_key(
+        cache_canonical = canonical_search_params(
             query,
             field,
             sort_mode,
@@ -156,30 +426,29 @@ def lambda_handler(event, context):
             from_year=from_year,
             to_year=to_year,
             min_citations=min_citations,
+            rank_strategy=rank_strategy,
         )
+        cache_key = cache_key_for(cache_canonical)
 
         # Check cache first
         cached_result = None if force_refresh else check_cache(cache_key)
         if cached_result:
-            # Convert any Decimal objects from DynamoDB
-            cached_result = decimal_to_number(cached_result)
-
             # Apply filters to cached papers if requested
             filtered_cached = apply_filters(cached_result, from_year, to_year, min_citations)
 
             # Generate a summary even for cached results (so UI can show it)
-            overall_summary = generate_search_summary(query, filtered_cached[:limit], ['cache'])
-
-            deep_overview_result = None
-            if deep_overview:
-                deep_overview_result = generate_deep_overview(
-                    query,
-                    filtered_cached[:limit],
-                    max_papers=deep_overview_max_papers,
-                    cache_key=cache_key,
-                    force_refresh=force_refresh,
-                )
-            return create_response(200, {
+            overall_summary, deep_overview_result = summarize_results(
+                query,
+                filtered_cached[:limit],
+                ['cache'],
+                deep_overview=deep_overview,
+                deep_overview_max_papers=deep_overview_max_papers,
+                deep_overview_batch=deep_overview_batch,
+                defer_summary=defer_summary,
+                cache_key=cache_key,
+                force_refresh=force_refresh,
+            )
+            return create_response(200, gzip_ok=gzip_ok, body={
                 'papers': filtered_cached[:limit],
                 'count': len(filtered_cached[:limit]),
                 'cached': True,
@@ -190,6 +459,7 @@ def lambda_handler(event, context):
                 **({'debug': {
                     'forceRefresh': force_refresh,
                     'sort': sort_mode,
+                    'rankStrategy': rank_strategy,
                     'topic': topic,
                     'conceptIds': resolved_concept_ids,
                     'includeArxiv': include_arxiv,
@@ -199,150 +469,61 @@ def lambda_handler(event, context):
                 }} if debug else {})
             })
         
-        # Search multiple sources
-        all_papers = []
-        sources_used = []
-        next_rank = 0
-
-        source_debug: Dict[str, Any] = {}
-        
-        # 1. OpenAlex (primary - best rate limits)
-        try:
-            openalex_papers = search_openalex(
-                query,
-                field,
-                source_fetch_limit,
-                from_year,
-                to_year,
-                min_citations,
-                sort_mode=sort_mode,
-                concept_ids=resolved_concept_ids,
-            )
-            openalex_papers, next_rank = attach_rank(openalex_papers, next_rank, 'OpenAlex')
-            all_papers.extend(openalex_papers)
-            sources_used.append('OpenAlex')
-            source_debug['openalex'] = {
-                'ok': True,
-                'count': len(openalex_papers),
-            }
-            print(f"OpenAlex returned {len(openalex_papers)} papers")
-        except Exception as e:
-            print(f"OpenAlex error: {str(e)}")
-            source_debug['openalex'] = {
-                'ok': False,
-                'error': str(e),
-            }
-        
-        # 2. Semantic Scholar (broad coverage)
-        try:
-            ss_papers = search_semantic_scholar(query, field, source_fetch_limit)
-            ss_papers, next_rank = attach_rank(ss_papers, next_rank, 'Semantic Scholar')
-            all_papers.extend(ss_papers)
-            sources_used.append('Semantic Scholar')
-            source_debug['semanticScholar'] = {
-                'ok': True,
-                'count': len(ss_papers),
-            }
-            print(f"Semantic Scholar returned {len(ss_papers)} papers")
-        except Exception as e:
-            print(f"Semantic Scholar error: {str(e)}")
-            source_debug['semanticScholar'] = {
-                'ok': False,
-                'error': str(e),
-            }
+        speculative: Dict[str, Future] = {}
+        speculative_pool = ThreadPoolExecutor(max_workers=1) if SEARCH_SPECULATIVE_SUMMARY and not defer_summary else None
 
-        # 3. Crossref (broad cross-discipline bibliographic coverage)
-        if include_crossref:
-            try:
-                crossref_papers = search_crossref(
+        def start_speculative_summary(name: str, papers: List[Dict[str, Any]]) -> None:
+            if name == 'OpenAlex' and len(papers) >= AI_SUMMARY_MIN_PAPERS and not speculative:
+                speculative['summary'] = speculative_pool.submit(
+                    generate_search_summary,
                     query,
-                    field,
-                    source_fetch_limit,
-                    from_year=from_year,
-                    to_year=to_year,
-                    sort_mode=sort_mode,
+                    [dict(p) for p in papers[:limit]],
+                    ['OpenAlex'],
+                    cache_key=cache_key,
+                    force_refresh=force_refresh,
                 )
-                crossref_papers, next_rank = attach_rank(crossref_papers, next_rank, 'Crossref')
-                all_papers.extend(crossref_papers)
-                sources_used.append('Crossref')
-                source_debug['crossref'] = {
-                    'ok': True,
-                    'count': len(crossref_papers),
-                }
-                print(f"Crossref returned {len(crossref_papers)} papers")
-            except Exception as e:
-                print(f"Crossref error: {str(e)}")
-                source_debug['crossref'] = {
-                    'ok': False,
-                    'error': str(e),
-                }
-        else:
-            source_debug['crossref'] = {
-                'ok': True,
-                'count': 0,
-                'skipped': True,
-            }
 
-        # 4. arXiv (opt-in preprints; can skew non-STEM queries)
-        if include_arxiv:
-            try:
-                arxiv_papers = search_arxiv(query, source_fetch_limit)
-                # arXiv doesn't provide citation counts; enrich via Semantic Scholar when possible.
-                arxiv_papers = enrich_arxiv_with_semantic_scholar(arxiv_papers)
-                arxiv_papers, next_rank = attach_rank(arxiv_papers, next_rank, 'arXiv')
-                all_papers.extend(arxiv_papers)
-                sources_used.append('arXiv')
-                source_debug['arxiv'] = {
-                    'ok': True,
-                    'count': len(arxiv_papers),
-                }
-                print(f"arXiv returned {len(arxiv_papers)} papers")
-            except Exception as e:
-                print(f"arXiv error: {str(e)}")
-                source_debug['arxiv'] = {
-                    'ok': False,
-                    'error': str(e),
-                }
-        
-        # Remove duplicates (by DOI or title)
-        unique_papers = deduplicate_papers(all_papers)
+        result_papers, sources_used, source_debug = search_all_sources(
+            query,
+            field,
+            limit=limit,
+            source_fetch_limit=source_fetch_limit,
+            from_year=from_year,
+            to_year=to_year,
+            min_citations=min_citations,
+            sort_mode=sort_mode,
+            concept_ids=resolved_concept_ids,
+            include_crossref=include_crossref,
+            include_arxiv=include_arxiv,
+            rank_strategy=rank_strategy,
+            debug=debug,
+            force_refresh=force_refresh,
+            on_source_result=start_speculative_summary if speculative_pool is not None else None,
+        )
 
-        # Apply filters (for sources that don't support them well)
-        unique_papers = apply_filters(unique_papers, from_year, to_year, min_citations)
-        
-        # Respect requested sort. Relevance mode uses source-diversified ranking.
-        if sort_mode == 'citations':
-            unique_papers.sort(key=lambda p: (safe_int(p.get('citationCount'), 0), safe_int(p.get('year'), 0)), reverse=True)
-            result_papers = unique_papers[:limit]
-        elif sort_mode == 'date':
-            unique_papers.sort(key=lambda p: (safe_int(p.get('year'), 0), safe_int(p.get('citationCount'), 0)), reverse=True)
-            result_papers = unique_papers[:limit]
-        else:
-            result_papers = relevance_rank_with_source_diversity(unique_papers, limit)
+        # Cache results in the background while the summary is generated; the write is
+        # joined before returning so it never outlives the invocation (Lambda freezes then).
+        cache_write_future = _CACHE_WRITER.submit(cache_results, cache_key, result_papers, canonical=cache_canonical)
 
-        # Remove internal fields
-        for p in result_papers:
-            for key in ('_rank', '_sourceRank', '_relevanceScore'):
-                if key in p:
-                    del p[key]
-        
         # Generate overall summary of the search results
-        overall_summary = generate_search_summary(query, result_papers, sources_used)
+        overall_summary, deep_overview_result = summarize_results(
+            query,
+            result_papers,
+            sources_used,
+            deep_overview=deep_overview,
+            deep_overview_max_papers=deep_overview_max_papers,
+            deep_overview_batch=deep_overview_batch,
+            defer_summary=defer_summary,
+            cache_key=cache_key,
+            force_refresh=force_refresh,
+            summary_future=speculative.get('summary'),
+        )
+        if speculative_pool is not None:
+            speculative_pool.shutdown(wait=False)
 
-        deep_overview_result = None
-        if deep_overview:
-            deep_overview_result = generate_deep_overview(
-                query,
-                result_papers,
-                max_papers=deep_overview_max_papers,
-                cache_key=cache_key,
-                force_refresh=force_refresh,
-            )
-        
-        # Cache results
-        cache_results(cache_key, result_papers)
+        cache_write = cache_write_future.result()
         
-        return create_response(200, {
+        return create_response(200, gzip_ok=gzip_ok, body={
             'papers': result_papers,
             'count': len(result_papers),
             'cached': False,
@@ -353,6 +534,7 @@ def lambda_handler(event, context):
             **({'debug': {
                 'forceRefresh': force_refresh,
                 'sort': sort_mode,
+                'rankStrategy': rank_strategy,
                 'topic': topic,
                 'conceptIds': resolved_concept_ids,
                 'includeArxiv': include_arxiv,
@@ -360,6 +542,7 @@ def lambda_handler(event, context):
                 'deepOverview': deep_overview,
                 'sourceFetchLimit': source_fetch_limit,
                 'sources': source_debug,
+                'cacheWrite': cache_write,
                 'openai': overall_summary.get('_meta', None) if isinstance(overall_summary, dict) else None,
             }} if debug else {})
         })
@@ -369,6 +552,260 @@ def lambda_handler(event, context):
         return create_response(500, {'error': f'Internal server error: {str(e)}'})
 
 
+SOURCE_DEBUG_KEYS = {
+    'OpenAlex': 'openalex',
+    'Semantic Scholar': 'semanticScholar',
+    'Crossref': 'crossref',
+    'arXiv': 'arxiv',
+}
+
+
+def _run_source(name: str, fn: Any, *args: Any, **kwargs: Any) -> Tuple[str, bool, Any]:
+    """Run one source search on a worker thread, returning (name, ok, papers_or_exception)."""
+    try:
+        return name, True, fn(*args, **kwargs)
+    except Exception as e:
+        return name, False, e
+
+
+def _run_source_memo(name: str, fn: Any, args: tuple, kwargs: Dict[str, Any], use_memo: bool) -> Tuple[str, bool, Any]:
+    """_run_source behind the per-source memo (use_memo=False skips the lookup, not the store).
+
+    Callers mutate the returned paper dicts (ranks, provenance), so both the stored and the
+    served lists are shallow copies.
+    """
+    memo_key = repr((name, args, sorted(kwargs.items())))
+    if use_memo:
+        hit = _SOURCE_CACHE.get(memo_key)
+        if hit is not None:
+            return name, True, [dict(p) for p in hit]
+    name, ok, result = _run_source(name, fn, *args, **kwargs)
+    if ok:
+        _SOURCE_CACHE.set(memo_key, [dict(p) for p in result])
+    return name, ok, result
+
+
+def search_arxiv_enriched(query: str, limit: int) -> List[Dict[str, Any]]:
+    # arXiv doesn't provide citation counts; enrich via Semantic Scholar when possible.
+    return enrich_arxiv_with_semantic_scholar(search_arxiv(query, limit))
+
+
+def search_all_sources(
+    query: str,
+    field: str,
+    *,
+    limit: int,
+    source_fetch_limit: int,
+    from_year: Any,
+    to_year: Any,
+    min_citations: Any,
+    sort_mode: str,
+    concept_ids: List[str],
+    include_crossref: bool,
+    include_arxiv: bool,
+    rank_strategy: str = 'diversity',
+    debug: bool = False,
+    force_refresh: bool = False,
+    on_source_result: Optional[Any] = None,
+) -> Tuple[List[Dict[str, Any]], List[str], Dict[str, Any]]:
+    """Fan out to every enabled source, then de-duplicate, filter and rank.
+
+    Returns (result_papers, sources_used, source_debug). force_refresh bypasses the
+    per-source memo (fresh results are still stored). on_source_result(name, papers), if
+    given, is called as each source succeeds, before ranking touches its papers.
+    """
+    # Search multiple sources concurrently; wall time tracks the slowest upstream
+    # rather than the sum. Jobs are listed in priority order so ranks stay deterministic.
+    all_papers = []
+    sources_used = []
+    next_rank = 0
+
+    source_debug: Dict[str, Any] = {}
+
+    jobs: List[Tuple[str, Any, tuple, Dict[str, Any]]] = [
+        # OpenAlex (primary - best rate limits)
+        ('OpenAlex', search_openalex, (query, field, source_fetch_limit, from_year, to_year, min_citations), {
+            'sort_mode': sort_mode,
+            'concept_ids': concept_ids,
+        }),
+        # Semantic Scholar (broad coverage)
+        ('Semantic Scholar', search_semantic_scholar, (query, field, source_fetch_limit), {}),
+    ]
+    # Crossref (broad cross-discipline bibliographic coverage)
+    if include_crossref:
+        jobs.append(('Crossref', search_crossref, (query, field, source_fetch_limit), {
+            'from_year': from_year,
+            'to_year': to_year,
+            'sort_mode': sort_mode,
+        }))
+    else:
+        source_debug['crossref'] = {
+            'ok': True,
+            'count': 0,
+            'skipped': True,
+        }
+    # arXiv (opt-in preprints; can skew non-STEM queries)
+    if include_arxiv:
+        jobs.append(('arXiv', search_arxiv_enriched, (query, source_fetch_limit), {}))
+
+    early_exit_at = int(limit * SEARCH_OVERFETCH_FACTOR * 2) if SEARCH_EARLY_EXIT and not debug else None
+    completed: Dict[str, Tuple[bool, Any]] = {}
+    seen_keys: set = set()
+    executor = ThreadPoolExecutor(max_workers=len(jobs))
+    try:
+        futures = [
+            executor.submit(_run_source_memo, name, fn, args, kwargs, not force_refresh)
+            for name, fn, args, kwargs in jobs
+        ]
+        for fut in as_completed(futures):
+            name, ok, result = fut.result()
+            completed[name] = (ok, result)
+            if on_source_result is not None and ok:
+                try:
+                    on_source_result(name, result)
+                except Exception as e:
+                    print(f"Source result hook error: {str(e)}")
+            if early_exit_at is not None and ok and len(completed) < len(futures):
+                seen_keys.update(dedupe_key(p) for p in result)
+                if len(seen_keys) >= early_exit_at:
+                    break
+    finally:
+        # On early exit, stragglers finish in the background and are discarded.
+        executor.shutdown(wait=False)
+
+    # Merge in the fixed job order regardless of completion order.
+    outcomes = []
+    for name, *_ in jobs:
+        if name in completed:
+            outcomes.append((name, *completed[name]))
+        else:
+            source_debug[SOURCE_DEBUG_KEYS[name]] = {
+                'ok': True,
+                'count': 0,
+                'skipped': True,
+                'reason': 'early_exit',
+            }
+
+    for name, ok, result in outcomes:
+        debug_key = SOURCE_DEBUG_KEYS[name]
+        if not ok:
+            print(f"{name} error: {str(result)}")
+            source_debug[debug_key] = {
+                'ok': False,
+                'error': str(result),
+            }
+            continue
+        ranked, next_rank = attach_rank(result, next_rank, name)
+        all_papers.extend(ranked)
+        sources_used.append(name)
+        source_debug[debug_key] = {
+            'ok': True,
+            'count': len(ranked),
+        }
+        print(f"{name} returned {len(ranked)} papers")
+
+    # Remove duplicates (by DOI or title)
+    unique_papers = deduplicate_papers(all_papers)
+
+    # Apply filters (for sources that don't support them well)
+    unique_papers = apply_filters(unique_papers, from_year, to_year, min_citations)
+    
+    # Respect requested sort. Relevance mode uses source-diversified ranking.
+    if sort_mode == 'citations':
+        result_papers = sort_by_int_fields(unique_papers, ('citationCount', 'year'), limit)
+    elif sort_mode == 'date':
+        result_papers = sort_by_int_fields(unique_papers, ('year', 'citationCount'), limit)
+    elif rank_strategy == 'rrf':
+        result_papers = relevance_rank_rrf(unique_papers, limit)
+    else:
+        result_papers = relevance_rank_with_source_diversity(unique_papers, limit)
+
+    # Drop internal bookkeeping fields (all underscore-prefixed) in one pass over the page.
+    result_papers = [{k: v for k, v in p.items() if not k.startswith('_')} for p in result_papers]
+
+    return result_papers, sources_used, source_debug
+
+
+def _int_column(papers: List[Dict], field: str) -> List[int]:
+    """Pull one numeric field out of every paper, skipping safe_int for values that are already ints."""
+    column = []
+    append = column.append
+    for p in papers:
+        v = p.get(field)
+        append(v if type(v) is int else safe_int(v, 0))
+    return column
+
+
+def sort_by_int_fields(papers: List[Dict], fields: Tuple[str, ...], limit: Optional[int] = None) -> List[Dict]:
+    """Order papers descending by integer fields (first field is primary), stable for ties.
+
+    Keys are extracted column-wise once, so the sort compares plain int tuples instead of
+    calling back into dict lookups and safe_int per comparison key. With a `limit` below the
+    input size only the top `limit` are selected (heapq.nlargest, same order as a full sort).
+    """
+    if len(papers) < 2:
+        return list(papers[:limit] if limit is not None else papers)
+    keys = list(zip(*(_int_column(papers, f) for f in fields)))
+    if limit is not None and limit < len(papers):
+        order = heapq.nlargest(limit, range(len(papers)), key=keys.__getitem__)
+    else:
+        order = sorted(range(len(papers)), key=keys.__getitem__, reverse=True)
+    return [papers[i] for i in order]
+
+
+def summarize_results(
+    query: str,
+    papers: List[Dict[str, Any]],
+    sources: List[str],
+    *,
+    deep_overview: bool,
+    deep_overview_max_papers: Any,
+    cache_key: str,
+    force_refresh: bool,
+    deep_overview_batch: bool = False,
+    defer_summary: bool = False,
+    summary_future: Optional[Future] = None,
+) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """Generate the landscape summary and, when requested, the deep overview.
+
+    The two are independent OpenAI round-trips, so they run on worker threads and the
+    response waits for the slower of the two rather than their sum. A summary_future
+    (speculative summary already running) is used instead of starting a new one.
+    """
+    if not deep_overview:
+        if summary_future is not None:
+            return summary_future.result(), None
+        return generate_search_summary(
+            query, papers, sources, cache_key=cache_key, force_refresh=force_refresh, defer=defer_summary
+        ), None
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        if summary_future is None:
+            summary_future = executor.submit(
+                generate_search_summary, query, papers, sources,
+                cache_key=cache_key, force_refresh=force_refresh, defer=defer_summary,
+            )
+        deep_future = executor.submit(
+            generate_deep_overview,
+            query,
+            papers,
+            max_papers=deep_overview_max_papers,
+            cache_key=cache_key,
+            force_refresh=force_refresh,
+            batch=deep_overview_batch,
+        )
+        return summary_future.result(), deep_future.result()
+
+
+@lru_cache(maxsize=1024)
+def _normalize_concept_id(cid: str) -> Optional[str]:
+    cid_s = cid.strip()
+    # Accept full URLs like https://openalex.org/C123...
+    if cid_s.startswith('http') and '/C' in cid_s:
+        cid_s = 'C' + cid_s.rsplit('/C', 1)[-1]
+    return cid_s if cid_s.startswith('C') else None
+
+
 def normalize_concept_ids(concept_ids_raw: Any) -> List[str]:
     if not concept_ids_raw:
         return []
@@ -383,14 +820,8 @@ def normalize_concept_ids(concept_ids_raw: Any) -> List[str]:
     for cid in concept_ids:
         if not cid:
             continue
-        cid_s = str(cid).strip()
-        if not cid_s:
-            continue
-        # Accept full URLs like https://openalex.org/C123...
-        if cid_s.startswith('http') and '/C' in cid_s:
-            cid_s = cid_s.rsplit('/C', 1)[-1]
-            cid_s = 'C' + cid_s
-        if cid_s.startswith('C'):
+        cid_s = _normalize_concept_id(str(cid))
+        if cid_s:
             normalized.append(cid_s)
 
     # de-dupe while preserving order
@@ -404,24 +835,72 @@ def normalize_concept_ids(concept_ids_raw: Any) -> List[str]:
     return out
 
 
+def _hedged_get(
+    url: str,
+    *,
+    params: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, str]] = None,
+    hedge_after: Optional[float] = None,
+) -> requests.Response:
+    """GET with a hedged duplicate: if no answer within ``hedge_after`` seconds, send a second
+    identical request and return whichever succeeds first (trims the slow-upstream tail).
+    """
+    hedge_after = SEARCH_HEDGE_AFTER_SECONDS if hedge_after is None else hedge_after
+    if hedge_after <= 0:
+        return SESSION.get(url, params=params, headers=headers, timeout=SEARCH_HTTP_TIMEOUT)
+
+    executor = ThreadPoolExecutor(max_workers=2)
+    try:
+        first = executor.submit(SESSION.get, url, params=params, headers=headers, timeout=SEARCH_HTTP_TIMEOUT)
+        done, _ = wait([first], timeout=hedge_after)
+        if done:
+            return first.result()
+
+        second = executor.submit(SESSION.get, url, params=params, headers=headers, timeout=SEARCH_HTTP_TIMEOUT)
+        pending = {first, second}
+        fallback: Optional[requests.Response] = None
+        error: Optional[Exception] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                try:
+                    resp = fut.result()
+                except Exception as e:
+                    error = e
+                    continue
+                if resp.ok:
+                    return resp
+                fallback = resp
+        if fallback is not None:
+            return fallback
+        raise error  # type: ignore[misc]
+    finally:
+        # Don't wait on the losing request; it finishes (and is discarded) in the background.
+        executor.shutdown(wait=False)
+
+
 def resolve_openalex_concepts(topic: str, max_results: int = 2) -> List[str]:
     """Resolve a human topic string (e.g. 'quantum computing') to OpenAlex concept IDs."""
     topic = (topic or '').strip()
     if not topic:
         return []
 
+    cache_key = f"{topic.lower()}|{max_results}"
+    hit = _CONCEPT_CACHE.get(cache_key)
+    if hit is not None:
+        return list(hit)
+
     try:
-        response = requests.get(
+        response = SESSION.get(
             'https://api.openalex.org/concepts',
             params={
                 'search': topic,
                 'per_page': max(1, min(max_results, 5)),
             },
-            headers={'User-Agent': DEFAULT_USER_AGENT},
-            timeout=min(SEARCH_HTTP_TIMEOUT_SECONDS, 12),
+            timeout=(SEARCH_HTTP_CONNECT_TIMEOUT_SECONDS, min(SEARCH_HTTP_TIMEOUT_SECONDS, 12)),
         )
         response.raise_for_status()
-        data = response.json()
+        data = _json_get(response)
         results = data.get('results', [])
         concept_ids: List[str] = []
         for r in results:
@@ -429,13 +908,27 @@ def resolve_openalex_concepts(topic: str, max_results: int = 2) -> List[str]:
             if not cid:
                 continue
             concept_ids.extend(normalize_concept_ids(cid))
-        return concept_ids[:max_results]
+        concept_ids = concept_ids[:max_results]
+        _CONCEPT_CACHE.set(cache_key, tuple(concept_ids), None if concept_ids else CONCEPT_NEGATIVE_TTL_SECONDS)
+        return concept_ids
     except Exception as e:
         print(f"OpenAlex concept resolution error: {str(e)}")
         return []
 
 
-def build_cache_key(
+def _norm_int(x: Any) -> Optional[Any]:
+    if x is None:
+        return None
+    s = str(x).strip()
+    if not s:
+        return None
+    try:
+        return int(s)
+    except Exception:
+        return s
+
+
+def canonical_search_params(
     query: str,
     field: str,
     sort_mode: str,
@@ -446,27 +939,57 @@ def build_cache_key(
     from_year: Any = None,
     to_year: Any = None,
     min_citations: Any = None,
+    rank_strategy: str = 'diversity',
 ) -> str:
+    """Canonical JSON of everything that changes a search's results (stable key order, no spaces).
+
+    Query and field are lowercased with whitespace collapsed, so 'Quantum  ML ' and 'quantum ml'
+    share one cache entry.
+    """
     sort_mode = (sort_mode or 'relevance').strip().lower()
-    concept_part = '|'.join(concept_ids) if concept_ids else ''
-    include_part = '1' if include_arxiv else '0'
-    crossref_part = '1' if include_crossref else '0'
-
-    def _norm_int(x: Any) -> str:
-        if x is None:
-            return ''
-        s = str(x).strip()
-        if not s:
-            return ''
-        try:
-            return str(int(s))
-        except Exception:
-            return s
 
-    fy = _norm_int(from_year)
-    ty = _norm_int(to_year)
-    mc = _norm_int(min_citations)
-    return f"{query}:{field}:sort={sort_mode}:concepts={concept_part}:arxiv={include_part}:crossref={crossref_part}:from={fy}:to={ty}:mincit={mc}"
+    return json.dumps({
+        'q': ' '.join((query or '').lower().split()),
+        'f': ' '.join((field or '').lower().split()),
+        'sort': sort_mode,
+        'c': sorted(concept_ids or []),
+        'ax': bool(include_arxiv),
+        'cr': bool(include_crossref),
+        'fy': _norm_int(from_year),
+        'ty': _norm_int(to_year),
+        'mc': _norm_int(min_citations),
+        # Rank strategy only affects relevance ordering; other sorts share one entry.
+        'rank': (rank_strategy or 'diversity') if sort_mode == 'relevance' else None,
+    }, sort_keys=True, separators=(',', ':'))
+
+
+def cache_key_for(canonical: str) -> str:
+    """Fixed-width 32-hex-char partition key for a canonical parameter string."""
+    return hashlib.blake2b(canonical.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def build_cache_key(
+    query: str,
+    field: str,
+    sort_mode: str,
+    concept_ids: List[str],
+    **kwargs: Any,
+) -> str:
+    return cache_key_for(canonical_search_params(query, field, sort_mode, concept_ids, **kwargs))
+
+
+def reconstruct_abstract(abstract_inverted: Dict[str, List[int]]) -> str:
+    """Rebuild abstract text from OpenAlex's {word: [positions]} inverted index.
+
+    Words are written straight into a position-indexed buffer, so no (pos, word) tuples are
+    built and nothing needs sorting.
+    """
+    max_pos = max((max(positions) for positions in abstract_inverted.values() if positions), default=-1)
+    buf: List[Optional[str]] = [None] * (max_pos + 1)
+    for word, positions in abstract_inverted.items():
+        for pos in positions:
+            buf[pos] = word
+    return ' '.join([w for w in buf if w is not None])
 
 
 def search_openalex(
@@ -501,6 +1024,9 @@ def search_openalex(
         'search': search_query,
         'per_page': limit,
         'sort': sort_param,
+        # Only the fields _format_openalex_work reads; full work objects carry concepts,
+        # referenced_works, locations, etc. and are several times larger.
+        'select': OPENALEX_WORK_FIELDS,
         'mailto': os.environ.get('OPENALEX_MAILTO', 'your-email@example.com')
     }
 
@@ -541,59 +1067,67 @@ def search_openalex(
     if filters:
         params['filter'] = ','.join(filters)
     
-    response = requests.get(base_url, params=params, headers={'User-Agent': DEFAULT_USER_AGENT}, timeout=SEARCH_HTTP_TIMEOUT_SECONDS)
+    response = _hedged_get(base_url, params=params)
     response.raise_for_status()
     
-    data = response.json()
+    data = _json_get(response)
     results = data.get('results', [])
     
     # Format papers
-    formatted_papers = []
-    for work in results:
-        # Get first author
-        authors = []
-        for authorship in work.get('authorships', [])[:5]:  # Limit to 5 authors
-            author = authorship.get('author', {})
-            if author.get('display_name'):
-                authors.append(author['display_name'])
-        
-        # Get open access PDF
-        pdf_url = None
-        open_access = work.get('open_access', {})
-        if open_access.get('is_oa') and open_access.get('oa_url'):
-            pdf_url = open_access['oa_url']
-        
-        # OpenAlex returns abstract as inverted index - convert it to readable text
-        abstract_text = None
-        abstract_inverted = work.get('abstract_inverted_index')
-        if abstract_inverted and isinstance(abstract_inverted, dict):
-            try:
-                # Reconstruct abstract from inverted index
-                word_positions = []
-                for word, positions in abstract_inverted.items():
-                    for pos in positions:
-                        word_positions.append((pos, word))
-                word_positions.sort(key=lambda x: x[0])
-                abstract_text = ' '.join([word for _, word in word_positions])
-            except Exception:
-                abstract_text = None
-        
-        formatted_papers.append({
-            'paperId': work.get('id', '').split('/')[-1],  # Extract ID from URL
-            'title': work.get('title'),
-            'abstract': abstract_text,
-            'authors': authors,
-            'year': work.get('publication_year'),
-            'citationCount': int(work.get('cited_by_count', 0) or 0),
-            'publicationDate': work.get('publication_date'),
-            'venue': work.get('primary_location', {}).get('source', {}).get('display_name'),
-            'url': work.get('id'),
-            'doi': work.get('doi'),
-            'pdfUrl': pdf_url,
-            'source': 'OpenAlex'
-        })
+    return [_format_openalex_work(work) for work in results]
+
+
+OPENALEX_WORK_FIELDS = ','.join([
+    'id',
+    'display_name',
+    'authorships',
+    'abstract_inverted_index',
+    'open_access',
+    'publication_year',
+    'cited_by_count',
+    'publication_date',
+    'primary_location',
+    'doi',
+])
+
+
+def _format_openalex_work(work: Dict[str, Any]) -> Dict[str, Any]:
+    # Get first authors (limit to 5)
+    authors = [
+        author['display_name']
+        for author in (authorship.get('author', {}) for authorship in work.get('authorships', [])[:5])
+        if author.get('display_name')
+    ]
     
-    return formatted_papers
+    # Get open access PDF
+    pdf_url = None
+    open_access = work.get('open_access', {})
+    if open_access.get('is_oa') and open_access.get('oa_url'):
+        pdf_url = open_access['oa_url']
+    
+    # OpenAlex returns abstract as inverted index - convert it to readable text
+    abstract_text = None
+    abstract_inverted = work.get('abstract_inverted_index')
+    if abstract_inverted and isinstance(abstract_inverted, dict):
+        try:
+            abstract_text = reconstruct_abstract(abstract_inverted)
+        except Exception:
+            abstract_text = None
+    
+    return {
+        'paperId': work.get('id', '').split('/')[-1],  # Extract ID from URL
+        'title': work.get('title') or work.get('display_name'),
+        'abstract': abstract_text,
+        'authors': authors,
+        'year': work.get('publication_year'),
+        'citationCount': int(work.get('cited_by_count', 0) or 0),
+        'publicationDate': work.get('publication_date'),
+        'venue': ((work.get('primary_location') or {}).get('source') or {}).get('display_name'),
+        'url': work.get('id'),
+        'doi': work.get('doi'),
+        'pdfUrl': pdf_url,
+        'source': 'OpenAlex'
+    }
 
 
 def search_arxiv(query: str, limit: int) -> List[Dict[str, Any]]:
@@ -610,48 +1144,79 @@ def search_arxiv(query: str, limit: int) -> List[Dict[str, Any]]:
         'sortBy': 'relevance',
         'sortOrder': 'descending'
     }
-    
-    response = requests.get(base_url, params=params, headers={'User-Agent': DEFAULT_USER_AGENT}, timeout=SEARCH_HTTP_TIMEOUT_SECONDS)
-    response.raise_for_status()
-    
-    # Parse XML response
-    import xml.etree.ElementTree as ET
-    root = ET.fromstring(response.content)
-    
-    # Namespace handling
-    ns = {'atom': 'http://www.w3.org/2005/Atom'}
-    
+
     formatted_papers = []
-    for entry in root.findall('atom:entry', ns):
-        # Extract authors
-        authors = [author.find('atom:name', ns).text for author in entry.findall('atom:author', ns)]
-        
-        # Extract arxiv ID from ID URL
-        paper_id = entry.find('atom:id', ns).text.split('/abs/')[-1]
-        
-        # Get publication date
-        published = entry.find('atom:published', ns).text[:4]  # Year only
-        
-        # PDF URL
-        pdf_url = f"https://arxiv.org/pdf/{paper_id}.pdf"
-        
-        formatted_papers.append({
-            'paperId': paper_id,
-            'title': entry.find('atom:title', ns).text.strip(),
-            'abstract': entry.find('atom:summary', ns).text.strip(),
-            'authors': authors,
-            'year': int(published),
-            'publicationDate': entry.find('atom:published', ns).text[:10],
-            'venue': 'arXiv',
-            'url': entry.find('atom:id', ns).text,
-            'doi': None,
-            'pdfUrl': pdf_url,
-            'source': 'arXiv'
-        })
-    
+    with SESSION.get(base_url, params=params, timeout=SEARCH_HTTP_TIMEOUT, stream=True) as response:
+        response.raise_for_status()
+        response.raw.decode_content = True
+        for entry in _iter_atom_entries(response.raw):
+            formatted_papers.append(_format_arxiv_entry(entry))
+            entry.clear()
+
     return formatted_papers
 
 
+_ATOM = '{http://www.w3.org/2005/Atom}'
+_ATOM_ENTRY_TAG = _ATOM + 'entry'
+_ATOM_AUTHOR_TAG = _ATOM + 'author'
+_ATOM_NAME_TAG = _ATOM + 'name'
+_ARXIV_DOI_TAG = '{http://arxiv.org/schemas/atom}doi'
+
+
+def _iter_atom_entries(stream: Any):
+    """Yield each Atom <entry> as soon as it is fully parsed from the streamed feed.
+
+    Finished entries are dropped from the root, so the whole tree is never held in memory.
+    """
+    root = None
+    for event, elem in ET.iterparse(stream, events=('start', 'end')):
+        if root is None:
+            root = elem
+            continue
+        if event == 'end' and elem.tag == _ATOM_ENTRY_TAG:
+            yield elem
+            root.remove(elem)
+
+
+def _format_arxiv_entry(entry: Any) -> Dict[str, Any]:
+    """Map one Atom <entry> element to the common paper shape.
+
+    Children are walked once into a tag -> text map rather than issuing a find() per field.
+    """
+    fields: Dict[str, Optional[str]] = {}
+    authors: List[Optional[str]] = []
+    for child in entry:
+        tag = child.tag
+        if tag == _ATOM_AUTHOR_TAG:
+            name = child.find(_ATOM_NAME_TAG)
+            authors.append(name.text if name is not None else None)
+        elif tag not in fields:
+            fields[tag] = child.text
+
+    entry_url = fields.get(_ATOM + 'id')
+    published = fields.get(_ATOM + 'published')
+
+    # Extract arxiv ID from ID URL
+    paper_id = entry_url.split('/abs/')[-1]
+    # Prefer the journal DOI arXiv reports for published versions; otherwise use arXiv's own
+    # DataCite DOI, which is how OpenAlex/Crossref list the preprint, so dedup can merge them.
+    doi = (fields.get(_ARXIV_DOI_TAG) or '').strip() or f"10.48550/arXiv.{canonicalize_arxiv_id(paper_id)}"
+    
+    return {
+        'paperId': paper_id,
+        'title': fields.get(_ATOM + 'title').strip(),
+        'abstract': fields.get(_ATOM + 'summary').strip(),
+        'authors': authors,
+        'year': int(published[:4]),  # Year only
+        'publicationDate': published[:10],
+        'venue': 'arXiv',
+        'url': entry_url,
+        'doi': doi,
+        'pdfUrl': f"https://arxiv.org/pdf/{paper_id}.pdf",
+        'source': 'arXiv'
+    }
+
+
 def search_semantic_scholar(query: str, field: str, limit: int) -> List[Dict[str, Any]]:
     """
     Search papers using Semantic Scholar API
@@ -670,38 +1235,38 @@ def search_semantic_scholar(query: str, field: str, limit: int) -> List[Dict[str
         'fields': 'paperId,title,abstract,authors,year,citationCount,publicationDate,venue,url,openAccessPdf'
     }
     
-    headers = {'Accept': 'application/json', 'User-Agent': DEFAULT_USER_AGENT}
+    headers = {'Accept': 'application/json'}
     
     # Add API key if available
     api_key = os.environ.get('SEMANTIC_SCHOLAR_API_KEY')
     if api_key:
         headers['x-api-key'] = api_key
     
-    response = requests.get(base_url, params=params, headers=headers, timeout=SEARCH_HTTP_TIMEOUT_SECONDS)
+    response = SESSION.get(base_url, params=params, headers=headers, timeout=SEARCH_HTTP_TIMEOUT)
     response.raise_for_status()
     
-    data = response.json()
+    data = _json_get(response)
     papers = data.get('data', [])
     
     # Format papers
-    formatted_papers = []
-    for paper in papers:
-        formatted_papers.append({
-            'paperId': paper.get('paperId'),
-            'title': paper.get('title'),
-            'abstract': paper.get('abstract'),
-            'authors': [author.get('name') for author in paper.get('authors', [])],
-            'year': paper.get('year'),
-            'citationCount': paper.get('citationCount', 0),
-            'publicationDate': paper.get('publicationDate'),
-            'venue': paper.get('venue'),
-            'url': paper.get('url'),
-            'doi': None,  # Not provided by default
-            'pdfUrl': paper.get('openAccessPdf', {}).get('url') if paper.get('openAccessPdf') else None,
-            'source': 'Semantic Scholar'
-        })
-    
-    return formatted_papers
+    return [_format_semantic_scholar_paper(paper) for paper in papers]
+
+
+def _format_semantic_scholar_paper(paper: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'paperId': paper.get('paperId'),
+        'title': paper.get('title'),
+        'abstract': paper.get('abstract'),
+        'authors': [author.get('name') for author in paper.get('authors', [])],
+        'year': paper.get('year'),
+        'citationCount': paper.get('citationCount', 0),
+        'publicationDate': paper.get('publicationDate'),
+        'venue': paper.get('venue'),
+        'url': paper.get('url'),
+        'doi': None,  # Not provided by default
+        'pdfUrl': paper.get('openAccessPdf', {}).get('url') if paper.get('openAccessPdf') else None,
+        'source': 'Semantic Scholar'
+    }
 
 
 def search_crossref(
@@ -747,58 +1312,186 @@ def search_crossref(
     if filters:
         params['filter'] = ','.join(filters)
 
-    response = requests.get(base_url, params=params, headers={'User-Agent': DEFAULT_USER_AGENT}, timeout=SEARCH_HTTP_TIMEOUT_SECONDS)
+    response = SESSION.get(base_url, params=params, timeout=SEARCH_HTTP_TIMEOUT)
     response.raise_for_status()
 
-    data = response.json() or {}
+    data = _json_get(response) or {}
     items = (((data.get('message') or {}).get('items')) or [])
-    formatted_papers: List[Dict[str, Any]] = []
-    for item in items:
-        title_list = item.get('title') or []
-        container_titles = item.get('container-title') or []
-        issued = item.get('issued') or {}
-        date_parts = issued.get('date-parts') or []
-        year = None
-        if date_parts and isinstance(date_parts, list) and date_parts[0]:
-            try:
-                year = int(date_parts[0][0])
-            except Exception:
-                year = None
-        authors: List[str] = []
-        for a in item.get('author', []) or []:
-            family = (a.get('family') or '').strip()
-            given = (a.get('given') or '').strip()
-            name = f"{given} {family}".strip()
-            if name:
-                authors.append(name)
-        doi = (item.get('DOI') or '').strip().lower()
-        formatted_papers.append({
-            'paperId': doi.replace('/', '_') if doi else '',
-            'title': title_list[0] if title_list else None,
-            'abstract': None,
-            'authors': authors,
-            'year': year,
-            'citationCount': safe_int(item.get('is-referenced-by-count'), 0),
-            'publicationDate': f"{year}-01-01" if year else None,
-            'venue': container_titles[0] if container_titles else None,
-            'url': item.get('URL'),
-            'doi': doi or None,
-            'pdfUrl': None,
-            'source': 'Crossref',
-        })
-    return formatted_papers
+    return [_format_crossref_item(item) for item in items]
 
 
-def deduplicate_papers(papers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Remove duplicate papers based on DOI or title similarity.
-
-    If duplicates exist, keep the best record (prefer higher citations, richer metadata, earlier _rank).
+def _format_crossref_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    title_list = item.get('title') or []
+    container_titles = item.get('container-title') or []
+    issued = item.get('issued') or {}
+    date_parts = issued.get('date-parts') or []
+    year = None
+    if date_parts and isinstance(date_parts, list) and date_parts[0]:
+        try:
+            year = int(date_parts[0][0])
+        except Exception:
+            year = None
+    authors: List[str] = []
+    for a in item.get('author', []) or []:
+        family = (a.get('family') or '').strip()
+        given = (a.get('given') or '').strip()
+        name = f"{given} {family}".strip()
+        if name:
+            authors.append(name)
+    doi = (item.get('DOI') or '').strip().lower()
+    return {
+        'paperId': doi.replace('/', '_') if doi else '',
+        'title': title_list[0] if title_list else None,
+        'abstract': None,
+        'authors': authors,
+        'year': year,
+        'citationCount': safe_int(item.get('is-referenced-by-count'), 0),
+        'publicationDate': f"{year}-01-01" if year else None,
+        'venue': container_titles[0] if container_titles else None,
+        'url': item.get('URL'),
+        'doi': doi or None,
+        'pdfUrl': None,
+        'source': 'Crossref',
+    }
+
+
+# Everything that is neither alphanumeric nor whitespace (\w also admits '_', so drop it explicitly).
+_TITLE_PUNCT_RE = re.compile(r'[^\w\s]|_')
+
+
+# Same character class as _TITLE_PUNCT_RE, restricted to ASCII, as a bytes.translate deletion set.
+_ASCII_TITLE_PUNCT = bytes(c for c in range(128) if _TITLE_PUNCT_RE.match(chr(c)))
+
+
+def normalize_title(t: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace.
+
+    Most titles are plain ASCII, where deleting bytes with bytes.translate beats the regex
+    engine; anything else goes through the Unicode-aware regex.
+    """
+    t = t or ''
+    if t.isascii():
+        return ' '.join(t.encode('ascii').translate(None, _ASCII_TITLE_PUNCT).decode('ascii').lower().split())
+    return ' '.join(_TITLE_PUNCT_RE.sub('', t).lower().split())
+
+
+_DOI_PREFIXES = ('https://doi.org/', 'http://doi.org/', 'https://dx.doi.org/', 'http://dx.doi.org/', 'doi:')
+
+
+def normalize_doi(doi: Any) -> str:
+    """Lowercased bare DOI; OpenAlex returns https://doi.org/... URLs, Crossref bare DOIs."""
+    doi = (doi or '').strip().lower()
+    for prefix in _DOI_PREFIXES:
+        if doi.startswith(prefix):
+            return doi[len(prefix):]
+    return doi
+
+
+def dedupe_key(p: Dict[str, Any]) -> Any:
+    """The identity deduplicate_papers merges on: DOI, else normalized title.
+
+    Memoized on the paper as _dedupeKey (and _normTitle), so the early-exit count, attach_rank
+    and deduplication all share one normalization per record.
+    """
+    key = p.get('_dedupeKey')
+    if key is not None:
+        return key
+    doi = normalize_doi(p.get('doi'))
+    if doi:
+        key = f"doi:{doi}"
+    else:
+        title = p.get('_normTitle')
+        if title is None:
+            title = p['_normTitle'] = normalize_title(p.get('title', ''))
+        key = f"title:{title}" if title else id(p)
+    p['_dedupeKey'] = key
+    return key
+
+
+def _indel_ratio(a: str, b: str, score_cutoff: float = 0) -> float:
+    """0-100 similarity 2*M/T (difflib ratio); 0 when the cheap upper bounds rule out the cutoff."""
+    sm = difflib.SequenceMatcher(None, a, b, autojunk=False)
+    if 100.0 * sm.real_quick_ratio() < score_cutoff or 100.0 * sm.quick_ratio() < score_cutoff:
+        return 0.0
+    ratio = 100.0 * sm.ratio()
+    return ratio if ratio >= score_cutoff else 0.0
+
+
+# token_set_ratio scores any word subset as 100, so "Deep learning" would match "Deep learning
+# for medical imaging: a survey". Below this shorter/longer token-count ratio the plain
+# ratio of the whole titles is used instead.
+TITLE_SUBSET_MIN_TOKEN_RATIO = 0.6
+
+
+def _token_set_ratio(a: str, b: str, score_cutoff: float = 0) -> float:
+    """token_set_ratio: 100 when one title's words are a subset of the other's, else the best
+    2*M/T over the shared/differing token strings. Returns 0 below score_cutoff.
+
+    Titles of very different length (see TITLE_SUBSET_MIN_TOKEN_RATIO) are compared whole.
     """
+    tokens_a, tokens_b = set(a.split()), set(b.split())
+    if not tokens_a or not tokens_b:
+        return 0.0
+    shorter, longer = sorted((len(tokens_a), len(tokens_b)))
+    if shorter < TITLE_SUBSET_MIN_TOKEN_RATIO * longer:
+        return _indel_ratio(a, b, score_cutoff)
+    if rapidfuzz_fuzz is not None:
+        return rapidfuzz_fuzz.token_set_ratio(a, b, score_cutoff=score_cutoff)
+    common = tokens_a & tokens_b
+    if common and (tokens_a <= tokens_b or tokens_b <= tokens_a):
+        return 100.0
+    sect = ' '.join(sorted(common))
+    diff_ab = ' '.join(sorted(tokens_a - tokens_b))
+    diff_ba = ' '.join(sorted(tokens_b - tokens_a))
+    combined_ab = f"{sect} {diff_ab}".strip()
+    combined_ba = f"{sect} {diff_ba}".strip()
+    best = _indel_ratio(combined_ab, combined_ba, score_cutoff)
+    if sect:
+        best = max(best, _indel_ratio(sect, combined_ab, score_cutoff), _indel_ratio(sect, combined_ba, score_cutoff))
+    return best
+
+
+# Front-matter notices share their parent paper's title and authors but are separate works.
+_NOTICE_TITLE_WORDS = frozenset(('erratum', 'corrigendum', 'correction', 'retraction', 'retracted', 'addendum', 'reply', 'comment'))
+
+
+def fuzzy_merge_blocked(a: Dict[str, Any], b: Dict[str, Any]) -> bool:
+    """True when two title-similar records are known to be different works.
+
+    Two different DOIs mean two works (a paper and its erratum), except arXiv DOIs
+    (10.48550/arxiv.*), which a preprint keeps alongside its published version's DOI.
+    A notice word (erratum, reply, ...) in only one of the titles also blocks the merge.
+    """
+    doi_a, doi_b = normalize_doi(a.get('doi')), normalize_doi(b.get('doi'))
+    if (doi_a and doi_b and doi_a != doi_b
+            and not doi_a.startswith('10.48550/arxiv.') and not doi_b.startswith('10.48550/arxiv.')):
+        return True
+    notices_a = _NOTICE_TITLE_WORDS.intersection((a.get('_normTitle') or '').split())
+    notices_b = _NOTICE_TITLE_WORDS.intersection((b.get('_normTitle') or '').split())
+    return notices_a != notices_b
+
+
+def author_surnames(p: Dict[str, Any]) -> List[str]:
+    """Lowercased author surnames ('Smith, J.' and 'J. Smith' both give 'smith')."""
+    surnames: List[str] = []
+    for name in p.get('authors') or []:
+        if not isinstance(name, str):
+            continue
+        if ',' in name:
+            surname = normalize_title(name.split(',', 1)[0])
+        else:
+            parts = name.split()
+            surname = normalize_title(parts[-1]) if parts else ''
+        if surname and surname not in surnames:
+            surnames.append(surname)
+    return surnames
+
+
+def deduplicate_papers(papers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Remove duplicate papers based on DOI or title similarity.
 
-    def norm_title(t: str) -> str:
-        t = t or ''
-        t = ''.join(c.lower() for c in t if c.isalnum() or c.isspace())
-        return ' '.join(t.split())
+    If duplicates exist, keep the best record (prefer higher citations, richer metadata, earlier _rank).
+    """
 
     def score(p: Dict[str, Any]) -> Tuple[int, int, int, int]:
         citations = int(p.get('citationCount', 0) or 0)
@@ -816,47 +1509,114 @@ def deduplicate_papers(papers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
                 merged.append(src_s)
         return merged
 
+    def merge_source_ranks(a: Dict[str, Any], b: Dict[str, Any]) -> Dict[str, int]:
+        # Keep each source's best (lowest) position for rank fusion.
+        ranks = dict(a.get('_sourceRanks') or {})
+        for src, r in (b.get('_sourceRanks') or {}).items():
+            ranks[src] = min(ranks.get(src, r), r)
+        return ranks
+
+    def merge(existing: Dict[str, Any], kept_score: Tuple[int, int, int, int],
+              p: Dict[str, Any], p_score: Tuple[int, int, int, int]) -> Tuple[Dict[str, Any], Tuple[int, int, int, int]]:
+        if p_score > kept_score:
+            winner, other, kept_score = p, existing, p_score
+        else:
+            winner, other = existing, p
+
+        # Preserve earliest rank across representations
+        if winner.get('_rank') is not None and other.get('_rank') is not None:
+            winner['_rank'] = min(int(winner['_rank']), int(other['_rank']))
+            kept_score = kept_score[:3] + (-int(winner['_rank'] or 10**9),)
+        if winner.get('_sourceRank') is not None and other.get('_sourceRank') is not None:
+            winner['_sourceRank'] = min(int(winner['_sourceRank']), int(other['_sourceRank']))
+        winner['_sourceRanks'] = merge_source_ranks(existing, p)
+        winner['sources'] = merge_source_lists(existing, p)
+        return winner, kept_score
+
     by_key: Dict[str, Dict[str, Any]] = {}
+    # Score of the record currently kept for each key, so every paper is scored exactly once.
+    best_score: Dict[str, Tuple[int, int, int, int]] = {}
+    # A record without a DOI still matches a DOI-bearing record with the same normalized title
+    # (and vice versa), e.g. an arXiv preprint, which always carries an arXiv DOI, and a
+    # DOI-less Semantic Scholar copy. Records with two different DOIs never merge here.
+    slot_by_title: Dict[str, str] = {}
+    slots_with_doi: set = set()
+    alias: Dict[str, str] = {}
 
     for p in papers:
-        doi = (p.get('doi') or '').strip().lower()
-        key = None
-        if doi:
-            key = f"doi:{doi}"
-        else:
-            title = norm_title(p.get('title', ''))
-            if title:
-                key = f"title:{title}"
-
-        if not key:
+        key = dedupe_key(p)
+        if not isinstance(key, str):
             # No usable key; keep as-is
-            by_key[f"anon:{id(p)}"] = p
+            by_key[f"anon:{key}"] = p
             continue
 
-        existing = by_key.get(key)
+        has_doi = key.startswith('doi:')
+        slot = alias.get(key, key)
+        title = p.get('_normTitle')
+        if title is None:
+            title = p['_normTitle'] = normalize_title(p.get('title', ''))
+        if slot not in by_key and title:
+            other = slot_by_title.get(title)
+            if other is not None and not (has_doi and other in slots_with_doi):
+                alias[key] = slot = other
+
+        p_score = score(p)
+        existing = by_key.get(slot)
         if not existing:
             p['sources'] = merge_source_lists({}, p)
-            by_key[key] = p
-            continue
+            by_key[slot] = p
+            best_score[slot] = p_score
+            if title:
+                slot_by_title.setdefault(title, slot)
+        else:
+            by_key[slot], best_score[slot] = merge(existing, best_score[slot], p, p_score)
+        if has_doi:
+            slots_with_doi.add(slot)
+
+    if SEARCH_FUZZY_DEDUP_MIN_RATIO <= 0 or len(by_key) < 2:
+        return list(by_key.values())
+
+    # Fuzzy pass over the survivors. Only records sharing a (year, author surname) pair are
+    # compared, which keeps the number of title comparisons small.
+    kept: List[Dict[str, Any]] = []
+    kept_scores: List[Tuple[int, int, int, int]] = []
+    slots_by_author: Dict[Tuple[int, str], List[int]] = {}
+    for key, p in by_key.items():
+        year = p['_yearI'] if '_yearI' in p else _coerce_year(p.get('year'))
+        title = p.get('_normTitle')
+        if title is None:
+            title = p['_normTitle'] = normalize_title(p.get('title', ''))
+        surnames = author_surnames(p) if year is not None and title else []
+        p_score = best_score.get(key) or score(p)
+
+        match = None
+        compared = set()
+        for surname in surnames:
+            for slot in slots_by_author.get((year, surname), ()):
+                if slot in compared:
+                    continue
+                compared.add(slot)
+                if fuzzy_merge_blocked(p, kept[slot]):
+                    continue
+                if _token_set_ratio(title, kept[slot]['_normTitle'], SEARCH_FUZZY_DEDUP_MIN_RATIO):
+                    match = slot
+                    break
+            if match is not None:
+                break
 
-        merged_sources = merge_source_lists(existing, p)
-        if score(p) > score(existing):
-            # Preserve earliest rank across representations
-            if existing.get('_rank') is not None and p.get('_rank') is not None:
-                p['_rank'] = min(int(existing['_rank']), int(p['_rank']))
-            if existing.get('_sourceRank') is not None and p.get('_sourceRank') is not None:
-                p['_sourceRank'] = min(int(existing['_sourceRank']), int(p['_sourceRank']))
-            p['sources'] = merged_sources
-            by_key[key] = p
+        if match is None:
+            slot = len(kept)
+            kept.append(p)
+            kept_scores.append(p_score)
         else:
-            # Still preserve earliest rank
-            if existing.get('_rank') is not None and p.get('_rank') is not None:
-                existing['_rank'] = min(int(existing['_rank']), int(p['_rank']))
-            if existing.get('_sourceRank') is not None and p.get('_sourceRank') is not None:
-                existing['_sourceRank'] = min(int(existing['_sourceRank']), int(p['_sourceRank']))
-            existing['sources'] = merged_sources
+            slot = match
+            kept[slot], kept_scores[slot] = merge(kept[slot], kept_scores[slot], p, p_score)
+        for surname in surnames:
+            slots = slots_by_author.setdefault((year, surname), [])
+            if slot not in slots:
+                slots.append(slot)
 
-    return list(by_key.values())
+    return kept
 
 
 def attach_rank(papers: List[Dict[str, Any]], start_rank: int, source_name: str) -> Tuple[List[Dict[str, Any]], int]:
@@ -864,80 +1624,139 @@ def attach_rank(papers: List[Dict[str, Any]], start_rank: int, source_name: str)
     for idx, p in enumerate(papers):
         p['_rank'] = rank
         p['_sourceRank'] = idx
+        p['_sourceRanks'] = {source_name: idx}
+        p['_yearI'] = _coerce_year(p.get('year'))
+        p['_citI'] = safe_int(p.get('citationCount', 0) or 0, 0)
+        dedupe_key(p)
         if not p.get('source'):
             p['source'] = source_name
         rank += 1
     return papers, rank
 
 
+S2_GRAPH_URL = 'https://api.semanticscholar.org/graph/v1'
+S2_ENRICH_FIELDS = 'citationCount,year,venue,url,openAccessPdf'
+# Per-paper fallback lookups run concurrently but are spaced at least this far apart
+# (Semantic Scholar allows ~10 rps on non-search endpoints for keyed clients).
+S2_FALLBACK_MAX_WORKERS = int(os.environ.get('S2_FALLBACK_MAX_WORKERS', '8'))
+S2_MIN_REQUEST_INTERVAL_SECONDS = float(os.environ.get('S2_MIN_REQUEST_INTERVAL_SECONDS', '0.1'))
+_S2_THROTTLE_LOCK = threading.Lock()
+_s2_next_slot = 0.0
+
+
+_ARXIV_VER_RE = re.compile(r'v\d+$')
+
+
+def canonicalize_arxiv_id(arxiv_id: str) -> str:
+    arxiv_id = (arxiv_id or '').strip()
+    if not arxiv_id:
+        return ''
+    # Remove version suffix (e.g., 2401.01234v2 -> 2401.01234)
+    return _ARXIV_VER_RE.sub('', arxiv_id)
+
+
+def _s2_headers() -> Dict[str, str]:
+    headers = {'Accept': 'application/json', 'User-Agent': DEFAULT_USER_AGENT}
+    api_key = os.environ.get('SEMANTIC_SCHOLAR_API_KEY')
+    if api_key:
+        headers['x-api-key'] = api_key
+    return headers
+
+
+def _apply_s2_enrichment(p: Dict[str, Any], data: Dict[str, Any]) -> None:
+    cc = data.get('citationCount')
+    if cc is not None:
+        p['citationCount'] = int(cc or 0)
+    # prefer Semantic Scholar URL if arXiv URL missing
+    if not p.get('url') and data.get('url'):
+        p['url'] = data.get('url')
+    # some arXiv items may get better venue
+    if p.get('venue') == 'arXiv' and data.get('venue'):
+        p['venue'] = data.get('venue')
+    if not p.get('year') and data.get('year'):
+        p['year'] = data.get('year')
+    oap = data.get('openAccessPdf')
+    if not p.get('pdfUrl') and isinstance(oap, dict) and oap.get('url'):
+        p['pdfUrl'] = oap.get('url')
+
+
+def _s2_throttle() -> None:
+    """Block until this thread may issue its next Semantic Scholar request."""
+    global _s2_next_slot
+    if S2_MIN_REQUEST_INTERVAL_SECONDS <= 0:
+        return
+    with _S2_THROTTLE_LOCK:
+        now = time.monotonic()
+        slot = max(now, _s2_next_slot)
+        _s2_next_slot = slot + S2_MIN_REQUEST_INTERVAL_SECONDS
+    if slot > now:
+        time.sleep(slot - now)
+
+
+def _enrich_one_arxiv(p: Dict[str, Any], paper_refs: List[str]) -> None:
+    """Per-paper lookup, trying each reference form in turn until one resolves."""
+    headers = _s2_headers()
+    for paper_ref in paper_refs:
+        _s2_throttle()
+        try:
+            url = f"{S2_GRAPH_URL}/paper/{quote(paper_ref, safe='')}"
+            resp = SESSION.get(url, params={'fields': S2_ENRICH_FIELDS}, headers=headers, timeout=(SEARCH_HTTP_CONNECT_TIMEOUT_SECONDS, min(SEARCH_HTTP_TIMEOUT_SECONDS, 12)))
+            if resp.status_code == 200:
+                _apply_s2_enrichment(p, resp.json() or {})
+                return
+        except Exception:
+            return
+
+
 def enrich_arxiv_with_semantic_scholar(papers: List[Dict[str, Any]], max_to_enrich: int = 10) -> List[Dict[str, Any]]:
     """Fill in citationCount for arXiv items (when possible) using Semantic Scholar.
 
-    This helps avoid showing misleading 0 citations for arXiv results.
+    This helps avoid showing misleading 0 citations for arXiv results. All candidates are
+    resolved with one POST /paper/batch; only items the batch could not resolve (or every
+    item, if the batch call itself fails) fall back to per-paper lookups.
     """
     if not papers:
         return []
 
-    def canonicalize_arxiv_id(arxiv_id: str) -> str:
-        arxiv_id = (arxiv_id or '').strip()
-        if not arxiv_id:
-            return ''
-        # Remove version suffix (e.g., 2401.01234v2 -> 2401.01234)
-        arxiv_id = re.sub(r'v\d+$', '', arxiv_id)
-        return arxiv_id
-
-    enriched: List[Dict[str, Any]] = []
-    for p in papers[:max_to_enrich]:
-        paper_id = (p.get('paperId') or '').strip()
-        if not paper_id:
-            enriched.append(p)
-            continue
+    targets = [p for p in papers[:max_to_enrich] if (p.get('paperId') or '').strip()]
+    if not targets:
+        return list(papers)
 
-        try:
-            canonical_id = canonicalize_arxiv_id(paper_id)
-            if canonical_id:
-                paper_ref = f"arXiv:{canonical_id}"
-            else:
-                paper_ref = f"arXiv:{paper_id}"
-
-            url = f"https://api.semanticscholar.org/graph/v1/paper/{quote(paper_ref, safe='')}"
-            fields = 'citationCount,year,venue,url,openAccessPdf'
-            headers = {'Accept': 'application/json', 'User-Agent': DEFAULT_USER_AGENT}
-            api_key = os.environ.get('SEMANTIC_SCHOLAR_API_KEY')
-            if api_key:
-                headers['x-api-key'] = api_key
-
-            resp = requests.get(url, params={'fields': fields}, headers=headers, timeout=min(SEARCH_HTTP_TIMEOUT_SECONDS, 12))
-            if resp.status_code != 200 and canonical_id and canonical_id != paper_id:
+    ids = [(p['paperId'].strip(), canonicalize_arxiv_id(p['paperId'])) for p in targets]
+    fallback: List[Tuple[Dict[str, Any], List[str]]] = []
+    try:
+        resp = SESSION.post(
+            f"{S2_GRAPH_URL}/paper/batch",
+            params={'fields': S2_ENRICH_FIELDS},
+            json={'ids': [f"arXiv:{canonical or paper_id}" for paper_id, canonical in ids]},
+            headers=_s2_headers(),
+            timeout=(SEARCH_HTTP_CONNECT_TIMEOUT_SECONDS, min(SEARCH_HTTP_TIMEOUT_SECONDS, 12)),
+        )
+        resp.raise_for_status()
+        results = _json_get(resp)
+        if not isinstance(results, list) or len(results) != len(targets):
+            raise Exception('unexpected batch response shape')
+        for p, (paper_id, canonical), data in zip(targets, ids, results):
+            if isinstance(data, dict):
+                _apply_s2_enrichment(p, data)
+            elif canonical and canonical != paper_id:
                 # If the canonical form fails, try the original (some APIs may accept the versioned ID).
-                paper_ref2 = f"arXiv:{paper_id}"
-                url2 = f"https://api.semanticscholar.org/graph/v1/paper/{quote(paper_ref2, safe='')}"
-                resp = requests.get(url2, params={'fields': fields}, headers=headers, timeout=min(SEARCH_HTTP_TIMEOUT_SECONDS, 12))
+                fallback.append((p, [f"arXiv:{paper_id}"]))
+    except Exception as e:
+        print(f"Semantic Scholar batch enrichment error: {str(e)}")
+        fallback = [
+            (p, [f"arXiv:{canonical}", f"arXiv:{paper_id}"] if canonical and canonical != paper_id else [f"arXiv:{paper_id}"])
+            for p, (paper_id, canonical) in zip(targets, ids)
+        ]
 
-            if resp.status_code == 200:
-                data = resp.json() or {}
-                cc = data.get('citationCount')
-                if cc is not None:
-                    p['citationCount'] = int(cc or 0)
-                # prefer Semantic Scholar URL if arXiv URL missing
-                if not p.get('url') and data.get('url'):
-                    p['url'] = data.get('url')
-                # some arXiv items may get better venue
-                if p.get('venue') == 'arXiv' and data.get('venue'):
-                    p['venue'] = data.get('venue')
-                if not p.get('year') and data.get('year'):
-                    p['year'] = data.get('year')
-                oap = data.get('openAccessPdf')
-                if not p.get('pdfUrl') and isinstance(oap, dict) and oap.get('url'):
-                    p['pdfUrl'] = oap.get('url')
-            enriched.append(p)
-        except Exception:
-            enriched.append(p)
+    if len(fallback) == 1:
+        _enrich_one_arxiv(*fallback[0])
+    elif fallback:
+        # Lookups are pure I/O; run them side by side so the wait is ~max(RTT), not sum(RTT).
+        with ThreadPoolExecutor(max_workers=max(1, min(S2_FALLBACK_MAX_WORKERS, len(fallback)))) as pool:
+            list(pool.map(lambda item: _enrich_one_arxiv(*item), fallback))
 
-    # Append any remaining without enrichment attempts
-    if len(papers) > max_to_enrich:
-        enriched.extend(papers[max_to_enrich:])
-    return enriched
+    return list(papers)
 
 
 def relevance_rank_with_source_diversity(papers: List[Dict[str, Any]], limit: int) -> List[Dict[str, Any]]:
@@ -947,56 +1766,104 @@ def relevance_rank_with_source_diversity(papers: List[Dict[str, Any]], limit: in
 
     current_year = datetime.now().year
     buckets: Dict[str, List[Dict[str, Any]]] = {}
+    # Best score per source, tracked while bucketing so ordering sources needs no rescan.
+    bucket_max: Dict[str, float] = {}
+    # Recency only depends on the age clamped to [0, 40], so precompute the 41 possible values.
+    recency_by_age = [max(0.0, 1.0 - (age / 40.0)) * 0.25 for age in range(41)]
+    log1p = math.log1p
 
     for paper in papers:
-        source_rank = safe_int(paper.get('_sourceRank'), safe_int(paper.get('_rank'), 10**6))
-        citations = max(0, safe_int(paper.get('citationCount'), 0))
-        year = safe_int(paper.get('year'), 0)
-        has_abstract = 1 if (paper.get('abstract') or '').strip() else 0
-        has_pdf = 1 if (paper.get('pdfUrl') or '').strip() else 0
+        get = paper.get
+        source_rank = safe_int(get('_sourceRank'), safe_int(get('_rank'), 10**6))
+        # attach_rank leaves int-typed copies on fresh results; cached ones are coerced here.
+        citations = get('_citI')
+        if citations is None:
+            citations = safe_int(get('citationCount'), 0)
+        year = get('_yearI') if '_yearI' in paper else safe_int(get('year'), 0)
+        has_abstract = 1 if (get('abstract') or '').strip() else 0
+        has_pdf = 1 if (get('pdfUrl') or '').strip() else 0
 
         base_rank_score = 1.0 / (1.0 + float(source_rank))
-        citation_score = min(math.log1p(float(citations)) / 8.0, 0.6)
-        if year > 0:
-            age = max(0, current_year - year)
-            recency_score = max(0.0, 1.0 - (min(age, 40) / 40.0)) * 0.25
+        citation_score = min(log1p(float(max(0, citations))) / 8.0, 0.6)
+        if year and year > 0:
+            recency_score = recency_by_age[min(max(0, current_year - year), 40)]
         else:
             recency_score = 0.0
         metadata_score = (0.15 * has_abstract) + (0.05 * has_pdf)
-        paper['_relevanceScore'] = round(base_rank_score + citation_score + recency_score + metadata_score, 6)
+        score = paper['_relevanceScore'] = round(base_rank_score + citation_score + recency_score + metadata_score, 6)
 
-        source = (paper.get('source') or 'Unknown').strip() or 'Unknown'
-        buckets.setdefault(source, []).append(paper)
-
-    for source_name in buckets:
-        buckets[source_name].sort(
+        source = (get('source') or 'Unknown').strip() or 'Unknown'
+        bucket = buckets.get(source)
+        if bucket is None:
+            buckets[source] = [paper]
+            bucket_max[source] = score
+        else:
+            bucket.append(paper)
+            if score > bucket_max[source]:
+                bucket_max[source] = score
+
+    # Source order weighs full bucket sizes, so record them before truncating.
+    bucket_size = {source_name: len(bucket) for source_name, bucket in buckets.items()}
+    # At most `limit` papers can come from any one bucket, so only its top `limit` need ordering.
+    for source_name, bucket in buckets.items():
+        buckets[source_name] = deque(heapq.nlargest(
+            limit,
+            bucket,
             key=lambda p: (float(p.get('_relevanceScore', 0.0)), -safe_int(p.get('_sourceRank'), safe_int(p.get('_rank'), 10**6))),
-            reverse=True,
-        )
+        ))
 
     source_order = sorted(
         buckets.keys(),
-        key=lambda s: (len(buckets[s]), max(float(p.get('_relevanceScore', 0.0)) for p in buckets[s])),
+        key=lambda s: (bucket_size[s], bucket_max[s]),
         reverse=True,
     )
 
     ranked: List[Dict[str, Any]] = []
-    while len(ranked) < limit:
-        progressed = False
-        for source_name in source_order:
-            bucket = buckets[source_name]
-            if not bucket:
-                continue
-            ranked.append(bucket.pop(0))
-            progressed = True
+    active = [buckets[source_name] for source_name in source_order if buckets[source_name]]
+    while active and len(ranked) < limit:
+        if len(active) == 1:
+            # Only one source left: nothing to interleave, take the rest of it in order.
+            bucket = active[0]
+            ranked.extend(bucket.popleft() for _ in range(min(len(bucket), limit - len(ranked))))
+            break
+        for bucket in active:
+            ranked.append(bucket.popleft())
             if len(ranked) >= limit:
                 break
-        if not progressed:
-            break
+        active = [bucket for bucket in active if bucket]
 
     return ranked
 
 
+RANK_STRATEGIES = {'diversity', 'rrf'}
+
+
+def relevance_rank_rrf(papers: List[Dict[str, Any]], limit: int, k: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Rank by Reciprocal Rank Fusion over each source's own ordering.
+
+    score = sum(1 / (k + rank_in_source)) across the sources that returned the paper. Scores
+    from different APIs are not comparable, so only positions are used; papers returned near
+    the top by several sources rise. Ties break on citation count.
+    """
+    if not papers:
+        return []
+    k = SEARCH_RRF_K if k is None else k
+
+    for paper in papers:
+        ranks = paper.get('_sourceRanks') or {
+            (paper.get('source') or 'Unknown'): safe_int(paper.get('_sourceRank'), safe_int(paper.get('_rank'), 10**6))
+        }
+        # _sourceRank is 0-based; RRF is defined over 1-based positions.
+        paper['_relevanceScore'] = round(sum(1.0 / (k + r + 1) for r in ranks.values()), 8)
+
+    ranked = sorted(
+        papers,
+        key=lambda p: (p['_relevanceScore'], safe_int(p.get('citationCount'), 0)),
+        reverse=True,
+    )
+    return ranked[:limit]
+
+
 def source_counts(papers: List[Dict[str, Any]]) -> Dict[str, int]:
     counts: Dict[str, int] = {}
     for p in papers:
@@ -1005,6 +1872,15 @@ def source_counts(papers: List[Dict[str, Any]]) -> Dict[str, int]:
     return counts
 
 
+def _coerce_year(year: Any) -> Optional[int]:
+    if year is None:
+        return None
+    try:
+        return int(year)
+    except Exception:
+        return None
+
+
 def apply_filters(papers: List[Dict[str, Any]], from_year=None, to_year=None, min_citations=None) -> List[Dict[str, Any]]:
     """Apply year/citation filters in a source-agnostic way."""
     if not papers:
@@ -1023,36 +1899,95 @@ def apply_filters(papers: List[Dict[str, Any]], from_year=None, to_year=None, mi
     except Exception:
         min_citations_i = None
 
-    filtered = []
-    for p in papers:
-        year = p.get('year')
-        if year is not None:
-            try:
-                year = int(year)
-            except Exception:
-                year = None
+    # Common case: no filters requested, so skip the per-paper pass entirely.
+    if from_year_i is None and to_year_i is None and min_citations_i is None:
+        return papers
+
+    # Papers with no (parseable) year are kept by the year bounds, as before.
+    lo = from_year_i if from_year_i is not None else -10**9
+    hi = to_year_i if to_year_i is not None else 10**9
+    check_years = from_year_i is not None or to_year_i is not None
+
+    def keep(p: Dict[str, Any]) -> bool:
+        # Freshly fetched papers carry _yearI/_citI from attach_rank; cached ones are coerced here.
+        if check_years:
+            year_i = p['_yearI'] if '_yearI' in p else _coerce_year(p.get('year'))
+            if year_i is not None and not lo <= year_i <= hi:
+                return False
+        if min_citations_i is None:
+            return True
+        cit_i = p['_citI'] if '_citI' in p else safe_int(p.get('citationCount', 0) or 0, 0)
+        return cit_i >= min_citations_i
 
-        if from_year_i is not None and year is not None and year < from_year_i:
-            continue
-        if to_year_i is not None and year is not None and year > to_year_i:
-            continue
+    return [p for p in papers if keep(p)]
 
-        if min_citations_i is not None:
-            try:
-                c = int(p.get('citationCount', 0) or 0)
-            except Exception:
-                c = 0
-            if c < min_citations_i:
-                continue
 
-        filtered.append(p)
+_SUMMARY_SCHEMA_FIELDS = {
+    'overview': '"3-4 sentences. Summarize the current landscape, and clearly distinguish older foundational work vs recent directions."',
+    'key_themes': '["theme 1", "theme 2", "theme 3", "theme 4", "theme 5"]',
+    'research_trends': '"3-4 sentences on trends, what is accelerating, and what appears mature."',
+    'emerging_subtopics': '["subtopic 1", "subtopic 2", "subtopic 3"]',
+    'open_questions': '["open question 1", "open question 2", "open question 3"]',
+    'recommended_next_queries': '["a more specific query to try", "another query"]',
+    'screening_advice': '"2-3 sentences on how to filter/screen for high relevance and recency (e.g., set fromYear/toYear, sort=date, minCitations)."',
+}
 
-    return filtered
 
+# Papers listed in the landscape-summary prompt (and identifying its cache entry).
+SUMMARY_CONTEXT_PAPERS = 8
+_SUMMARY_PAPER_LINE = "{}. {} ({}, {} citations, {})".format
+_SUMMARY_USER_PROMPT = """Analyze these search results for the query: "{}"
 
-def generate_search_summary(query: str, papers: List[Dict[str, Any]], sources: List[str]) -> Dict[str, Any]:
+Top papers found:
+{}
+
+Total papers: {}
+Sources: {}""".format
+
+
+def search_summary_system_prompt(slim: bool, single_source: bool) -> Tuple[str, str]:
+    """Return (system prompt, prompt cache key) for the landscape summary.
+
+    Instructions and schema live in the system message so every request with the same
+    schema shape shares a byte-identical prefix that OpenAI's prompt caching can reuse.
     """
-    Generate AI-powered summary of search results using OpenAI
+    fields = ['overview', 'key_themes']
+    if not slim:
+        fields.extend(['research_trends', 'emerging_subtopics'])
+    fields.append('open_questions')
+    if not single_source:
+        fields.append('recommended_next_queries')
+    fields.append('screening_advice')
+    schema = ',\n'.join(f'    "{name}": {_SUMMARY_SCHEMA_FIELDS[name]}' for name in fields)
+    prompt = (
+        "You are an expert research analyst. Respond with valid JSON only.\n\n"
+        "You will be given search results for a user query. Provide ONLY a valid JSON object with:\n"
+        "{\n" + schema + "\n}\n\n"
+        "Be insightful and specific to the actual papers found."
+    )
+    cache_key = f"search_summary_v1_{'slim' if slim else 'full'}{'_single' if single_source else ''}"
+    return prompt, cache_key
+
+
+def generate_search_summary(
+    query: str,
+    papers: List[Dict[str, Any]],
+    sources: List[str],
+    *,
+    cache_key: Optional[str] = None,
+    force_refresh: bool = False,
+    defer: bool = False,
+) -> Dict[str, Any]:
+    """
+    Generate AI-powered summary of search results using OpenAI.
+
+    With a cache_key, the AI part of the summary is cached for AI_SUMMARY_TTL_SECONDS under
+    summary_content_key (query plus the top papers the prompt lists), so repeat views and
+    searches that differ only in filters or sort but surface the same top papers skip the
+    OpenAI round-trip. Result-set stats (top cited, date range) are always merged fresh.
+
+    With ``defer=True`` (and SEARCH_SUMMARY_QUEUE_URL set) a cache miss enqueues the job
+    for handle_summary_jobs and returns the metadata-only summary with status 'pending'.
     """
     if not papers:
         return {
@@ -1061,21 +1996,32 @@ def generate_search_summary(query: str, papers: List[Dict[str, Any]], sources: L
             "top_cited": None,
             "date_range": None
         }
-    
-    # Extract metadata
-    total_citations = sum(p.get('citationCount', 0) for p in papers)
-    years = [p.get('year') for p in papers if p.get('year')]
-    venues = [p.get('venue') for p in papers if p.get('venue')]
-    
-    # Top cited paper
-    top_paper = max(papers, key=lambda p: p.get('citationCount', 0))
-    
+
+    # Extract metadata and the top cited paper in a single pass
+    total_citations = 0
+    years = []
+    venues = []
+    top_paper = papers[0]
+    top_citations = None
+    for p in papers:
+        c = p.get('citationCount') or 0
+        total_citations += c
+        if top_citations is None or c > top_citations:
+            top_paper, top_citations = p, c
+        year = p.get('year')
+        if year:
+            years.append(year)
+        venue = p.get('venue')
+        if venue:
+            venues.append(venue)
+    year_range = (min(years), max(years)) if years else None
+
     # Basic summary (fallback)
     basic_summary = {
         "overview": f"Found {len(papers)} papers on '{query}' from {', '.join(sources)}. Total {total_citations:,} citations across results.",
         "key_themes": list(set(venues[:5])) if venues else [],
         "research_trends": (
-            f"Results span {min(years)}-{max(years)}; consider sorting by date to emphasize recent work. "
+            f"Results span {year_range[0]}-{year_range[1]}; consider sorting by date to emphasize recent work. "
             f"If many results are preprints (e.g., arXiv), validate impact via downstream citations and venue quality." if years else
             "Consider sorting by date for recency and screening by venue and citations for impact."
         ),
@@ -1092,12 +2038,44 @@ def generate_search_summary(query: str, papers: List[Dict[str, Any]], sources: L
             "citations": top_paper.get('citationCount', 0),
             "year": top_paper.get('year')
         },
-        "date_range": f"{min(years)}-{max(years)}" if years and len(years) > 1 else str(years[0]) if years else "Unknown"
+        "date_range": f"{year_range[0]}-{year_range[1]}" if len(years) > 1 else str(years[0]) if years else "Unknown"
     }
     
     # Try OpenAI for smarter summary
     api_key = os.environ.get('OPENAI_API_KEY')
     model = (os.environ.get('OPENAI_MODEL') or 'gpt-4o-mini').strip()
+    if len(papers) < AI_SUMMARY_MIN_PAPERS:
+        return {
+            **basic_summary,
+            '_meta': {
+                'usedAI': False,
+                'hasOpenAIKey': bool(api_key),
+                'reason': 'too_few_papers',
+            }
+        }
+
+    # Small result sets get a slim schema (no trends/subtopics) and a tighter token cap:
+    # decode time dominates latency and scales with output tokens.
+    slim = len(papers) < AI_SUMMARY_SLIM_MAX_PAPERS
+    summary_key = summary_content_key(model, query, papers, slim) if cache_key else None
+
+    def with_stats(ai_summary: Dict[str, Any], meta: Dict[str, Any]) -> Dict[str, Any]:
+        # Merge AI summary with basic stats
+        return {
+            **ai_summary,
+            "top_cited": basic_summary["top_cited"],
+            "date_range": basic_summary["date_range"],
+            "total_citations": total_citations,
+            "_meta": meta,
+        }
+
+    if summary_key and not force_refresh:
+        cached = check_summary_cache(summary_key)
+        if isinstance(cached, dict):
+            meta = dict(cached.pop('_meta', None) or {})
+            meta['cached'] = True
+            return with_stats(cached, meta)
+
     print(f"OpenAI API key present: {bool(api_key)}")
     if not api_key:
         print("No OPENAI_API_KEY - returning basic summary")
@@ -1108,35 +2086,29 @@ def generate_search_summary(query: str, papers: List[Dict[str, Any]], sources: L
                 'hasOpenAIKey': False,
             }
         }
+
+    if defer and summary_key and enqueue_search_summary(cache_key, query, papers, sources):
+        return {
+            **basic_summary,
+            'status': 'pending',
+            '_meta': {
+                'usedAI': False,
+                'hasOpenAIKey': True,
+                'deferred': True,
+            }
+        }
     
     try:
-        # Build context from top papers
-        papers_context = []
-        for i, paper in enumerate(papers[:8], 1):
-            papers_context.append(
-                f"{i}. {paper.get('title')} ({paper.get('year')}, {int(paper.get('citationCount', 0) or 0)} citations, {paper.get('venue') or 'Unknown venue'})"
-            )
+        # Build context from top papers in a single pass over a pre-bound line template
+        papers_context = "\n".join([
+            _SUMMARY_PAPER_LINE(i, p.get('title'), p.get('year'), int(p.get('citationCount') or 0), p.get('venue') or 'Unknown venue')
+            for i, p in enumerate(papers[:SUMMARY_CONTEXT_PAPERS], 1)
+        ])
         
-        prompt = f"""Analyze these search results for the query: "{query}"
-
-Top papers found:
-{chr(10).join(papers_context)}
-
-Total papers: {len(papers)}
-Sources: {', '.join(sources)}
-
-Provide ONLY a valid JSON object with:
-{{
-    "overview": "4-6 sentences. Summarize the current landscape, and clearly distinguish older foundational work vs recent directions.",
-    "key_themes": ["theme 1", "theme 2", "theme 3", "theme 4", "theme 5"],
-    "research_trends": "4-6 sentences on trends, what is accelerating, and what appears mature.",
-    "emerging_subtopics": ["subtopic 1", "subtopic 2", "subtopic 3"],
-    "open_questions": ["open question 1", "open question 2", "open question 3"],
-    "recommended_next_queries": ["a more specific query to try", "another query"],
-    "screening_advice": "2-3 sentences on how to filter/screen for high relevance and recency (e.g., set fromYear/toYear, sort=date, minCitations)."
-}}
+        single_source = len([s for s in sources if s != 'cache']) == 1
+        system_prompt, prompt_cache_key = search_summary_system_prompt(slim, single_source)
 
-Be insightful and specific to the actual papers found."""
+        prompt = _SUMMARY_USER_PROMPT(query, papers_context, len(papers), ', '.join(sources))
 
         url = "https://api.openai.com/v1/chat/completions"
         headers = {
@@ -1148,56 +2120,49 @@ Be insightful and specific to the actual papers found."""
         payload = {
             "model": model,
             "messages": [
-                {"role": "system", "content": "You are an expert research analyst. Respond with valid JSON only."},
+                {"role": "system", "content": system_prompt},
                 {"role": "user", "content": prompt}
             ],
             "temperature": 0.5,
-            "max_tokens": 700,
-            "response_format": { "type": "json_object" }
+            "top_p": 1,
+            "max_tokens": AI_SUMMARY_SLIM_MAX_TOKENS if slim else AI_SUMMARY_MAX_TOKENS,
+            "stream": True,
+            "response_format": { "type": "json_object" },
+            "prompt_cache_key": prompt_cache_key,
         }
         
         # Keep this fairly short; the overall search endpoint should be responsive
-        # even if OpenAI is slow/unavailable (we fall back to basic_summary).
-        response = requests.post(url, headers=headers, json=payload, timeout=12)
+        # even if OpenAI is slow/unavailable (we fall back to basic_summary). Streaming
+        # lets the whole exchange be capped by a deadline, not just each socket read.
+        deadline = time.monotonic() + AI_SUMMARY_DEADLINE_SECONDS
+        response = SESSION.post(url, headers=headers, json=payload, timeout=12, stream=True)
         if response.status_code >= 400:
             # Some models/accounts reject response_format or specific models.
             # Retry once without response_format.
             try:
                 payload2 = dict(payload)
                 payload2.pop('response_format', None)
-                response2 = requests.post(url, headers=headers, json=payload2, timeout=12)
+                payload2.pop('prompt_cache_key', None)
+                response2 = SESSION.post(url, headers=headers, json=payload2, timeout=12, stream=True)
                 response2.raise_for_status()
-                result = response2.json()
+                content = read_openai_stream(response2, deadline)
             except Exception as retry_e:
                 raise Exception(f"OpenAI error {response.status_code}: {response.text[:400]} | retry failed: {str(retry_e)}")
         else:
-            result = response.json()
+            content = read_openai_stream(response, deadline)
 
-        content = (((result or {}).get('choices') or [{}])[0].get('message') or {}).get('content')
         if not content:
             raise Exception("OpenAI response missing content")
 
-        try:
-            ai_summary = json.loads(content)
-        except Exception:
-            # Best-effort: extract the first JSON object from text
-            m = re.search(r'\{[\s\S]*\}', content)
-            if not m:
-                raise
-            ai_summary = json.loads(m.group(0))
-        
-        # Merge AI summary with basic stats
-        return {
-            **ai_summary,
-            "top_cited": basic_summary["top_cited"],
-            "date_range": basic_summary["date_range"],
-            "total_citations": total_citations,
-            "_meta": {
-                'usedAI': True,
-                'hasOpenAIKey': True,
-                'model': model,
-            }
+        ai_summary = parse_json_content(content)
+        meta = {
+            'usedAI': True,
+            'hasOpenAIKey': True,
+            'model': model,
         }
+        if summary_key:
+            cache_summary(summary_key, {**ai_summary, '_meta': meta})
+        return with_stats(ai_summary, meta)
         
     except Exception as e:
         print(f"Error generating AI search summary: {str(e)}")
@@ -1212,6 +2177,66 @@ Be insightful and specific to the actual papers found."""
         }
 
 
+def read_openai_stream(response: Any, deadline: Optional[float] = None) -> str:
+    """Accumulate message content from an OpenAI chat-completions SSE stream.
+
+    `deadline` is a time.monotonic() instant; the per-read HTTP timeout does not bound a
+    slow-but-steady stream, so past it the read is abandoned with a TimeoutError.
+    A completion cut off at max_tokens (finish_reason "length") raises ValueError, since
+    callers parse the content as JSON and a truncated object cannot be used.
+    """
+    if getattr(response, 'encoding', None) is None:
+        response.encoding = 'utf-8'
+    parts: List[str] = []
+    finish_reason = None
+    for line in response.iter_lines(decode_unicode=True):
+        if deadline is not None and time.monotonic() > deadline:
+            close = getattr(response, 'close', None)
+            if close:
+                close()
+            raise TimeoutError('OpenAI stream exceeded deadline')
+        if not line or not line.startswith('data:'):
+            continue
+        data = line[5:].strip()
+        if data == '[DONE]':
+            break
+        try:
+            chunk = json_loads(data)
+        except Exception:
+            continue
+        for choice in chunk.get('choices') or []:
+            piece = (choice.get('delta') or {}).get('content')
+            if piece:
+                parts.append(piece)
+            finish_reason = choice.get('finish_reason') or finish_reason
+    if finish_reason == 'length':
+        raise ValueError('OpenAI response truncated at max_tokens')
+    return ''.join(parts)
+
+
+# Static instructions + schema form a stable prefix for OpenAI prompt caching; only the
+# user message (query + papers) varies between calls.
+DEEP_OVERVIEW_SYSTEM_PROMPT = (
+    "You are a careful research assistant. Output JSON only.\n\n"
+    "You are writing an in-depth, one-page literature overview for a user. "
+    "You MUST base your answer strictly on the provided paper metadata and abstracts. "
+    "If abstracts are missing, state uncertainty.\n\n"
+    "Return ONLY valid JSON with this schema:\n"
+    "{\n"
+    "  \"mode\": \"deep\",\n"
+    "  \"one_page_summary\": \"~1 page of dense but readable prose (use paragraphs, no markdown headings)\",\n"
+    "  \"key_claims\": [\"...\"],\n"
+    "  \"points_of_disagreement\": [\"...\"],\n"
+    "  \"evidence_types\": [\"theoretical\"|\"empirical\"|\"historical\"|\"simulation\"|\"survey\"|\"other\"],\n"
+    "  \"recommended_reading_order\": [\"Paper 1: ...\", \"Paper 2: ...\"],\n"
+    "  \"what_to_search_next\": [\"...\"],\n"
+    "  \"limitations\": \"Short note about missing abstracts / incomplete coverage.\"\n"
+    "}\n"
+)
+DEEP_OVERVIEW_PROMPT_CACHE_KEY = 'deep_overview_v1'
+OPENAI_API_BASE = 'https://api.openai.com/v1'
+
+
 def _deep_overview_cache_key(cache_key: str) -> str:
     return f"{cache_key}:deep_overview"
 
@@ -1219,18 +2244,16 @@ def _deep_overview_cache_key(cache_key: str) -> str:
 def check_deep_overview_cache(cache_key: str) -> Optional[Dict[str, Any]]:
     """Check DynamoDB for a cached deep overview (short TTL; expensive to generate)."""
     try:
-        if not dynamodb:
+        table = _TABLE
+        if table is None:
             return None
-        table = dynamodb.Table(table_name)
         response = table.get_item(Key={'searchKey': _deep_overview_cache_key(cache_key)})
         item = response.get('Item')
         if not item:
             return None
-        cache_time = datetime.fromisoformat(item['timestamp'])
-        age_seconds = (datetime.now() - cache_time).total_seconds()
-        if age_seconds > DEEP_OVERVIEW_TTL_SECONDS:
+        if not cache_item_fresh(item, DEEP_OVERVIEW_TTL_SECONDS):
             return None
-        return item.get('deep_overview')
+        return unpack_cache_blob(item, 'deep_overview_z', 'deep_overview')
     except Exception as e:
         print(f"Deep overview cache check error: {str(e)}")
         return None
@@ -1238,70 +2261,227 @@ def check_deep_overview_cache(cache_key: str) -> Optional[Dict[str, Any]]:
 
 def cache_deep_overview(cache_key: str, deep_overview: Dict[str, Any]):
     try:
-        if not dynamodb:
+        table = _TABLE
+        if table is None:
             return
-        table = dynamodb.Table(table_name)
-        now = datetime.now()
+        now_epoch = int(time.time())
         table.put_item(Item={
             'searchKey': _deep_overview_cache_key(cache_key),
-            'timestamp': now.isoformat(),
-            'deep_overview': deep_overview,
-            'ttl': int(now.timestamp()) + DEEP_OVERVIEW_TTL_SECONDS,
+            'timestamp': utc_timestamp(now_epoch),
+            'fmt': CACHE_BLOB_FORMAT,
+            'deep_overview_z': pack_cache_blob(deep_overview),
+            'ttl': now_epoch + DEEP_OVERVIEW_TTL_SECONDS,
         })
     except Exception as e:
         print(f"Deep overview cache write error: {str(e)}")
 
 
-def generate_deep_overview(
-    query: str,
-    papers: List[Dict[str, Any]],
-    *,
-    max_papers: Any = None,
-    cache_key: Optional[str] = None,
-    force_refresh: bool = False,
-) -> Optional[Dict[str, Any]]:
-    """Generate an in-depth, 1-page overview of all returned papers.
+# Fields a deferred summary job needs: the prompt lines, the cache key and the basic stats.
+SUMMARY_JOB_FIELDS = ('paperId', 'doi', 'title', 'year', 'citationCount', 'venue')
 
-    Important: this summarizes titles/abstracts/metadata we already have. It does not download/parse PDFs.
+
+def enqueue_search_summary(cache_key: str, query: str, papers: List[Dict[str, Any]], sources: List[str]) -> bool:
+    """Queue a landscape summary for handle_summary_jobs. False if no queue or the send fails."""
+    if _SQS is None:
+        return False
+    job = {
+        'cacheKey': cache_key,
+        'query': query,
+        'sources': sources,
+        'papers': [{k: p.get(k) for k in SUMMARY_JOB_FIELDS} for p in papers],
+    }
+    try:
+        _SQS.send_message(QueueUrl=SEARCH_SUMMARY_QUEUE_URL, MessageBody=json_dumps_bytes(job).decode('utf-8'))
+        return True
+    except Exception as e:
+        print(f"Summary enqueue error: {str(e)}")
+        return False
+
+
+def is_sqs_event(event: Any) -> bool:
+    records = event.get('Records') if isinstance(event, dict) else None
+    return bool(records) and isinstance(records[0], dict) and records[0].get('eventSource') == 'aws:sqs'
+
+
+def handle_summary_jobs(event: Dict[str, Any]) -> Dict[str, Any]:
+    """SQS entry point: generate and cache each queued landscape summary.
+
+    Failed records are reported via batchItemFailures so only they are redelivered
+    (when the event source mapping enables ReportBatchItemFailures).
     """
-    if not papers:
-        return {
-            'mode': 'deep',
-            'one_page_summary': f"No papers available to summarize for '{query}'.",
-            '_meta': {'usedAI': False, 'reason': 'no_papers'}
-        }
+    failures = []
+    for record in event.get('Records') or []:
+        try:
+            job = json_loads(record['body'])
+            summary = generate_search_summary(
+                job['query'], job['papers'], job.get('sources') or [], cache_key=job.get('cacheKey') or 'deferred'
+            )
+            if not (summary.get('_meta') or {}).get('usedAI'):
+                print(f"Deferred summary not generated: {(summary.get('_meta') or {}).get('error')}")
+        except Exception as e:
+            print(f"Summary job error: {str(e)}")
+            failures.append({'itemIdentifier': record.get('messageId')})
+    return {'batchItemFailures': failures}
+
+
+def summary_content_key(model: str, query: str, papers: List[Dict[str, Any]], slim: bool) -> str:
+    """Cache key for a landscape summary: model, normalized query, result count and the
+    identities of the top papers the prompt lists (not the search parameters)."""
+    top = [str(p.get('paperId') or p.get('doi') or p.get('title') or '') for p in papers[:SUMMARY_CONTEXT_PAPERS]]
+    return cache_key_for(json.dumps(
+        [model, ' '.join((query or '').lower().split()), len(papers), bool(slim), top],
+        separators=(',', ':'),
+    ))
+
+
+def _summary_cache_key(cache_key: str) -> str:
+    return f"{cache_key}:summary"
+
+
+def check_summary_cache(cache_key: str) -> Optional[Dict[str, Any]]:
+    """Check DynamoDB for a cached AI landscape summary (keyed by summary_content_key)."""
+    try:
+        table = _TABLE
+        if table is None:
+            return None
+        response = table.get_item(Key={'searchKey': _summary_cache_key(cache_key)})
+        item = response.get('Item')
+        if not item:
+            return None
+        if not cache_item_fresh(item, AI_SUMMARY_TTL_SECONDS):
+            return None
+        return unpack_cache_blob(item, 'summary_z', 'summary')
+    except Exception as e:
+        print(f"Summary cache check error: {str(e)}")
+        return None
+
 
+def cache_summary(cache_key: str, summary: Dict[str, Any]):
+    try:
+        table = _TABLE
+        if table is None:
+            return
+        now_epoch = int(time.time())
+        table.put_item(Item={
+            'searchKey': _summary_cache_key(cache_key),
+            'timestamp': utc_timestamp(now_epoch),
+            'fmt': CACHE_BLOB_FORMAT,
+            'summary_z': pack_cache_blob(summary),
+            'ttl': now_epoch + AI_SUMMARY_TTL_SECONDS,
+        })
+    except Exception as e:
+        print(f"Summary cache write error: {str(e)}")
+
+
+def submit_deep_overview_batch(cache_key: str, payload: Dict[str, Any], headers: Dict[str, str]) -> Dict[str, Any]:
+    """Queue a deep-overview completion on the OpenAI Batch API (half price, separate rate-limit pool).
+
+    The returned placeholder is cached under the deep-overview key so later requests can
+    pick up the result once the batch completes.
+    """
+    body = dict(payload)
+    body.pop('stream', None)
+    line = json.dumps({
+        'custom_id': cache_key,
+        'method': 'POST',
+        'url': '/v1/chat/completions',
+        'body': body,
+    })
+    auth = {k: v for k, v in headers.items() if k != 'Content-Type'}
+
+    upload = SESSION.post(
+        f"{OPENAI_API_BASE}/files",
+        headers=auth,
+        data={'purpose': 'batch'},
+        files={'file': ('deep_overview.jsonl', line.encode('utf-8'), 'application/jsonl')},
+        timeout=15,
+    )
+    upload.raise_for_status()
+    batch = SESSION.post(
+        f"{OPENAI_API_BASE}/batches",
+        headers=headers,
+        json={
+            'input_file_id': upload.json()['id'],
+            'endpoint': '/v1/chat/completions',
+            'completion_window': '24h',
+        },
+        timeout=15,
+    )
+    batch.raise_for_status()
+
+    placeholder = {
+        'mode': 'deep',
+        'status': 'queued',
+        'batch_id': batch.json()['id'],
+        'one_page_summary': 'Deep overview queued; repeat the search later to retrieve it.',
+    }
+    cache_deep_overview(cache_key, placeholder)
+    return placeholder
+
+
+def poll_deep_overview_batch(placeholder: Dict[str, Any], headers: Dict[str, str]) -> Optional[Dict[str, Any]]:
+    """Return the finished overview for a queued batch, or None while it is still running.
+
+    Raises when the batch ended without output (failed/expired/cancelled).
+    """
+    resp = SESSION.get(f"{OPENAI_API_BASE}/batches/{placeholder['batch_id']}", headers=headers, timeout=10)
+    resp.raise_for_status()
+    batch = resp.json()
+    status = batch.get('status')
+    if status != 'completed':
+        if status in {'failed', 'expired', 'cancelled'}:
+            raise Exception(f"Deep overview batch {status}")
+        return None
+
+    output_file_id = batch.get('output_file_id')
+    if not output_file_id:
+        raise Exception('Deep overview batch completed without output')
+    out = SESSION.get(f"{OPENAI_API_BASE}/files/{output_file_id}/content", headers=headers, timeout=15)
+    out.raise_for_status()
+    for raw in out.text.splitlines():
+        if not raw.strip():
+            continue
+        result = json.loads(raw)
+        body = ((result.get('response') or {}).get('body') or {})
+        content = (((body.get('choices') or [{}])[0].get('message') or {}).get('content') or '')
+        if content:
+            return parse_json_content(content)
+    raise Exception('Deep overview batch output missing content')
+
+
+def parse_json_content(content: str) -> Any:
+    """Parse model output as JSON, falling back to the outermost {...} span."""
+    try:
+        return json_loads(content)
+    except Exception:
+        start = content.find('{')
+        end = content.rfind('}')
+        if start == -1 or end <= start:
+            raise
+        return json_loads(content[start:end + 1])
+
+
+def select_deep_overview_papers(papers: List[Dict[str, Any]], max_papers: Any = None) -> List[Dict[str, Any]]:
     try:
         max_papers_i = int(max_papers) if max_papers is not None and str(max_papers).strip() != '' else None
     except Exception:
         max_papers_i = None
 
-    selected = papers
     if max_papers_i is not None and max_papers_i > 0:
-        selected = papers[:min(len(papers), max_papers_i)]
-    else:
-        selected = papers[:min(len(papers), 20)]
+        return papers[:min(len(papers), max_papers_i)]
+    return papers[:min(len(papers), 20)]
 
-    if cache_key and not force_refresh:
-        cached = check_deep_overview_cache(cache_key)
-        if cached:
-            cached = decimal_to_number(cached)
-            cached['_meta'] = {**(cached.get('_meta') or {}), 'cached': True}
-            return cached
 
-    api_key = os.environ.get('OPENAI_API_KEY')
-    model = (os.environ.get('OPENAI_MODEL') or 'gpt-4o-mini').strip()
-    if not api_key:
-        return {
-            'mode': 'deep',
-            'one_page_summary': (
-                "Deep overview requires OpenAI. Set OPENAI_API_KEY in the search Lambda to enable it. "
-                "This overview is generated from paper titles/abstracts, not full PDFs."
-            ),
-            '_meta': {'usedAI': False, 'hasOpenAIKey': False}
-        }
+def deep_overview_papers_context(query: str, selected: List[Dict[str, Any]]) -> str:
+    """Build compact but information-rich context. Truncate abstracts to keep request bounded.
 
-    # Build compact but information-rich context. Truncate abstracts to keep request bounded.
+    Abstracts share DEEP_OVERVIEW_ABSTRACT_CHAR_BUDGET, so a large deepOverviewMaxPapers
+    shortens each abstract instead of growing the prompt (and the call's latency) linearly.
+    """
+    abstract_max = max(
+        DEEP_OVERVIEW_ABSTRACT_MIN_CHARS,
+        min(1200, DEEP_OVERVIEW_ABSTRACT_CHAR_BUDGET // max(1, len(selected))),
+    )
     items: List[str] = []
     for i, p in enumerate(selected, 1):
         title = (p.get('title') or '').strip()
@@ -1310,8 +2490,8 @@ def generate_deep_overview(
         authors = p.get('authors') or []
         a = ', '.join([x for x in authors[:3] if x])
         abstract = (p.get('abstract') or '').strip()
-        if abstract and len(abstract) > 1200:
-            abstract = abstract[:1200].rstrip() + '…'
+        if len(abstract) > abstract_max:
+            abstract = abstract[:abstract_max] + '…'
         items.append(
             f"Paper {i}: {title}\n"
             f"Year: {year}\n"
@@ -1321,77 +2501,144 @@ def generate_deep_overview(
             f"Abstract: {abstract if abstract else '[no abstract]'}\n"
         )
 
-    prompt = (
-        "You are writing an in-depth, one-page literature overview for a user. "
-        "You MUST base your answer strictly on the provided paper metadata and abstracts. "
-        "If abstracts are missing, state uncertainty.\n\n"
+    return (
         f"User query: {query}\n"
         f"Number of papers provided: {len(selected)}\n\n"
         "Papers:\n"
         + "\n".join(items)
-        + "\n\n"
-        "Return ONLY valid JSON with this schema:\n"
-        "{\n"
-        "  \"mode\": \"deep\",\n"
-        "  \"one_page_summary\": \"~1 page of dense but readable prose (use paragraphs, no markdown headings)\",\n"
-        "  \"key_claims\": [\"...\"],\n"
-        "  \"points_of_disagreement\": [\"...\"],\n"
-        "  \"evidence_types\": [\"theoretical\"|\"empirical\"|\"historical\"|\"simulation\"|\"survey\"|\"other\"],\n"
-        "  \"recommended_reading_order\": [\"Paper 1: ...\", \"Paper 2: ...\"],\n"
-        "  \"what_to_search_next\": [\"...\"],\n"
-        "  \"limitations\": \"Short note about missing abstracts / incomplete coverage.\"\n"
-        "}\n"
     )
 
-    url = "https://api.openai.com/v1/chat/completions"
+
+def generate_deep_overview(
+    query: str,
+    papers: List[Dict[str, Any]],
+    *,
+    max_papers: Any = None,
+    cache_key: Optional[str] = None,
+    force_refresh: bool = False,
+    batch: bool = False,
+) -> Optional[Dict[str, Any]]:
+    """Generate an in-depth, 1-page overview of all returned papers.
+
+    With ``batch=True`` the completion is queued on the OpenAI Batch API instead and a
+    ``{"status": "queued", "batch_id": ...}`` placeholder is returned; the finished overview
+    is collected from the cache on a later request.
+
+    Important: this summarizes titles/abstracts/metadata we already have. It does not download/parse PDFs.
+    """
+    if not papers:
+        return {
+            'mode': 'deep',
+            'one_page_summary': f"No papers available to summarize for '{query}'.",
+            '_meta': {'usedAI': False, 'reason': 'no_papers'}
+        }
+    if len(papers) < DEEP_OVERVIEW_MIN_PAPERS:
+        return {
+            'mode': 'deep',
+            'one_page_summary': (
+                f"Only {len(papers)} paper(s) matched '{query}'; a deep overview needs at least "
+                f"{DEEP_OVERVIEW_MIN_PAPERS}. Summarize the individual papers instead, or broaden the search."
+            ),
+            '_meta': {'usedAI': False, 'reason': 'too_few_papers'}
+        }
+
+    selected = select_deep_overview_papers(papers, max_papers)
+
+    api_key = os.environ.get('OPENAI_API_KEY')
+    model = (os.environ.get('OPENAI_MODEL') or 'gpt-4o-mini').strip()
+
+    pending = None
+    if cache_key and not force_refresh:
+        cached = check_deep_overview_cache(cache_key)
+        if cached:
+            if cached.get('status') != 'queued':
+                cached['_meta'] = {**(cached.get('_meta') or {}), 'cached': True}
+                return cached
+            pending = cached
+    if not api_key:
+        return {
+            'mode': 'deep',
+            'one_page_summary': (
+                "Deep overview requires OpenAI. Set OPENAI_API_KEY in the search Lambda to enable it. "
+                "This overview is generated from paper titles/abstracts, not full PDFs."
+            ),
+            '_meta': {'usedAI': False, 'hasOpenAIKey': False}
+        }
+
+    prompt = deep_overview_papers_context(query, selected) + "\n\nReturn JSON per the schema."
+
+    url = f"{OPENAI_API_BASE}/chat/completions"
     headers = {
         "Authorization": f"Bearer {api_key}",
         "Content-Type": "application/json",
         "User-Agent": DEFAULT_USER_AGENT,
     }
+    meta = {
+        'usedAI': True,
+        'hasOpenAIKey': True,
+        'model': model,
+        'cached': False,
+        'papersUsed': len(selected),
+    }
+
+    if pending is not None:
+        try:
+            deep = poll_deep_overview_batch(pending, headers)
+            if isinstance(deep, dict):
+                deep['_meta'] = {**meta, 'batch': True}
+                cache_deep_overview(cache_key, deep)
+                return deep
+            if batch:
+                pending['_meta'] = {**meta, 'usedAI': False, 'batch': True}
+                return pending
+        except Exception as e:
+            # A failed/expired batch falls through to a fresh submission or sync call.
+            print(f"Deep overview batch poll error: {str(e)}")
 
     payload = {
         "model": model,
         "messages": [
-            {"role": "system", "content": "You are a careful research assistant. Output JSON only."},
+            {"role": "system", "content": DEEP_OVERVIEW_SYSTEM_PROMPT},
             {"role": "user", "content": prompt},
         ],
         "temperature": 0.3,
         "max_tokens": 1400,
+        "stream": True,
         "response_format": {"type": "json_object"},
+        "prompt_cache_key": DEEP_OVERVIEW_PROMPT_CACHE_KEY,
     }
 
+    if batch and cache_key:
+        try:
+            placeholder = submit_deep_overview_batch(cache_key, payload, headers)
+            placeholder['_meta'] = {**meta, 'usedAI': False, 'batch': True}
+            return placeholder
+        except Exception as e:
+            # Batch submission is best-effort; fall back to the synchronous completion.
+            print(f"Deep overview batch submit error: {str(e)}")
+
     try:
-        resp = requests.post(url, headers=headers, json=payload, timeout=25)
+        # Streamed so tokens are consumed as they are generated instead of waiting on one
+        # large body; the Lambda/API Gateway boundary still returns the assembled JSON.
+        deadline = time.monotonic() + DEEP_OVERVIEW_DEADLINE_SECONDS
+        resp = SESSION.post(url, headers=headers, json=payload, timeout=25, stream=True)
         if resp.status_code >= 400:
             payload2 = dict(payload)
             payload2.pop('response_format', None)
-            resp2 = requests.post(url, headers=headers, json=payload2, timeout=25)
+            payload2.pop('prompt_cache_key', None)
+            resp2 = SESSION.post(url, headers=headers, json=payload2, timeout=25, stream=True)
             resp2.raise_for_status()
-            result = resp2.json()
+            content = read_openai_stream(resp2, deadline)
         else:
-            result = resp.json()
+            content = read_openai_stream(resp, deadline)
 
-        content = (((result or {}).get('choices') or [{}])[0].get('message') or {}).get('content')
         if not content:
             raise Exception('OpenAI response missing content')
 
-        try:
-            deep = json.loads(content)
-        except Exception:
-            m = re.search(r'\{[\s\S]*\}', content)
-            if not m:
-                raise
-            deep = json.loads(m.group(0))
+        deep = parse_json_content(content)
 
         if isinstance(deep, dict):
-            deep['_meta'] = {
-                'usedAI': True,
-                'hasOpenAIKey': True,
-                'model': model,
-                'cached': False,
-                'papersUsed': len(selected),
-            }
+            deep['_meta'] = dict(meta)
             if cache_key:
                 cache_deep_overview(cache_key, deep)
         return deep
@@ -1413,21 +2660,29 @@ def generate_deep_overview(
         }
 
 
+# Long-lived worker for search-result cache writes, so the PutItem overlaps the summary call.
+_CACHE_WRITER = ThreadPoolExecutor(max_workers=2, thread_name_prefix='cache-write')
+
+
 def check_cache(cache_key: str) -> Optional[List[Dict[str, Any]]]:
-    """Check DynamoDB cache for recent results"""
+    """Check the in-process L1, then the DynamoDB cache, for recent results"""
+    hit = _L1_CACHE.get(cache_key)
+    if hit is not None:
+        return hit
     try:
-        if not dynamodb:
+        table = _TABLE
+        if table is None:
             return None
-        table = dynamodb.Table(table_name)
         
         response = table.get_item(Key={'searchKey': cache_key})
         
         if 'Item' in response:
             item = response['Item']
             # Cache valid for 7 days
-            cache_time = datetime.fromisoformat(item['timestamp'])
-            if (datetime.now() - cache_time).days < 7:
-                return item.get('papers', [])
+            if cache_item_fresh(item, 7 * 24 * 60 * 60):
+                papers = unpack_cache_blob(item, 'papers_z', 'papers') or []
+                _L1_CACHE.set(cache_key, papers)
+                return papers
         
         return None
     except Exception as e:
@@ -1435,32 +2690,75 @@ def check_cache(cache_key: str) -> Optional[List[Dict[str, Any]]]:
         return None
 
 
-def cache_results(cache_key: str, papers: List[Dict[str, Any]]):
-    """Cache search results in DynamoDB"""
+def cache_results(
+    cache_key: str,
+    papers: List[Dict[str, Any]],
+    canonical: Optional[str] = None,
+) -> Optional[Dict[str, int]]:
+    """Cache search results in the L1 and DynamoDB.
+
+    ``canonical`` (the parameters the hashed key was built from) is stored alongside so items
+    stay inspectable in the console. Returns the raw vs. stored payload size for the debug block, or None if nothing was written.
+    """
+    _L1_CACHE.set(cache_key, papers)
     try:
-        if not dynamodb:
-            return
-        table = dynamodb.Table(table_name)
+        table = _TABLE
+        if table is None:
+            return None
         
-        table.put_item(Item={
+        raw = json_dumps_bytes(papers)
+        blob = zlib.compress(raw, CACHE_BLOB_LEVEL)
+        now_epoch = int(time.time())
+        item = {
             'searchKey': cache_key,
-            'timestamp': datetime.now().isoformat(),
-            'papers': papers,
-            'ttl': int(datetime.now().timestamp()) + (7 * 24 * 60 * 60)  # 7 days
-        })
+            'timestamp': utc_timestamp(now_epoch),
+            'fmt': CACHE_BLOB_FORMAT,
+            'papers_z': blob,
+            'ttl': now_epoch + (7 * 24 * 60 * 60)  # 7 days
+        }
+        if canonical:
+            item['canonical'] = canonical
+        table.put_item(Item=item)
+        return {'rawBytes': len(raw), 'storedBytes': len(blob)}
     except Exception as e:
         print(f"Cache write error: {str(e)}")
+        return None
+
+
+def accepts_gzip(event: Any) -> bool:
+    """True when the caller's Accept-Encoding (any header casing) allows gzip."""
+    headers = (event or {}).get('headers') if isinstance(event, dict) else None
+    if not isinstance(headers, dict):
+        return False
+    for name, value in headers.items():
+        if str(name).lower() == 'accept-encoding':
+            return 'gzip' in str(value or '').lower()
+    return False
 
 
-def create_response(status_code: int, body: Dict[str, Any]) -> Dict[str, Any]:
-    """Create API Gateway response"""
+def create_response(status_code: int, body: Dict[str, Any], gzip_ok: bool = False) -> Dict[str, Any]:
+    """Create API Gateway response.
+
+    With gzip_ok, bodies above SEARCH_RESPONSE_GZIP_MIN_BYTES are gzip-compressed (level 1,
+    cheap on CPU) and returned base64-encoded for API Gateway to decode on the way out.
+    """
+    headers = {
+        'Content-Type': 'application/json',
+        'Access-Control-Allow-Origin': '*',
+        'Access-Control-Allow-Headers': 'Content-Type',
+        'Access-Control-Allow-Methods': 'POST, OPTIONS'
+    }
+    # Compact JSON: smaller payload through API Gateway, nothing to parse differently.
+    raw = json_dumps_bytes(body)
+    if gzip_ok and len(raw) > SEARCH_RESPONSE_GZIP_MIN_BYTES:
+        return {
+            'statusCode': status_code,
+            'headers': {**headers, 'Content-Encoding': 'gzip', 'Vary': 'Accept-Encoding'},
+            'isBase64Encoded': True,
+            'body': base64.b64encode(gzip.compress(raw, compresslevel=1)).decode('ascii'),
+        }
     return {
         'statusCode': status_code,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',
-            'Access-Control-Allow-Headers': 'Content-Type',
-            'Access-Control-Allow-Methods': 'POST, OPTIONS'
-        },
-        'body': json.dumps(body)
+        'headers': headers,
+        'body': raw.decode('utf-8'),
     }
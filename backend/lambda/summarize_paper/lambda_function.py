@@ -1,13 +1,126 @@
+import hashlib
 import json
 import os
+import random
+import re
 import boto3
 import requests
+import threading
+import time
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
+
+# Optional faster JSON codec for request/response bodies and OpenAI stream chunks.
+# Not in requirements.txt (native wheel); the stdlib json path produces the same data.
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None
 
 # Initialize AWS services
 dynamodb = boto3.resource('dynamodb')
 table_name = os.environ.get('DYNAMODB_TABLE', 'academic-papers-cache')
+# Shared Table resource, built once per container instead of on every cache read/write.
+_TABLE = dynamodb.Table(table_name)
+
+# Pooled keep-alive session for OpenAI calls: warm invocations (and concurrent batch
+# workers) reuse TCP/TLS connections. Retries apply to idempotent methods only, so the
+# POST to OpenAI is never replayed.
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=2,
+    pool_maxsize=8,
+    max_retries=Retry(
+        total=2,
+        backoff_factor=0.2,
+        status_forcelist=(429, 500, 502, 503, 504),
+        raise_on_status=False,
+    ),
+))
+
+OPENAI_API_BASE = "https://api.openai.com/v1"
+
+# Wall-clock cap on one streamed completion; the HTTP timeout only bounds each socket read.
+SUMMARY_DEADLINE_SECONDS = float(os.environ.get('SUMMARY_DEADLINE_SECONDS', '25'))
+
+# Transient OpenAI failures (timeouts, connection resets, 429/5xx) are retried with
+# exponential backoff and full jitter, honoring Retry-After, within the deadline above.
+OPENAI_MAX_ATTEMPTS = max(1, int(os.environ.get('OPENAI_MAX_ATTEMPTS', '3')))
+OPENAI_RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+OPENAI_RETRY_MAX_DELAY_SECONDS = 20.0
+
+# Batch mode (`papers: [...]`): how many OpenAI calls run at once, and the
+# largest batch accepted in one invocation. Concurrency stays low to respect
+# OpenAI TPM limits; the cap keeps a batch well inside the Lambda timeout.
+BATCH_CONCURRENCY = max(1, int(os.environ.get('SUMMARIZE_BATCH_CONCURRENCY', '5')))
+BATCH_MAX_PAPERS = max(1, int(os.environ.get('SUMMARIZE_BATCH_MAX_PAPERS', '20')))
+# Bulk jobs (`useBatchApi: true`) go to the OpenAI Batch API instead, so they are not
+# bounded by the Lambda timeout, only by the request payload size.
+BATCH_API_MAX_PAPERS = max(1, int(os.environ.get('SUMMARIZE_BATCH_API_MAX_PAPERS', '1000')))
+# Output budget per paper summary, and gpt-3.5-turbo's ceiling on one completion.
+SUMMARY_MAX_TOKENS = 600
+OPENAI_MAX_COMPLETION_TOKENS = 4096
+# Papers packed into one chat completion in batch mode. OpenAI rate limits bite on
+# requests/minute before tokens/minute for prompts this short, so >1 stretches the RPM
+# budget; 1 keeps the one-paper-per-call prompt. Capped so every paper keeps its full
+# output budget within one completion.
+PAPERS_PER_REQUEST = min(
+    OPENAI_MAX_COMPLETION_TOKENS // SUMMARY_MAX_TOKENS,
+    max(1, int(os.environ.get('SUMMARIZE_PAPERS_PER_REQUEST', '1'))),
+)
+# Fields every summary must carry before it is returned from a bulk completion or cached.
+SUMMARY_FIELDS = ('key_findings', 'methodology', 'significance', 'limitations')
+
+# DynamoDB BatchGetItem accepts at most 100 keys per call.
+BATCH_GET_MAX_KEYS = 100
+BATCH_GET_MAX_ATTEMPTS = 3
+# Joins paperId and abstract hash in Batch API custom_ids.
+BATCH_HASH_SEPARATOR = '#abstract='
+
+# In-process front cache for summaries, so a warm container asked about the same
+# (trending) paper again skips the DynamoDB GetItem. Summaries only change on
+# force_refresh, which goes through cache_summary and refreshes this copy too. Entries
+# are the same items written to DynamoDB, so freshness checks apply to both alike.
+SUMMARY_L1_CACHE_SIZE = int(os.environ.get('SUMMARY_L1_CACHE_SIZE', '1024'))
+SUMMARY_L1_CACHE_TTL_SECONDS = int(os.environ.get('SUMMARY_L1_CACHE_TTL_SECONDS', '3600'))
+
+
+class _TTLCache:
+    """Small thread-safe LRU with per-entry expiry, kept in process memory across warm invocations."""
+
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._data: 'OrderedDict[str, Tuple[float, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+_L1_CACHE = _TTLCache(SUMMARY_L1_CACHE_SIZE, SUMMARY_L1_CACHE_TTL_SECONDS)
 
 def lambda_handler(event, context):
     """
@@ -19,10 +132,29 @@ def lambda_handler(event, context):
         "title": "Paper title",
         "abstract": "Full abstract text..."
     }
+
+    or, to summarize several papers in one invocation:
+    {
+        "papers": [{"paperId": "...", "title": "...", "abstract": "..."}, ...],
+        "useBatchApi": false   # true: queue on the OpenAI Batch API, poll with batchId
+    }
+
+    or, to collect a queued Batch API job:
+    {
+        "batchId": "batch_..."
+    }
     """
     try:
         # Parse request body
-        body = json.loads(event.get('body', '{}'))
+        body = json_loads(event.get('body', '{}'))
+        if 'papers' in body:
+            return summarize_batch(body)
+        if body.get('batchId'):
+            api_key = os.environ.get('OPENAI_API_KEY')
+            if not api_key:
+                return create_response(400, {'error': 'OPENAI_API_KEY is required for batch jobs'})
+            return create_response(200, collect_summary_batch(str(body['batchId']), api_key))
+
         paper_id = body.get('paperId', '').strip() if body.get('paperId') else ''
         title = body.get('title', '').strip() if body.get('title') else ''
         abstract_raw = body.get('abstract')
@@ -36,27 +168,10 @@ def lambda_handler(event, context):
         if not abstract:
             return create_response(400, {'error': 'Abstract is required or not available for this paper'})
         
-        # Check cache first
-        cached_summary = check_cache(paper_id)
-        if cached_summary and not force_refresh:
-            return create_response(200, {
-                'summary': cached_summary,
-                'cached': True,
-                **({'meta': {'fromCache': True}} if debug else {})
-            })
-        
-        # Generate AI summary
-        summary, meta = generate_summary(title, abstract)
-        
-        # Cache only successful AI-generated summaries.
-        # This prevents quota/network errors from being cached for 30 days and
-        # masking a later fix to billing/credentials.
-        if paper_id and meta.get('usedAI') is True:
-            cache_summary(paper_id, summary)
-        
+        summary, cached, meta = summarize_one(paper_id, title, abstract, force_refresh)
         return create_response(200, {
             'summary': summary,
-            'cached': False,
+            'cached': cached,
             **({'meta': meta} if debug else {})
         })
         
@@ -65,6 +180,163 @@ def lambda_handler(event, context):
         return create_response(500, {'error': f'Internal server error: {str(e)}'})
 
 
+def summarize_one(paper_id: str, title: str, abstract: str, force_refresh: bool = False) -> Tuple[Dict[str, Any], bool, Dict[str, Any]]:
+    """
+    Summarize a single paper: cache lookup, then OpenAI (or fallback).
+
+    Returns (summary, cached, meta).
+    """
+    digest = abstract_hash(abstract)
+
+    # Check cache first
+    if not force_refresh:
+        cached_summary = check_cache(paper_id, digest)
+        if cached_summary:
+            return cached_summary, True, {'fromCache': True}
+
+    # Generate AI summary
+    summary, meta = generate_summary(title, abstract)
+
+    # Cache only successful AI-generated summaries.
+    # This prevents quota/network errors from being cached for 30 days and
+    # masking a later fix to billing/credentials.
+    if paper_id and meta.get('usedAI') is True:
+        cache_summary(paper_id, summary, digest)
+
+    return summary, False, meta
+
+
+def summarize_batch(body: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Summarize a list of papers concurrently in one invocation.
+
+    Papers are summarized on a small thread pool (PAPERS_PER_REQUEST to a call),
+    so N papers cost one cold start and roughly max(t_openai) instead of N serial calls.
+    Response: {"summaries": {paperId: summary}, "errors": {paperId: message}}.
+
+    With useBatchApi, cache misses are queued on the OpenAI Batch API instead and the
+    response carries {"batch": {"batchId": ..., "status": ..., "count": n}}.
+    """
+    papers = body.get('papers')
+    api_key = os.environ.get('OPENAI_API_KEY')
+    use_batch_api = bool(body.get('useBatchApi', False)) and bool(api_key)
+    max_papers = BATCH_API_MAX_PAPERS if use_batch_api else BATCH_MAX_PAPERS
+    if not isinstance(papers, list) or not papers:
+        return create_response(400, {'error': 'papers must be a non-empty list'})
+    if len(papers) > max_papers:
+        return create_response(400, {'error': f'At most {max_papers} papers per request'})
+
+    force_refresh = bool(body.get('forceRefresh', False))
+    errors: Dict[str, str] = {}
+    jobs: Dict[str, Tuple[str, str]] = {}
+    for index, paper in enumerate(papers):
+        paper = paper if isinstance(paper, dict) else {}
+        paper_id = str(paper.get('paperId') or '').strip()
+        title = str(paper.get('title') or '').strip()
+        abstract = str(paper.get('abstract') or '').strip()
+        key = paper_id or str(index)
+        if not paper_id:
+            errors[key] = 'paperId is required'
+        elif not title:
+            errors[key] = 'Title is required'
+        elif not abstract:
+            errors[key] = 'Abstract is required or not available for this paper'
+        else:
+            jobs.setdefault(paper_id, (title, abstract))
+
+    summaries: Dict[str, Any] = {}
+    if jobs and not force_refresh:
+        # One BatchGetItem for the whole list instead of a GetItem per paper.
+        hashes = {paper_id: abstract_hash(abstract) for paper_id, (_, abstract) in jobs.items()}
+        summaries.update(check_cache_batch(list(jobs), hashes))
+        for paper_id in summaries:
+            jobs.pop(paper_id, None)
+
+    if jobs and use_batch_api:
+        batch = submit_summary_batch(jobs, api_key)
+        return create_response(200, {'summaries': summaries, 'errors': errors, 'batch': batch})
+
+    if jobs:
+        items = [(paper_id, title, abstract) for paper_id, (title, abstract) in jobs.items()]
+        groups = [items[i:i + PAPERS_PER_REQUEST] for i in range(0, len(items), PAPERS_PER_REQUEST)]
+        workers = min(BATCH_CONCURRENCY, len(groups))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [(group, pool.submit(summarize_group, group)) for group in groups]
+            for group, future in futures:
+                try:
+                    summaries.update(future.result())
+                except Exception as e:
+                    print(f"Batch summary error for {[item[0] for item in group]}: {str(e)}")
+                    for paper_id, _, _ in group:
+                        errors[paper_id] = 'Summary failed'
+
+    return create_response(200, {'summaries': summaries, 'errors': errors})
+
+
+def summarize_group(group: List[Tuple[str, str, str]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Summarize (paperId, title, abstract) triples for batch mode; the cache was already
+    consulted. Groups of two or more share one chat completion, and any paper missing
+    from that answer is summarized on its own.
+    """
+    bulk = generate_summaries_bulk([(title, abstract) for _, title, abstract in group]) if len(group) > 1 else []
+    summaries: Dict[str, Dict[str, Any]] = {}
+    fresh: List[Tuple[str, Dict[str, Any]]] = []
+    hashes: Dict[str, str] = {}
+    for index, (paper_id, title, abstract) in enumerate(group):
+        summary = bulk[index] if index < len(bulk) else None
+        if summary is not None:
+            summaries[paper_id] = summary
+            fresh.append((paper_id, summary))
+            hashes[paper_id] = abstract_hash(abstract)
+        else:
+            summaries[paper_id] = summarize_one(paper_id, title, abstract, True)[0]
+    cache_summaries_bulk(fresh, hashes)
+    return summaries
+
+
+def generate_summaries_bulk(pairs: List[Tuple[str, str]]) -> List[Optional[Dict[str, Any]]]:
+    """
+    Summarize several (title, abstract) pairs in one chat completion.
+
+    Returns one entry per pair, in order: the parsed summary, or None when there is
+    no API key, the call failed, or the model left that paper out or returned it
+    without all of SUMMARY_FIELDS. The completion is streamed under the same
+    SUMMARY_DEADLINE_SECONDS wall-clock cap as a single-paper summary.
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(pairs)
+    api_key = os.environ.get('OPENAI_API_KEY')
+    if not api_key or not pairs:
+        return results
+
+    url = f"{OPENAI_API_BASE}/chat/completions"
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json"
+    }
+    payload = build_bulk_summary_payload(pairs)
+    meta: Dict[str, Any] = {}
+    try:
+        deadline = time.monotonic() + SUMMARY_DEADLINE_SECONDS
+        response = post_openai(url, headers, payload, deadline, meta)
+        response.raise_for_status()
+        content = read_openai_stream(response, deadline)
+        for entry in json.loads(content).get('results') or []:
+            if not isinstance(entry, dict):
+                continue
+            try:
+                index = int(entry.pop('id')) - 1
+            except (KeyError, TypeError, ValueError):
+                continue
+            if not all(field in entry for field in SUMMARY_FIELDS):
+                continue
+            if 0 <= index < len(pairs) and results[index] is None:
+                results[index] = entry
+    except Exception as e:
+        print(f"Bulk summary error ({len(pairs)} papers): {type(e).__name__}: {str(e)}")
+    return results
+
+
 def generate_summary(title: str, abstract: str):
     """
     Generate AI summary using OpenAI API
@@ -82,42 +354,17 @@ def generate_summary(title: str, abstract: str):
     print(f"Using OpenAI API key (starts with: {api_key[:10]}...)")
     
     # OpenAI API call
-    url = "https://api.openai.com/v1/chat/completions"
+    url = f"{OPENAI_API_BASE}/chat/completions"
     headers = {
         "Authorization": f"Bearer {api_key}",
         "Content-Type": "application/json"
     }
-    
-    prompt = f"""You are an expert academic researcher analyzing a research paper. Extract specific, insightful information from the title and abstract.
-
-Title: {title}
-
-Abstract: {abstract}
-
-Provide ONLY a valid JSON object with exactly these fields:
-{{
-  "key_findings": ["Specific finding 1 from the abstract", "Specific finding 2 from the abstract", "Specific finding 3 from the abstract"],
-  "methodology": "Specific research methods used (be detailed if mentioned)",
-  "significance": "Why this research matters and its contributions",
-  "limitations": "Study limitations or gaps identified, or 'Not specified in abstract'"
-}}
-
-Focus on concrete details from the abstract. If information is not available, say so specifically rather than using generic phrases."""
-
-    payload = {
-        "model": "gpt-3.5-turbo",
-        "messages": [
-            {"role": "system", "content": "You are an expert academic researcher. Always respond with valid JSON only, no markdown formatting."},
-            {"role": "user", "content": prompt}
-        ],
-        "temperature": 0.4,
-        "max_tokens": 600,
-        "response_format": { "type": "json_object" }
-    }
+    payload = build_summary_payload(title, abstract)
     
     try:
         print("Calling OpenAI API...")
-        response = requests.post(url, headers=headers, json=payload, timeout=30)
+        deadline = time.monotonic() + SUMMARY_DEADLINE_SECONDS
+        response = post_openai(url, headers, payload, deadline, meta)
         print(f"OpenAI response status: {response.status_code}")
         meta['openaiStatus'] = response.status_code
 
@@ -132,32 +379,13 @@ Focus on concrete details from the abstract. If information is not available, sa
 
         response.raise_for_status()
         
-        result = response.json()
-        summary_text = result['choices'][0]['message']['content']
+        summary_text = read_openai_stream(response, deadline)
+        if not summary_text:
+            raise Exception("OpenAI response missing content")
         print(f"OpenAI raw response: {summary_text[:200]}...")
         
-        # Parse JSON response
-        try:
-            # Remove markdown code blocks if present
-            if summary_text.strip().startswith('```'):
-                summary_text = summary_text.strip()
-                summary_text = summary_text.split('```')[1]
-                if summary_text.startswith('json'):
-                    summary_text = summary_text[4:]
-            
-            summary_json = json.loads(summary_text)
-            print("Successfully parsed AI summary")
-            meta['usedAI'] = True
-            return summary_json, meta
-        except json.JSONDecodeError as je:
-            print(f"JSON parse error: {str(je)}, raw text: {summary_text}")
-            meta['usedAI'] = True
-            return {
-                "key_findings": [summary_text[:500]],
-                "methodology": "See abstract",
-                "significance": "Academic research contribution",
-                "limitations": "Not specified"
-            }, meta
+        meta['usedAI'] = True
+        return parse_summary_text(summary_text), meta
             
     except requests.exceptions.RequestException as req_err:
         print(f"OpenAI API request error: {str(req_err)}")
@@ -178,41 +406,332 @@ Focus on concrete details from the abstract. If information is not available, sa
         return extract_simple_summary(title, abstract), meta
 
 
+def retry_delay(attempt: int, response: Any = None) -> float:
+    """Seconds to wait before retrying after `attempt` (1-based) failed."""
+    retry_after = (getattr(response, 'headers', None) or {}).get('Retry-After')
+    if retry_after:
+        try:
+            return min(float(retry_after), OPENAI_RETRY_MAX_DELAY_SECONDS)
+        except ValueError:
+            pass
+    return random.uniform(0, min(OPENAI_RETRY_MAX_DELAY_SECONDS, 0.5 * (2 ** attempt)))
+
+
+def is_quota_error(response: Any) -> bool:
+    """429 insufficient_quota is a billing state, not rate limiting; retrying cannot help."""
+    try:
+        return (response.json().get('error') or {}).get('code') == 'insufficient_quota'
+    except Exception:
+        return False
+
+
+def post_openai(url: str, headers: Dict[str, str], payload: Dict[str, Any], deadline: float, meta: Dict[str, Any]) -> Any:
+    """POST a streamed completion, retrying transient failures while time remains.
+
+    Returns the last response (possibly an error status for the caller to report) or
+    re-raises the last timeout/connection error. meta['retries'] counts the retries.
+    """
+    attempt = 0
+    while True:
+        attempt += 1
+        response = None
+        try:
+            response = SESSION.post(url, headers=headers, json=payload, timeout=30, stream=True)
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
+            if attempt >= OPENAI_MAX_ATTEMPTS:
+                raise
+            delay = retry_delay(attempt)
+            if time.monotonic() + delay >= deadline:
+                raise
+        else:
+            if (response.status_code not in OPENAI_RETRY_STATUSES
+                    or attempt >= OPENAI_MAX_ATTEMPTS
+                    or is_quota_error(response)):
+                return response
+            delay = retry_delay(attempt, response)
+            if time.monotonic() + delay >= deadline:
+                return response
+            response.close()
+        meta['retries'] = attempt
+        print(f"OpenAI attempt {attempt} failed; retrying in {delay:.2f}s")
+        time.sleep(delay)
+
+
+# Instructions live in fixed system messages and the paper text goes last in the user
+# message, so every request shares a byte-identical prefix (eligible for OpenAI prompt
+# caching once a prompt is long enough).
+SUMMARY_SYSTEM_PROMPT = """You are an expert academic researcher analyzing a research paper. Extract specific, insightful information from the title and abstract the user provides.
+
+Provide ONLY a valid JSON object with exactly these fields, no markdown formatting:
+{
+  "key_findings": ["Specific finding 1 from the abstract", "Specific finding 2 from the abstract", "Specific finding 3 from the abstract"],
+  "methodology": "Specific research methods used (be detailed if mentioned)",
+  "significance": "Why this research matters and its contributions",
+  "limitations": "Study limitations or gaps identified, or 'Not specified in abstract'"
+}
+
+Focus on concrete details from the abstract. If information is not available, say so specifically rather than using generic phrases."""
+
+BULK_SUMMARY_SYSTEM_PROMPT = """You are an expert academic researcher analyzing research papers. For each numbered paper the user provides, extract specific, insightful information from its title and abstract.
+
+Provide ONLY a valid JSON object of this form, with one entry per paper, no markdown formatting:
+{
+  "results": [
+    {
+      "id": 1,
+      "key_findings": ["Specific finding 1 from the abstract", "Specific finding 2 from the abstract", "Specific finding 3 from the abstract"],
+      "methodology": "Specific research methods used (be detailed if mentioned)",
+      "significance": "Why this research matters and its contributions",
+      "limitations": "Study limitations or gaps identified, or 'Not specified in abstract'"
+    }
+  ]
+}
+
+Focus on concrete details from each abstract and never mix details between papers. If information is not available, say so specifically rather than using generic phrases."""
+
+
+def build_summary_payload(title: str, abstract: str) -> Dict[str, Any]:
+    """Chat-completions request body for one paper (shared by the live and Batch API paths)."""
+    return {
+        "model": "gpt-3.5-turbo",
+        "messages": [
+            {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+            {"role": "user", "content": f"Title: {title}\n\nAbstract: {abstract}"}
+        ],
+        "temperature": 0.4,
+        "max_tokens": SUMMARY_MAX_TOKENS,
+        "stream": True,
+        "response_format": { "type": "json_object" }
+    }
+
+
+def build_bulk_summary_payload(pairs: List[Tuple[str, str]]) -> Dict[str, Any]:
+    """Chat-completions request body summarizing several numbered papers at once."""
+    papers = "\n\n".join(
+        f"{number}. Title: {title}\nAbstract: {abstract}"
+        for number, (title, abstract) in enumerate(pairs, start=1)
+    )
+    return {
+        "model": "gpt-3.5-turbo",
+        "messages": [
+            {"role": "system", "content": BULK_SUMMARY_SYSTEM_PROMPT},
+            {"role": "user", "content": papers}
+        ],
+        "temperature": 0.4,
+        "max_tokens": min(SUMMARY_MAX_TOKENS * len(pairs), OPENAI_MAX_COMPLETION_TOKENS),
+        "stream": True,
+        "response_format": { "type": "json_object" }
+    }
+
+
+def load_summary_json(summary_text: str) -> Any:
+    """json.loads the model's summary, tolerating a markdown code fence around it."""
+    if summary_text.strip().startswith('```'):
+        summary_text = summary_text.strip()
+        summary_text = summary_text.split('```')[1]
+        if summary_text.startswith('json'):
+            summary_text = summary_text[4:]
+    return json.loads(summary_text)
+
+
+def parse_summary_text(summary_text: str) -> Dict[str, Any]:
+    """Parse the model's JSON summary, wrapping unparseable text in the summary shape."""
+    try:
+        summary_json = load_summary_json(summary_text)
+        print("Successfully parsed AI summary")
+        return summary_json
+    except json.JSONDecodeError as je:
+        print(f"JSON parse error: {str(je)}, raw text: {summary_text}")
+        return {
+            "key_findings": [summary_text[:500]],
+            "methodology": "See abstract",
+            "significance": "Academic research contribution",
+            "limitations": "Not specified"
+        }
+
+
+def submit_summary_batch(jobs: Dict[str, Tuple[str, str]], api_key: str) -> Dict[str, Any]:
+    """Queue {paperId: (title, abstract)} on the OpenAI Batch API (half price, 24h window).
+
+    Poll with collect_summary_batch(batchId); finished summaries are cached per paper, so
+    later single or batched requests for these papers are cache hits. Each custom_id
+    carries the abstract hash so the collected summary is cached against it.
+    """
+    lines = []
+    for paper_id, (title, abstract) in jobs.items():
+        body = build_summary_payload(title, abstract)
+        body.pop('stream', None)
+        lines.append(json.dumps({
+            'custom_id': f"{paper_id}{BATCH_HASH_SEPARATOR}{abstract_hash(abstract)}",
+            'method': 'POST',
+            'url': '/v1/chat/completions',
+            'body': body,
+        }))
+    auth = {"Authorization": f"Bearer {api_key}"}
+
+    upload = SESSION.post(
+        f"{OPENAI_API_BASE}/files",
+        headers=auth,
+        data={'purpose': 'batch'},
+        files={'file': ('summaries.jsonl', '\n'.join(lines).encode('utf-8'), 'application/jsonl')},
+        timeout=30,
+    )
+    upload.raise_for_status()
+    batch = SESSION.post(
+        f"{OPENAI_API_BASE}/batches",
+        headers={**auth, "Content-Type": "application/json"},
+        json={
+            'input_file_id': upload.json()['id'],
+            'endpoint': '/v1/chat/completions',
+            'completion_window': '24h',
+        },
+        timeout=15,
+    )
+    batch.raise_for_status()
+    batch_json = batch.json()
+    return {'batchId': batch_json['id'], 'status': batch_json.get('status', 'validating'), 'count': len(lines)}
+
+
+def collect_summary_batch(batch_id: str, api_key: str) -> Dict[str, Any]:
+    """Check a summary batch; once completed, parse and cache every paper's summary.
+
+    Only complete summaries (valid JSON carrying all of SUMMARY_FIELDS) are cached; any
+    other output lands in `errors`, so a later request regenerates that paper.
+    """
+    auth = {"Authorization": f"Bearer {api_key}"}
+    resp = SESSION.get(f"{OPENAI_API_BASE}/batches/{batch_id}", headers=auth, timeout=10)
+    resp.raise_for_status()
+    batch = resp.json()
+    status = batch.get('status')
+    if status != 'completed' or not batch.get('output_file_id'):
+        return {'batchId': batch_id, 'status': status}
+
+    out = SESSION.get(f"{OPENAI_API_BASE}/files/{batch['output_file_id']}/content", headers=auth, timeout=30)
+    out.raise_for_status()
+    summaries: Dict[str, Any] = {}
+    errors: Dict[str, str] = {}
+    hashes: Dict[str, str] = {}
+    for raw in out.text.splitlines():
+        if not raw.strip():
+            continue
+        result = json.loads(raw)
+        paper_id, separator, digest = (result.get('custom_id') or '').rpartition(BATCH_HASH_SEPARATOR)
+        if not separator:
+            paper_id = digest  # batch queued before custom_ids carried the hash
+        body = ((result.get('response') or {}).get('body') or {})
+        choice = (body.get('choices') or [{}])[0]
+        content = ((choice.get('message') or {}).get('content') or '')
+        if not content:
+            errors[paper_id] = str((result.get('error') or {}).get('message') or 'No content')
+            continue
+        if choice.get('finish_reason') == 'length':
+            errors[paper_id] = 'Summary truncated at max_tokens'
+            continue
+        try:
+            summary = load_summary_json(content)
+        except ValueError:
+            errors[paper_id] = 'Summary is not valid JSON'
+            continue
+        if not isinstance(summary, dict) or not all(field in summary for field in SUMMARY_FIELDS):
+            errors[paper_id] = 'Summary is missing required fields'
+            continue
+        summaries[paper_id] = summary
+        if separator:
+            hashes[paper_id] = digest
+    cache_summaries_bulk(list(summaries.items()), hashes)
+    return {'batchId': batch_id, 'status': status, 'summaries': summaries, 'errors': errors}
+
+
+def read_openai_stream(response: Any, deadline: Optional[float] = None) -> str:
+    """Accumulate message content from an OpenAI chat-completions SSE stream.
+
+    Past `deadline` (a time.monotonic() instant) the read is abandoned with a TimeoutError,
+    so a slow-but-steady stream cannot run out the Lambda timeout. A completion cut off at
+    max_tokens (finish_reason "length") raises ValueError: the JSON is incomplete and must
+    not be cached as a summary.
+    """
+    if getattr(response, 'encoding', None) is None:
+        response.encoding = 'utf-8'
+    parts = []
+    finish_reason = None
+    for line in response.iter_lines(decode_unicode=True):
+        if deadline is not None and time.monotonic() > deadline:
+            close = getattr(response, 'close', None)
+            if close:
+                close()
+            raise TimeoutError('OpenAI stream exceeded deadline')
+        if not line or not line.startswith('data:'):
+            continue
+        data = line[5:].strip()
+        if data == '[DONE]':
+            break
+        try:
+            chunk = json_loads(data)
+        except ValueError:
+            continue
+        for choice in chunk.get('choices') or []:
+            piece = (choice.get('delta') or {}).get('content')
+            if piece:
+                parts.append(piece)
+            finish_reason = choice.get('finish_reason') or finish_reason
+    if finish_reason == 'length':
+        raise ValueError('OpenAI response truncated at max_tokens')
+    return ''.join(parts)
+
+
+# Runs of text between periods (the fallback summary's notion of a sentence).
+_SENTENCE_RE = re.compile(r'[^.]+')
+
+
 def extract_simple_summary(title: str, abstract: str) -> Dict[str, Any]:
     """
     Fallback: Extract key information without AI API
     """
-    # Split abstract into sentences
-    sentences = [s.strip() for s in abstract.replace('\n', ' ').split('.') if s.strip()]
-    
-    # Take first 2-3 sentences as key findings
-    key_findings = sentences[:2] if len(sentences) >= 2 else sentences
+    # Take the first two sentences as key findings; stop scanning once they are found
+    key_findings = []
+    for match in _SENTENCE_RE.finditer(abstract):
+        sentence = match.group().replace('\n', ' ').strip()
+        if sentence:
+            key_findings.append(sentence)
+            if len(key_findings) == 2:
+                break
+
+    # partition() stops at the first colon instead of splitting the whole title.
+    field, colon, _ = title.partition(':')
     
     return {
         "key_findings": key_findings,
         "methodology": "Detailed in full paper",
-        "significance": "Academic research contribution in " + title.split(':')[0] if ':' in title else "Academic research contribution",
+        "significance": "Academic research contribution in " + field if colon else "Academic research contribution",
         "limitations": "Not specified in abstract"
     }
 
 
-def check_cache(paper_id: str) -> Optional[Dict[str, Any]]:
-    """Check DynamoDB cache for existing summary"""
+def abstract_hash(abstract: str) -> str:
+    """Short fingerprint of the abstract a summary was generated from."""
+    return hashlib.blake2b(abstract.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def check_cache(paper_id: str, abstract_hash: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Check DynamoDB cache for existing summary of this abstract"""
     if not paper_id:
         return None
-        
+
+    cached = _L1_CACHE.get(paper_id)
+    if cached is not None:
+        summary = fresh_summary(cached, abstract_hash)
+        if summary:
+            return summary
+
     try:
-        table = dynamodb.Table(table_name)
+        table = _TABLE
         cache_key = f"summary:{paper_id}"
         
         response = table.get_item(Key={'searchKey': cache_key})
         
         if 'Item' in response:
-            item = response['Item']
-            # Cache valid for 30 days
-            cache_time = datetime.fromisoformat(item['timestamp'])
-            if (datetime.now() - cache_time).days < 30:
-                return item.get('summary', None)
+            _L1_CACHE.set(paper_id, response['Item'])
+            return fresh_summary(response['Item'], abstract_hash)
         
         return None
     except Exception as e:
@@ -220,22 +739,109 @@ def check_cache(paper_id: str) -> Optional[Dict[str, Any]]:
         return None
 
 
-def cache_summary(paper_id: str, summary: Dict[str, Any]):
+def check_cache_batch(paper_ids: List[str], abstract_hashes: Optional[Dict[str, str]] = None) -> Dict[str, Dict[str, Any]]:
+    """Look up cached summaries for many papers with BatchGetItem.
+
+    Returns {paperId: summary} for fresh hits only; misses are simply absent.
+    abstract_hashes ({paperId: abstract_hash}) rejects summaries of a different abstract.
+    """
+    hashes = abstract_hashes or {}
+    found: Dict[str, Dict[str, Any]] = {}
+    ids = []
+    for pid in dict.fromkeys(pid for pid in paper_ids if pid):
+        cached = _L1_CACHE.get(pid)
+        summary = fresh_summary(cached, hashes.get(pid)) if cached is not None else None
+        if summary:
+            found[pid] = summary
+        else:
+            ids.append(pid)
+    try:
+        for start in range(0, len(ids), BATCH_GET_MAX_KEYS):
+            keys = [{'searchKey': f"summary:{pid}"} for pid in ids[start:start + BATCH_GET_MAX_KEYS]]
+            request: Optional[Dict[str, Any]] = {table_name: {'Keys': keys}}
+            attempt = 0
+            while request:
+                response = dynamodb.batch_get_item(RequestItems=request)
+                for item in response.get('Responses', {}).get(table_name, []):
+                    pid = item['searchKey'][len('summary:'):]
+                    _L1_CACHE.set(pid, item)
+                    summary = fresh_summary(item, hashes.get(pid))
+                    if summary:
+                        found[pid] = summary
+                # Throttled keys come back as UnprocessedKeys; retry them with
+                # a short backoff, then treat any leftovers as misses.
+                request = response.get('UnprocessedKeys') or None
+                attempt += 1
+                if request:
+                    if attempt >= BATCH_GET_MAX_ATTEMPTS:
+                        break
+                    time.sleep(0.05 * (2 ** attempt))
+    except Exception as e:
+        print(f"Batch cache check error: {str(e)}")
+    return found
+
+
+def fresh_summary(item: Dict[str, Any], abstract_hash: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Return the cached summary if the item is still fresh (30 days).
+
+    With abstract_hash, a summary generated from a different abstract (e.g. the source
+    re-crawled a better one) is a miss. Items cached before hashes were stored match any.
+    """
+    stored_hash = item.get('abstractHash')
+    if abstract_hash and stored_hash and stored_hash != abstract_hash:
+        return None
+    try:
+        cache_time = datetime.fromisoformat(item['timestamp'])
+    except (KeyError, TypeError, ValueError):
+        return None
+    if (datetime.now() - cache_time).days < 30:
+        return item.get('summary', None)
+    return None
+
+
+def cache_summary(paper_id: str, summary: Dict[str, Any], abstract_hash: Optional[str] = None):
     """Cache summary in DynamoDB"""
+    item = summary_item(paper_id, summary, abstract_hash)
+    _L1_CACHE.set(paper_id, item)
     try:
-        table = dynamodb.Table(table_name)
-        cache_key = f"summary:{paper_id}"
-        
-        table.put_item(Item={
-            'searchKey': cache_key,
-            'timestamp': datetime.now().isoformat(),
-            'summary': summary,
-            'ttl': int(datetime.now().timestamp()) + (30 * 24 * 60 * 60)  # 30 days
-        })
+        _TABLE.put_item(Item=item)
     except Exception as e:
         print(f"Cache write error: {str(e)}")
 
 
+def cache_summaries_bulk(items: List[Tuple[str, Dict[str, Any]]], abstract_hashes: Optional[Dict[str, str]] = None):
+    """Cache many summaries with BatchWriteItem (25 puts per call) instead of one PutItem each.
+
+    batch_writer handles the chunking and resends unprocessed items; overwrite_by_pkeys
+    keeps a repeated paperId from failing the whole batch.
+    """
+    if not items:
+        return
+    hashes = abstract_hashes or {}
+    records = [summary_item(paper_id, summary, hashes.get(paper_id)) for paper_id, summary in items]
+    for (paper_id, _), record in zip(items, records):
+        _L1_CACHE.set(paper_id, record)
+    try:
+        with _TABLE.batch_writer(overwrite_by_pkeys=['searchKey']) as batch:
+            for record in records:
+                batch.put_item(Item=record)
+    except Exception as e:
+        print(f"Bulk cache write error: {str(e)}")
+
+
+def summary_item(paper_id: str, summary: Dict[str, Any], abstract_hash: Optional[str] = None) -> Dict[str, Any]:
+    """DynamoDB item for a cached summary (30-day TTL)."""
+    item = {
+        'searchKey': f"summary:{paper_id}",
+        'timestamp': datetime.now().isoformat(),
+        'summary': summary,
+        'ttl': int(datetime.now().timestamp()) + (30 * 24 * 60 * 60)  # 30 days
+    }
+    if abstract_hash:
+        item['abstractHash'] = abstract_hash
+    return item
+
+
 def create_response(status_code: int, body: Dict[str, Any]) -> Dict[str, Any]:
     """Create API Gateway response"""
     return {
@@ -246,5 +852,23 @@ def create_response(status_code: int, body: Dict[str, Any]) -> Dict[str, Any]:
             'Access-Control-Allow-Headers': 'Content-Type',
             'Access-Control-Allow-Methods': 'POST, OPTIONS'
         },
-        'body': json.dumps(body)
+        # Compact JSON: smaller payload through API Gateway, nothing to parse differently.
+        'body': json_dumps_bytes(body).decode('utf-8')
     }
+
+
+def json_dumps_bytes(value: Any) -> bytes:
+    """Compact JSON as UTF-8 bytes, via orjson when it is packaged."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # e.g. a stray Decimal; the stdlib encoder reports it the usual way
+    return json.dumps(value, separators=(',', ':')).encode('utf-8')
+
+
+def json_loads(data: Any) -> Any:
+    """Parse JSON from str or bytes, via orjson when it is packaged."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -1,9 +1,17 @@
 from __future__ import annotations
 
+import functools
 import importlib.util
 from pathlib import Path
 
 
+@functools.lru_cache(maxsize=None)
+def _compiled(path: Path):
+    # Compile each Lambda source once per session; every test still execs a fresh module,
+    # so in-memory caches and attributes a test replaces never leak into the next test.
+    return compile(path.read_bytes(), str(path), "exec")
+
+
 def load_module(module_name: str, relative_path: str):
     root = Path(__file__).resolve().parents[2]
     path = root / relative_path
@@ -11,7 +19,7 @@ def load_module(module_name: str, relative_path: str):
     if spec is None or spec.loader is None:
         raise RuntimeError(f"Failed to load module: {relative_path}")
     module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(module)
+    exec(_compiled(path), module.__dict__)
     return module
 
 
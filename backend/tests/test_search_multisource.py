@@ -1,8 +1,23 @@
 from __future__ import annotations
 
+import functools
 import importlib.util
+import json
+import os
 from pathlib import Path
 
+import pytest
+
+# boto3.resource('dynamodb') runs at module import; without a region it can fail.
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+
+@functools.lru_cache(maxsize=None)
+def _compiled(path: Path):
+    # Compile each Lambda source once per session; every test still execs a fresh module,
+    # so in-memory caches and attributes a test replaces never leak into the next test.
+    return compile(path.read_bytes(), str(path), "exec")
+
 
 def load_module(module_name: str, relative_path: str):
     root = Path(__file__).resolve().parents[2]
@@ -11,7 +26,7 @@ def load_module(module_name: str, relative_path: str):
     if spec is None or spec.loader is None:
         raise RuntimeError(f"Failed to load module: {relative_path}")
     module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(module)
+    exec(_compiled(path), module.__dict__)
     return module
 
 
@@ -100,6 +115,76 @@ def test_deduplicate_preserves_multi_source_provenance():
     assert merged.get("source") == "OpenAlex"
 
 
+def test_deduplicate_merges_fuzzy_title_matches_with_shared_author():
+    mod = load_module("search_lambda", "backend/lambda/search_papers/lambda_function_multisource.py")
+    papers = [
+        {"paperId": "oa-1", "title": "Attention Is All You Need", "doi": "10.1000/nips",
+         "year": 2017, "authors": ["Ashish Vaswani", "Noam Shazeer"], "source": "OpenAlex",
+         "_rank": 0, "citationCount": 900},
+        {"paperId": "ax-1", "title": "Attention is all you need (Preprint)", "doi": "10.48550/arXiv.1706.03762",
+         "year": 2017, "authors": ["Vaswani, A."], "source": "arXiv", "_rank": 1, "citationCount": 0},
+        # Near-identical title, different authors: kept.
+        {"paperId": "cr-1", "title": "Attention Is All You Need (Abridged)", "year": 2017,
+         "authors": ["Jane Doe"], "source": "Crossref", "_rank": 2},
+        # Same authors, near-identical title, different year: kept.
+        {"paperId": "ss-1", "title": "Attention Is All You Need (Extended)", "year": 2018,
+         "authors": ["Ashish Vaswani"], "source": "Semantic Scholar", "_rank": 3},
+    ]
+    deduped = mod.deduplicate_papers(papers)
+    assert [p["paperId"] for p in deduped] == ["oa-1", "cr-1", "ss-1"]
+    assert deduped[0]["sources"] == ["OpenAlex", "arXiv"]
+
+
+def test_deduplicate_matches_doi_less_records_by_title():
+    mod = load_module("search_lambda", "backend/lambda/search_papers/lambda_function_multisource.py")
+    papers = [
+        # arXiv records always carry an arXiv DOI; the Semantic Scholar copy has none.
+        {"paperId": "ax-1", "title": "Streaming Parsers", "doi": "10.48550/arXiv.2101.00001",
+         "year": 2021, "source": "arXiv", "_rank": 0},
+        {"paperId": "ss-1", "title": "Streaming parsers", "year": 2022, "source": "Semantic Scholar", "_rank": 1},
+        # DOI-less record first, DOI-bearing record later: still one paper.
+        {"paperId": "ss-2", "title": "Lazy Lexers", "source": "Semantic Scholar", "_rank": 2},
+        {"paperId": "oa-2", "title": "Lazy lexers", "doi": "10.1/lexers", "source": "OpenAlex", "_rank": 3},
+        # Same title but a second, different DOI: a different work.
+        {"paperId": "cr-2", "title": "Lazy Lexers", "doi": "10.1/other", "source": "Crossref", "_rank": 4},
+    ]
+    deduped = mod.deduplicate_papers(papers)
+    assert [sorted(p["sources"]) for p in deduped] == [
+        ["Semantic Scholar", "arXiv"],
+        ["OpenAlex", "Semantic Scholar"],
+        ["Crossref"],
+    ]
+
+
+def test_token_set_ratio_matches_reference_cases():
+    mod = load_module("search_lambda", "backend/lambda/search_papers/lambda_function_multisource.py")
+    assert mod._token_set_ratio("deep learning", "deep learning preprint") == 100
+    assert mod._token_set_ratio("graph networks for molecules", "graph networks for proteins") < 95
+    assert mod._token_set_ratio("graph neural networks", "protein folding") < 50
+    # A short title is not a near-duplicate of a longer one that merely contains its words.
+    assert mod._token_set_ratio("deep learning", "deep learning for medical imaging a survey", 95) == 0
+    assert mod._token_set_ratio(
+        "graph neural networks", "graph neural networks a review of methods and applications", 95
+    ) == 0
+
+
+def test_fuzzy_dedup_keeps_errata_and_distinct_dois_apart():
+    mod = load_module("search_lambda", "backend/lambda/search_papers/lambda_function_multisource.py")
+    authors = ["Kaiming He", "Xiangyu Zhang"]
+    papers = [
+        {"paperId": "a", "title": "Deep residual learning", "doi": "10.1/b", "year": 2016, "authors": authors},
+        {"paperId": "b", "title": "Erratum: Deep residual learning", "doi": "10.1/a", "year": 2016, "authors": authors},
+        {"paperId": "c", "title": "Erratum: Deep residual learning (corrected)", "year": 2016, "authors": authors},
+        {"paperId": "d", "title": "Deep Residual Learning", "doi": "10.1/c", "year": 2016, "authors": authors},
+        {"paperId": "e", "title": "Graph neural networks", "year": 2016, "authors": authors},
+        {"paperId": "f", "title": "Graph neural networks: A review of methods and applications",
+         "year": 2016, "authors": authors},
+    ]
+    deduped = mod.deduplicate_papers(papers)
+    # Only the DOI-less erratum copy folds into the erratum; different DOIs stay apart.
+    assert [p["paperId"] for p in deduped] == ["a", "b", "d", "e", "f"]
+
+
 def test_source_counts_returns_distribution():
     mod = load_module("search_lambda", "backend/lambda/search_papers/lambda_function_multisource.py")
     counts = mod.source_counts(
@@ -110,3 +195,853 @@ def test_source_counts_returns_distribution():
         ]
     )
     assert counts == {"OpenAlex": 2, "Crossref": 1}
+
+
+class FakeTable:
+    def __init__(self):
+        self.items = {}
+
+    def put_item(self, Item):
+        self.items[Item["searchKey"]] = dict(Item)
+
+    def get_item(self, Key):
+        item = self.items.get(Key["searchKey"])
+        return {"Item": dict(item)} if item is not None else {}
+
+
+def test_cache_round_trip_stores_compressed_blob(monkeypatch):
+    mod = load_module("search_lambda", "backend/lambda/search_papers/lambda_function_multisource.py")
+    table = FakeTable()
+    monkeypatch.setattr(mod, "_TABLE", table)
+
+    papers = [{"paperId": "oa-1", "title": "Sample Paper", "abstract": "word " * 200, "citationCount": 3}]
+    stats = mod.cache_results("k1", papers)
+    assert stats["storedBytes"] < stats["rawBytes"]
+
+    stored = table.items["k1"]
+    assert stored["fmt"] == mod.CACHE_BLOB_FORMAT
+    assert "papers" not in stored
+    assert isinstance(stored["papers_z"], bytes)
+    assert len(stored["papers_z"]) < len(mod.json.dumps(papers))
+    assert stored["timestamp"].endswith("+00:00")
+    assert mod.check_cache("k1") == papers
+
+
+def test_cache_reads_legacy_uncompressed_items(monkeypatch):
+    mod = load_module("search_lambda", "backend/lambda/search_papers/lambda_function_multisource.py")
+    table = FakeTable()
+    monkeypatch.setattr(mod, "_TABLE", table)
+    legacy_papers = [{"paperId": "oa-2", "title": "Legacy"}]
+    table.put_item({
+        "searchKey": "k2",
+        "timestamp": mod.datetime.now().isoformat(),
+        "papers": legacy_papers,
+    })
+    assert mod.check_cache("k2") == legacy_papers
+
+
+def _papers(n):
+    return [
+        {"paperId": f"p-{i}", "title": f"Paper {i}", "year": 2020 + i, "citationCount": i, "venue": "Venue"}
+        for i in range(n)
+    ]
+
+
+def test_search_summary_uses_slim_schema_for_small_result_sets(monkeypatch):
+    mod = load_module("search_lambda", "backend/lambda/search_papers/lambda_function_multisource.py")
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test-key")
+    captured = []
+
+    def fake_post(url, headers=None, json=None, timeout=None, stream=False, **kwargs):
+        assert stream is True
+        captured.append(json)
+        return FakeStreamResponse(['{"overview": "ok", ', '"key_themes": []}'])
+
+    monkeypatch.setattr(mod.SESSION, "post", fake_post)
+
+    summary = mod.generate_search_summary("q", _papers(4), ["OpenAlex", "Crossref"])
+    assert summary["overview"] == "ok"
+    slim_payload = captured[-1]
+    assert slim_payload["max_tokens"] == mod.AI_SUMMARY_SLIM_MAX_TOKENS
+    assert "research_trends" not in slim_payload["messages"][0]["content"]
+
+    mod.generate_search_summary("q", _papers(8), ["OpenAlex"])
+    full_payload = captured[-1]
+    assert full_payload["max_tokens"] == mod.AI_SUMMARY_MAX_TOKENS
+    assert "research_trends" in full_payload["messages"][0]["content"]
+    assert "recommended_next_queries" not in full_payload["messages"][0]["content"]
+    assert full_payload["prompt_cache_key"] != slim_payload["prompt_cache_key"]
+
+
+class FakeStreamResponse:
+    def __init__(self, pieces, status_code=200):
+        self.status_code = status_code
+        self.encoding = None
+        self._lines = [
+            "data: " + __import__("json").dumps({"choices": [{"delta": {"content": piece}}]})
+            for piece in pieces
+        ] + ["", "data: [DONE]"]
+
+    def iter_lines(self, decode_unicode=False):
+        yield from self._lines
+
+    def raise_for_status(self):
+        return None
+
+
+def test_search_summary_reports_truncated_completion(monkeypatch):
+    mod = load_module("search_lambda", "backend/lambda/search_papers/lambda_function_multisource.py")
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test-key")
+    truncated = FakeStreamResponse(['{"overview": "cut'])
+    truncated._lines.insert(-2, "data: " + json.dumps({"choices": [{"delta": {}, "finish_reason": "length"}]}))
+    monkeypatch.setattr(mod.SESSION, "post", lambda *a, **k: truncated)
+    cached = []
+    monkeypatch.setattr(mod, "cache_summary", lambda *a, **k: cached.append(a))
+
+    summary = mod.generate_search_summary("q", _papers(8), ["OpenAlex"], cache_key="k")
+    assert summary["_meta"]["usedAI"] is False
+    assert "truncated" in summary["_meta"]["error"]
+    assert cached == []
+
+
+def test_read_openai_stream_joins_deltas():
+    mod = load_module("search_lambda", "backend/lambda/search_papers/lambda_function_multisource.py")
+    content = mod.read_openai_stream(FakeStreamResponse(['{"mode": ', '"deep", "one_page_summary": "x"}']))
+    assert mod.json.loads(content) == {"mode": "deep", "one_page_summary": "x"}
+
+
+def test_deep_overview_streams_completion(monkeypatch):
+    mod = load_module("search_lambda", "backend/lambda/search_papers/lambda_function_multisource.py")
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test-key")
+    calls = []
+
+    def fake_post(url, headers=None, json=None, timeout=None, stream=False, **kwargs):
+        calls.append({"payload": json, "stream": stream})
+        return FakeStreamResponse(['{"mode": "deep", ', '"one_page_summary": "Streamed overview"}'])
+
+    monkeypatch.setattr(mod.SESSION, "post", fake_post)
+    deep = mod.generate_deep_overview("q", _papers(6))
+    assert deep["one_page_summary"] == "Streamed overview"
+    assert deep["_meta"]["usedAI"] is True
+    assert calls[0]["stream"] is True
+    assert calls[0]["payload"]["stream"] is True
+
+
+def test_summarize_results_runs_summary_and_deep_overview(monkeypatch):
+    mod = load_module("search_lambda", "backend/lambda/search_papers/lambda_function_multisource.py")
+    monkeypatch.setattr(mod, "generate_search_summary", lambda q, papers, sources, **kw: {"overview": f"{q}:{len(papers)}"})
+    monkeypatch.setattr(mod, "generate_deep_overview", lambda q, papers, **kw: {"mode": "deep", "papersUsed": len(papers)})
+
+    summary, deep = mod.summarize_results(
+        "q", _papers(3), ["OpenAlex"], deep_overview=True, deep_overview_max_papers=None, cache_key="k", force_refresh=False
+    )
+    assert summary == {"overview": "q:3"}
+    assert deep == {"mode": "deep", "papersUsed": 3}
+
+    summary, deep = mod.summarize_results(
+        "q", _papers(3), ["OpenAlex"], deep_overview=False, deep_overview_max_papers=None, cache_key="k", force_refresh=False
+    )
+    assert deep is None
+
+
+class FakeJsonResponse:
+    def __init__(self, body=None, text=""):
+        self.status_code = 200
+        self._body = body or {}
+        self.text = text
+
+    def raise_for_status(self):
+        return None
+
+    def json(self):
+        return self._body
+
+    @property
+    def content(self):
+        return json.dumps(self._body).encode("utf-8")
+
+
+def test_deep_overview_batch_queues_then_collects(monkeypatch):
+    mod = load_module("search_lambda", "backend/lambda/search_papers/lambda_function_multisource.py")
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test-key")
+    monkeypatch.setattr(mod, "_TABLE", FakeTable())
+
+    posted = []
+
+    def fake_post(url, **kwargs):
+        posted.append(url)
+        if url.endswith("/files"):
+            return FakeJsonResponse({"id": "file-in"})
+        if url.endswith("/batches"):
+            return FakeJsonResponse({"id": "batch-1"})
+        raise AssertionError(f"unexpected POST {url}")
+
+    monkeypatch.setattr(mod.SESSION, "post", fake_post)
+    queued = mod.generate_deep_overview("q", _papers(6), cache_key="k", batch=True)
+    assert queued["status"] == "queued"
+    assert queued["batch_id"] == "batch-1"
+    assert posted[-1].endswith("/batches")
+
+    status = {"value": "in_progress"}
+    output = json.dumps({
+        "custom_id": "k",
+        "response": {"status_code": 200, "body": {"choices": [{"message": {"content": "{\"mode\": \"deep\", \"one_page_summary\": \"done\"}"}}]}},
+    })
+
+    def fake_get(url, **kwargs):
+        if url.endswith("/batches/batch-1"):
+            return FakeJsonResponse({"status": status["value"], "output_file_id": "file-out"})
+        if url.endswith("/files/file-out/content"):
+            return FakeJsonResponse(text=output)
+        raise AssertionError(f"unexpected GET {url}")
+
+    monkeypatch.setattr(mod.SESSION, "get", fake_get)
+    still_queued = mod.generate_deep_overview("q", _papers(6), cache_key="k", batch=True)
+    assert still_queued["status"] == "queued"
+
+    status["value"] = "completed"
+    done = mod.generate_deep_overview("q", _papers(6), cache_key="k", batch=True)
+    assert done["one_page_summary"] == "done"
+    assert mod.check_deep_overview_cache("k")["one_page_summary"] == "done"
+
+
+def test_tiny_result_sets_skip_openai(monkeypatch):
+    mod = load_module("search_lambda", "backend/lambda/search_papers/lambda_function_multisource.py")
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test-key")
+
+    def fail_post(*args, **kwargs):
+        raise AssertionError("OpenAI should not be called")
+
+    monkeypatch.setattr(mod.SESSION, "post", fail_post)
+
+    summary = mod.generate_search_summary("q", _papers(2), ["OpenAlex"])
+    assert summary["_meta"]["reason"] == "too_few_papers"
+    assert summary["top_cited"]["title"]
+
+    deep = mod.generate_deep_overview("q", _papers(4))
+    assert deep["_meta"]["reason"] == "too_few_papers"
+
+
+def test_parse_json_content_extracts_wrapped_object():
+    mod = load_module("search_lambda", "backend/lambda/search_papers/lambda_function_multisource.py")
+    assert mod.parse_json_content('{"a": 1}') == {"a": 1}
+    assert mod.parse_json_content('Here you go:\n```json\n{"a": {"b": 2}}\n```') == {"a": {"b": 2}}
+    try:
+        mod.parse_json_content("no json here")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected a parse error")
+
+
+def test_handler_fans_out_sources_and_keeps_priority_order(monkeypatch):
+    import time as _time
+
+    mod = load_module("search_lambda", "backend/lambda/search_papers/lambda_function_multisource.py")
+    monkeypatch.setattr(mod, "_TABLE", None)
+    monkeypatch.setattr(mod, "summarize_results", lambda *a, **kw: ({"overview": "x"}, None))
+
+    def slow_openalex(*args, **kwargs):
+        _time.sleep(0.05)
+        return [{"paperId": "oa", "title": "Slow primary", "year": 2020, "citationCount": 1, "source": "OpenAlex"}]
+
+    def fast_s2(*args, **kwargs):
+        return [{"paperId": "s2", "title": "Fast secondary", "year": 2021, "citationCount": 2, "source": "Semantic Scholar"}]
+
+    def broken_crossref(*args, **kwargs):
+        raise RuntimeError("crossref down")
+
+    monkeypatch.setattr(mod, "search_openalex", slow_openalex)
+    monkeypatch.setattr(mod, "search_semantic_scholar", fast_s2)
+    monkeypatch.setattr(mod, "search_crossref", broken_crossref)
+
+    resp = mod.lambda_handler({"body": json.dumps({"query": "q", "includeCrossref": True, "debug": True})}, None)
+    body = json.loads(resp["body"])
+    assert body["sources"] == ["OpenAlex", "Semantic Scholar"]
+    assert body["debug"]["sources"]["crossref"] == {"ok": False, "error": "crossref down"}
+    assert {p["paperId"] for p in body["papers"]} == {"oa", "s2"}
+
+
+def test_hedged_get_returns_the_faster_duplicate(monkeypatch):
+    import threading
+
+    mod = load_module("search_lambda", "backend/lambda/search_papers/lambda_function_multisource.py")
+    release_first = threading.Event()
+    calls = []
+
+    class Resp:
+        def __init__(self, tag):
+            self.ok = True
+            self.tag = tag
+
+    def fake_get(url, **kwargs):
+        calls.append(kwargs["timeout"])
+        if len(calls) == 1:
+            release_first.wait(2)
+            return Resp("slow")
+        return Resp("hedge")
+
+    monkeypatch.setattr(mod.SESSION, "get", fake_get)
+    try:
+        resp = mod._hedged_get("https://api.openalex.org/works", params={}, hedge_after=0.01)
+    finally:
+        release_first.set()
+
+    assert resp.tag == "hedge"
+    assert len(calls) == 2
+    assert calls[0] == mod.SEARCH_HTTP_TIMEOUT
+
+
+def test_normalize_title_strips_punctuation_and_case():
+    mod = load_module("search_lambda", "backend/lambda/search_papers/lambda_function_multisource.py")
+    assert mod.normalize_title("  Deep-Learning:  A  Survey_ (2nd ed.) ") == "deeplearning a survey 2nd ed"
+    assert mod.normalize_title("Étude   des Réseaux") == "étude des réseaux"
+    assert mod.normalize_title(None) == ""
+
+
+def test_reconstruct_abstract_orders_words_by_position():
+    mod = load_module("search_lambda", "backend/lambda/search_papers/lambda_function_multisource.py")
+    inverted = {"graphs": [3], "We": [0], "study": [1], "random": [2, 5], "and": [4], "walks": [6]}
+    assert mod.reconstruct_abstract(inverted) == "We study random graphs and random walks"
+    assert mod.reconstruct_abstract({}) == ""
+
+
+ARXIV_FEED = b"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xmlns:arxiv="http://arxiv.org/schemas/atom">
+  <title>arXiv Query</title>
+  <entry>
+    <id>http://arxiv.org/abs/2101.00001v2</id>
+    <published>2021-01-01T00:00:00Z</published>
+    <title> Streaming Parsers </title>
+    <summary> First abstract. </summary>
+    <author><name>Ada Lovelace</name></author>
+    <author><name>Alan Turing</name></author>
+  </entry>
+  <entry>
+    <id>http://arxiv.org/abs/2202.00002v1</id>
+    <published>2022-02-02T00:00:00Z</published>
+    <title>Second</title>
+    <summary>Second abstract.</summary>
+    <author><name>Grace Hopper</name></author>
+    <arxiv:doi>10.1000/Journal.2</arxiv:doi>
+  </entry>
+</feed>
+"""
+
+
+def test_search_arxiv_streams_atom_entries(monkeypatch):
+    import io
+
+    mod = load_module("search_lambda", "backend/lambda/search_papers/lambda_function_multisource.py")
+
+    class StreamedFeed:
+        def __init__(self):
+            self.raw = io.BytesIO(ARXIV_FEED)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def raise_for_status(self):
+            return None
+
+    captured = {}
+
+    def fake_get(url, **kwargs):
+        captured.update(kwargs)
+        return StreamedFeed()
+
+    monkeypatch.setattr(mod.SESSION, "get", fake_get)
+    papers = mod.search_arxiv("parsers", 2)
+
+    assert captured["stream"] is True
+    assert [p["paperId"] for p in papers] == ["2101.00001v2", "2202.00002v1"]
+    assert papers[0]["title"] == "Streaming Parsers"
+    assert papers[0]["authors"] == ["Ada Lovelace", "Alan Turing"]
+    assert papers[1]["year"] == 2022
+    assert papers[0]["doi"] == "10.48550/arXiv.2101.00001"
+    assert papers[1]["doi"] == "10.1000/Journal.2"
+
+
+def test_l1_cache_serves_hits_without_dynamodb(monkeypatch):
+    mod = load_module("search_lambda", "backend/lambda/search_papers/lambda_function_multisource.py")
+    table = FakeTable()
+    monkeypatch.setattr(mod, "_TABLE", table)
+
+    papers = [{"paperId": "oa-1", "title": "Hot query"}]
+    mod.cache_results("hot", papers)
+
+    def fail_get_item(Key):
+        raise AssertionError("L1 hit should not reach DynamoDB")
+
+    monkeypatch.setattr(table, "get_item", fail_get_item)
+    assert mod.check_cache("hot") == papers
+
+
+def test_ttl_cache_expires_and_evicts_lru(monkeypatch):
+    mod = load_module("search_lambda", "backend/lambda/search_papers/lambda_function_multisource.py")
+    now = {"t": 100.0}
+    monkeypatch.setattr(mod.time, "monotonic", lambda: now["t"])
+
+    cache = mod._TTLCache(maxsize=2, ttl_seconds=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)  # evicts "b", the least recently used
+    assert cache.get("b") is None
+    now["t"] += 11
+    assert cache.get("a") is None
+
+
+def test_decimal_to_number_converts_nested_values_in_place():
+    from decimal import Decimal
+
+    mod = load_module("search_lambda", "backend/lambda/search_papers/lambda_function_multisource.py")
+    papers = [{"year": Decimal("2021"), "score": Decimal("0.5"), "authors": ["A"]}]
+    item = {"papers": papers, "n": Decimal("3")}
+    out = mod.decimal_to_number(item)
+
+    assert out == {"papers": [{"year": 2021, "score": 0.5, "authors": ["A"]}], "n": 3}
+    assert type(out["papers"][0]["year"]) is int
+    assert out is item and out["papers"] is papers
+    assert mod.decimal_to_number(Decimal("7")) == 7
+    assert mod.decimal_to_number("x") == "x"
+
+
+def test_unpack_cache_blob_converts_decimals_only_for_legacy_items(monkeypatch):
+    from decimal import Decimal
+
+    mod = load_module("search_lambda", "backend/lambda/search_papers/lambda_function_multisource.py")
+    legacy = {"papers": [{"year": Decimal("2020")}]}
+    assert mod.unpack_cache_blob(legacy, "papers_z", "papers") == [{"year": 2020}]
+
+    blob = {"fmt": "z1", "papers_z": mod.zlib.compress(b'[{"year":2020}]')}
+    monkeypatch.setattr(mod, "decimal_to_number", lambda obj: pytest.fail("blob payloads need no Decimal walk"))
+    assert mod.unpack_cache_blob(blob, "papers_z", "papers") == [{"year": 2020}]
+
+
+def test_source_formatters_map_to_common_shape():
+    mod = load_module("search_lambda", "backend/lambda/search_papers/lambda_function_multisource.py")
+    work = {
+        "id": "https://openalex.org/W1",
+        "title": "T",
+        "authorships": [{"author": {"display_name": "A"}}, {"author": {}}],
+        "abstract_inverted_index": {"hello": [0], "world": [1]},
+        "open_access": {"is_oa": True, "oa_url": "https://x/pdf"},
+        "publication_year": 2020,
+        "cited_by_count": None,
+        "primary_location": {"source": {"display_name": "Venue"}},
+    }
+    paper = mod._format_openalex_work(work)
+    assert paper["paperId"] == "W1"
+    assert paper["authors"] == ["A"]
+    assert paper["abstract"] == "hello world"
+    assert paper["citationCount"] == 0
+    assert paper["pdfUrl"] == "https://x/pdf"
+
+    item = {"DOI": "10.1/ABC", "title": ["X"], "issued": {"date-parts": [[2019, 5]]}, "author": [{"given": "G", "family": "F"}]}
+    paper = mod._format_crossref_item(item)
+    assert paper["doi"] == "10.1/abc"
+    assert paper["year"] == 2019
+    assert paper["authors"] == ["G F"]
+
+
+def test_resolve_openalex_concepts_memoizes_topics(monkeypatch):
+    mod = load_module("search_lambda", "backend/lambda/search_papers/lambda_function_multisource.py")
+    calls = []
+
+    def fake_get(url, **kwargs):
+        calls.append(kwargs["params"]["search"])
+        return FakeJsonResponse({"results": [{"id": "https://openalex.org/C41008148"}]})
+
+    monkeypatch.setattr(mod.SESSION, "get", fake_get)
+
+    assert mod.resolve_openalex_concepts("Quantum Computing") == ["C41008148"]
+    assert mod.resolve_openalex_concepts("quantum computing") == ["C41008148"]
+    assert len(calls) == 1
+    assert mod.normalize_concept_ids(["https://openalex.org/C1", "C1", "x"]) == ["C1"]
+
+
+def test_rrf_rewards_papers_ranked_by_multiple_sources():
+    mod = load_module("search_lambda", "backend/lambda/search_papers/lambda_function_multisource.py")
+    oa, next_rank = mod.attach_rank([
+        {"paperId": "a", "title": "Only OpenAlex", "citationCount": 500},
+        {"paperId": "b", "title": "Shared Paper", "doi": "10.1/shared", "citationCount": 5},
+    ], 0, "OpenAlex")
+    s2, _ = mod.attach_rank([
+        {"paperId": "c", "title": "Shared Paper", "doi": "10.1/shared", "citationCount": 5},
+        {"paperId": "d", "title": "Only S2", "citationCount": 1},
+    ], next_rank, "Semantic Scholar")
+
+    unique = mod.deduplicate_papers(oa + s2)
+    shared = next(p for p in unique if p.get("doi") == "10.1/shared")
+    assert shared["_sourceRanks"] == {"OpenAlex": 1, "Semantic Scholar": 0}
+
+    ranked = mod.relevance_rank_rrf(unique, 3, k=60)
+    assert ranked[0]["doi"] == "10.1/shared"
+    assert [p["title"] for p in ranked[1:]] == ["Only OpenAlex", "Only S2"]
+
+
+def test_cache_key_is_fixed_width_hash_of_canonical_params():
+    mod = load_module("search_lambda", "backend/lambda/search_papers/lambda_function_multisource.py")
+    base = mod.build_cache_key("q", "", "relevance", ["C2", "C1"])
+    assert len(base) == 32
+    assert base == mod.build_cache_key("q", "", "relevance", ["C1", "C2"], rank_strategy="diversity")
+    assert base != mod.build_cache_key("q", "", "relevance", ["C1", "C2"], rank_strategy="rrf")
+    assert mod.build_cache_key("q", "", "citations", [], rank_strategy="rrf") == mod.build_cache_key("q", "", "citations", [])
+    assert mod.build_cache_key("q", "", "relevance", [], from_year="2020") == mod.build_cache_key("q", "", "relevance", [], from_year=2020)
+    canonical = mod.canonical_search_params("Q", "", "relevance", [])
+    assert mod.json.loads(canonical)["q"] == "q"
+    assert mod.build_cache_key(" Quantum  ML\t", "Physics ", "relevance", []) == mod.build_cache_key("quantum ml", "physics", "relevance", [])
+
+
+def test_apply_filters_fast_path_and_missing_years():
+    mod = load_module("search_lambda", "backend/lambda/search_papers/lambda_function_multisource.py")
+    papers = [
+        {"paperId": "old", "year": 2001, "citationCount": 50},
+        {"paperId": "new", "year": "2022", "citationCount": 3},
+        {"paperId": "undated", "year": None, "citationCount": 20},
+    ]
+    assert mod.apply_filters(papers) is papers
+    assert mod.apply_filters(papers, from_year="", min_citations=None) is papers
+    assert [p["paperId"] for p in mod.apply_filters(papers, from_year=2010)] == ["new", "undated"]
+    assert [p["paperId"] for p in mod.apply_filters(papers, to_year=2010, min_citations=10)] == ["old", "undated"]
+
+
+def test_arxiv_enrichment_uses_one_batch_request(monkeypatch):
+    mod = load_module("search_lambda", "backend/lambda/search_papers/lambda_function_multisource.py")
+    posted = []
+    fetched = []
+
+    def fake_post(url, params=None, json=None, headers=None, timeout=None):
+        posted.append((url, json["ids"]))
+        return FakeJsonResponse([{"citationCount": 42, "venue": "NeurIPS"}, None])
+
+    class NotFound:
+        status_code = 404
+
+    def fake_get(url, **kwargs):
+        fetched.append(url)
+        return NotFound()
+
+    monkeypatch.setattr(mod.SESSION, "post", fake_post)
+    monkeypatch.setattr(mod.SESSION, "get", fake_get)
+
+    papers = [
+        {"paperId": "2401.00001v2", "venue": "arXiv", "citationCount": 0},
+        {"paperId": "2402.00002v1", "venue": "arXiv", "citationCount": 0},
+    ]
+    out = mod.enrich_arxiv_with_semantic_scholar(papers)
+
+    assert len(posted) == 1
+    assert posted[0][0].endswith("/paper/batch")
+    assert posted[0][1] == ["arXiv:2401.00001", "arXiv:2402.00002"]
+    assert out[0]["citationCount"] == 42 and out[0]["venue"] == "NeurIPS"
+    # Only the unresolved item retries with its versioned ID.
+    assert fetched == ["https://api.semanticscholar.org/graph/v1/paper/arXiv%3A2402.00002v1"]
+
+
+def test_early_exit_skips_slow_sources_once_enough_candidates(monkeypatch):
+    import threading
+
+    mod = load_module("search_lambda", "backend/lambda/search_papers/lambda_function_multisource.py")
+    monkeypatch.setattr(mod, "SEARCH_EARLY_EXIT", True)
+    release = threading.Event()
+
+    def fast_openalex(*args, **kwargs):
+        return [{"paperId": f"oa{i}", "title": f"Paper {i}", "year": 2020} for i in range(100)]
+
+    def slow_s2(*args, **kwargs):
+        release.wait(2)
+        return [{"paperId": "s2", "title": "Late"}]
+
+    monkeypatch.setattr(mod, "search_openalex", fast_openalex)
+    monkeypatch.setattr(mod, "search_semantic_scholar", slow_s2)
+    try:
+        papers, sources, debug = mod.search_all_sources(
+            "q", "", limit=20, source_fetch_limit=40, from_year=None, to_year=None, min_citations=None,
+            sort_mode="relevance", concept_ids=[], include_crossref=False, include_arxiv=False,
+        )
+    finally:
+        release.set()
+
+    assert sources == ["OpenAlex"]
+    assert debug["semanticScholar"]["reason"] == "early_exit"
+    assert len(papers) == 20
+
+
+def test_sort_by_int_fields_matches_dict_sort():
+    mod = load_module("search_lambda", "backend/lambda/search_papers/lambda_function_multisource.py")
+    papers = [
+        {"paperId": "a", "citationCount": 5, "year": 2019},
+        {"paperId": "b", "citationCount": "12", "year": 2021},
+        {"paperId": "c", "citationCount": None, "year": "2022"},
+        {"paperId": "d", "citationCount": 5, "year": 2020},
+        {"paperId": "e", "citationCount": 5, "year": 2020},
+    ]
+    by_citations = mod.sort_by_int_fields(papers, ("citationCount", "year"))
+    by_date = mod.sort_by_int_fields(papers, ("year", "citationCount"))
+
+    assert [p["paperId"] for p in by_citations] == ["b", "d", "e", "a", "c"]
+    assert [p["paperId"] for p in by_date] == ["c", "b", "d", "e", "a"]
+    assert mod.sort_by_int_fields(papers, ("citationCount", "year"), 3) == by_citations[:3]
+
+
+def test_arxiv_enrichment_fallback_runs_lookups_concurrently(monkeypatch):
+    import threading
+
+    mod = load_module("search_lambda", "backend/lambda/search_papers/lambda_function_multisource.py")
+    monkeypatch.setattr(mod, "S2_MIN_REQUEST_INTERVAL_SECONDS", 0)
+    barrier = threading.Barrier(3, timeout=2)
+
+    def failing_post(*args, **kwargs):
+        raise RuntimeError("batch unavailable")
+
+    def fake_get(url, **kwargs):
+        barrier.wait()  # only passes if all three lookups are in flight at once
+        return FakeJsonResponse({"citationCount": 7})
+
+    monkeypatch.setattr(mod.SESSION, "post", failing_post)
+    monkeypatch.setattr(mod.SESSION, "get", fake_get)
+
+    papers = [{"paperId": f"2401.0000{i}", "venue": "arXiv", "citationCount": 0} for i in range(3)]
+    out = mod.enrich_arxiv_with_semantic_scholar(papers)
+
+    assert [p["citationCount"] for p in out] == [7, 7, 7]
+
+
+def test_diversity_rank_orders_sources_by_full_bucket_size():
+    mod = load_module("search_lambda", "backend/lambda/search_papers/lambda_function_multisource.py")
+    papers = [{"paperId": f"a{i}", "title": f"A {i}", "source": "A", "_sourceRank": i} for i in range(3)]
+    papers += [{"paperId": f"b{i}", "title": f"B {i}", "source": "B", "_sourceRank": i} for i in range(5)]
+
+    ranked = mod.relevance_rank_with_source_diversity(papers, 2)
+
+    # B has more candidates, so it leads the interleave even though both buckets are cut to 2.
+    assert [p["paperId"] for p in ranked] == ["b0", "a0"]
+
+
+def test_attach_rank_types_filter_fields_once():
+    mod = load_module("search_lambda", "backend/lambda/search_papers/lambda_function_multisource.py")
+    papers, _ = mod.attach_rank(
+        [{"title": "A", "year": "2021", "citationCount": "9"}, {"title": "B", "year": "n/a", "citationCount": None}],
+        0,
+        "OpenAlex",
+    )
+
+    assert (papers[0]["_yearI"], papers[0]["_citI"]) == (2021, 9)
+    assert (papers[1]["_yearI"], papers[1]["_citI"]) == (None, 0)
+    assert [p["title"] for p in mod.apply_filters(papers, from_year=2020, min_citations=5)] == ["A"]
+
+
+def test_read_openai_stream_stops_at_deadline(monkeypatch):
+    mod = load_module("search_lambda", "backend/lambda/search_papers/lambda_function_multisource.py")
+    monkeypatch.setattr(mod.time, "monotonic", lambda: 100.0)
+
+    try:
+        mod.read_openai_stream(FakeStreamResponse(['{"overview": "x"}']), deadline=99.0)
+    except TimeoutError:
+        pass
+    else:
+        raise AssertionError("expected the stream read to time out")
+
+
+def test_search_summary_is_cached_by_query_and_top_papers(monkeypatch):
+    mod = load_module("search_lambda", "backend/lambda/search_papers/lambda_function_multisource.py")
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test-key")
+    monkeypatch.setattr(mod, "_TABLE", FakeTable())
+    calls = []
+
+    def fake_post(url, headers=None, json=None, timeout=None, stream=False, **kwargs):
+        calls.append(url)
+        return FakeStreamResponse(['{"overview": "fresh", "key_themes": []}'])
+
+    monkeypatch.setattr(mod.SESSION, "post", fake_post)
+
+    first = mod.generate_search_summary("q", _papers(6), ["OpenAlex"], cache_key="k1")
+    # A different search key (e.g. another sort) over the same top papers reuses the summary.
+    second = mod.generate_search_summary("Q ", _papers(6), ["cache"], cache_key="k2")
+
+    assert len(calls) == 1
+    assert first["overview"] == second["overview"] == "fresh"
+    assert second["_meta"]["cached"] is True
+    assert second["top_cited"] == first["top_cited"]
+    assert len(mod._TABLE.items) == 1
+
+    reordered = list(reversed(_papers(6)))
+    mod.generate_search_summary("q", reordered, ["OpenAlex"], cache_key="k1")
+    assert len(calls) == 2
+
+    mod.generate_search_summary("q", _papers(6), ["OpenAlex"], cache_key="k1", force_refresh=True)
+    assert len(calls) == 3
+
+
+def test_deferred_summary_is_queued_then_served_from_cache(monkeypatch):
+    mod = load_module("search_lambda", "backend/lambda/search_papers/lambda_function_multisource.py")
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test-key")
+    monkeypatch.setattr(mod, "_TABLE", FakeTable())
+    sent = []
+
+    class FakeSQS:
+        def send_message(self, QueueUrl, MessageBody):
+            sent.append(MessageBody)
+
+    monkeypatch.setattr(mod, "_SQS", FakeSQS())
+    calls = []
+
+    def fake_post(url, headers=None, json=None, timeout=None, stream=False, **kwargs):
+        calls.append(url)
+        return FakeStreamResponse(['{"overview": "deferred", "key_themes": []}'])
+
+    monkeypatch.setattr(mod.SESSION, "post", fake_post)
+
+    pending = mod.generate_search_summary("q", _papers(6), ["OpenAlex"], cache_key="k1", defer=True)
+    assert pending["status"] == "pending"
+    assert pending["top_cited"]["title"]
+    assert calls == [] and len(sent) == 1
+
+    event = {"Records": [{"eventSource": "aws:sqs", "messageId": "m1", "body": sent[0]}]}
+    assert mod.lambda_handler(event, None) == {"batchItemFailures": []}
+    assert len(calls) == 1
+
+    ready = mod.generate_search_summary("q", _papers(6), ["cache"], cache_key="k1", defer=True)
+    assert ready["overview"] == "deferred"
+    assert ready["_meta"]["cached"] is True
+    assert len(sent) == 1
+
+
+def test_cache_freshness_reads_integer_ttl(monkeypatch):
+    from decimal import Decimal
+
+    mod = load_module("search_lambda", "backend/lambda/search_papers/lambda_function_multisource.py")
+    now = int(mod.time.time())
+    recent = mod.utc_timestamp(now)
+
+    assert mod.cache_item_fresh({"timestamp": recent, "ttl": Decimal(now + 60)}, 3600)
+    assert not mod.cache_item_fresh({"timestamp": recent, "ttl": Decimal(now - 1)}, 3600)
+    # Items written before the ttl attribute existed still age out by timestamp.
+    assert mod.cache_item_fresh({"timestamp": recent}, 3600)
+    assert not mod.cache_item_fresh({"timestamp": mod.utc_timestamp(now - 7200)}, 3600)
+
+
+def test_deep_overview_context_splits_abstract_budget():
+    mod = load_module("search_lambda", "backend/lambda/search_papers/lambda_function_multisource.py")
+    paper = {"title": "T", "year": 2020, "abstract": "x" * 5000, "authors": ["A"], "citationCount": 1}
+
+    few = mod.deep_overview_papers_context("q", [paper] * 4)
+    many = mod.deep_overview_papers_context("q", [paper] * 40)
+
+    assert "x" * 1200 + "…" in few and "x" * 1201 not in few
+    per_paper = max(mod.DEEP_OVERVIEW_ABSTRACT_MIN_CHARS, mod.DEEP_OVERVIEW_ABSTRACT_CHAR_BUDGET // 40)
+    assert per_paper < 1200
+    assert "x" * per_paper + "…" in many and "x" * (per_paper + 1) not in many
+
+
+def test_handler_overlaps_cache_write_with_summary(monkeypatch):
+    import threading
+
+    mod = load_module("search_lambda", "backend/lambda/search_papers/lambda_function_multisource.py")
+    monkeypatch.setattr(mod, "_TABLE", None)
+    summary_started = threading.Event()
+
+    def fake_summarize(*args, **kwargs):
+        summary_started.set()
+        return {"overview": "x"}, None
+
+    def fake_cache_results(cache_key, papers, canonical=None):
+        # Only completes if the summary runs while this write is still in flight.
+        return {"overlapped": summary_started.wait(2)}
+
+    monkeypatch.setattr(mod, "summarize_results", fake_summarize)
+    monkeypatch.setattr(mod, "cache_results", fake_cache_results)
+    monkeypatch.setattr(mod, "search_openalex", lambda *a, **kw: [{"paperId": "oa", "title": "P", "source": "OpenAlex"}])
+    monkeypatch.setattr(mod, "search_semantic_scholar", lambda *a, **kw: [])
+
+    resp = mod.lambda_handler({"body": json.dumps({"query": "q", "includeCrossref": False, "debug": True})}, None)
+
+    assert json.loads(resp["body"])["debug"]["cacheWrite"] == {"overlapped": True}
+
+
+def test_arxiv_and_openalex_records_share_a_doi_key():
+    mod = load_module("search_lambda", "backend/lambda/search_papers/lambda_function_multisource.py")
+    arxiv = {"title": "Streaming Parsers", "doi": "10.48550/arXiv.2101.00001", "source": "arXiv"}
+    openalex = {"title": "Streaming parsers (preprint)", "doi": "https://doi.org/10.48550/arxiv.2101.00001", "source": "OpenAlex"}
+
+    assert mod.dedupe_key(arxiv) == mod.dedupe_key(openalex) == "doi:10.48550/arxiv.2101.00001"
+    assert len(mod.deduplicate_papers([openalex, arxiv])) == 1
+
+
+def test_source_results_are_memoized_across_request_variants(monkeypatch):
+    mod = load_module("search_lambda", "backend/lambda/search_papers/lambda_function_multisource.py")
+    calls = []
+
+    def fake_openalex(*args, **kwargs):
+        calls.append("openalex")
+        return [{"paperId": "oa", "title": "Paper", "citationCount": 3, "source": "OpenAlex"}]
+
+    monkeypatch.setattr(mod, "search_openalex", fake_openalex)
+    monkeypatch.setattr(mod, "search_semantic_scholar", lambda *a, **kw: [])
+    common = dict(
+        limit=5, source_fetch_limit=10, from_year=None, to_year=None, min_citations=None,
+        sort_mode="relevance", concept_ids=[], include_crossref=False, include_arxiv=False,
+    )
+
+    first, _, _ = mod.search_all_sources("q", "", rank_strategy="diversity", **common)
+    second, _, _ = mod.search_all_sources("q", "", rank_strategy="rrf", **common)
+    mod.search_all_sources("q", "", force_refresh=True, **common)
+
+    assert calls == ["openalex", "openalex"]
+    assert first[0]["paperId"] == second[0]["paperId"] == "oa"
+    assert first[0] is not second[0]
+
+
+def test_speculative_summary_starts_before_slow_sources_finish(monkeypatch):
+    import threading
+
+    mod = load_module("search_lambda", "backend/lambda/search_papers/lambda_function_multisource.py")
+    monkeypatch.setattr(mod, "_TABLE", None)
+    monkeypatch.setattr(mod, "SEARCH_SPECULATIVE_SUMMARY", True)
+    summary_started = threading.Event()
+    summary_calls = []
+
+    def fake_summary(query, papers, sources, **kwargs):
+        summary_calls.append((len(papers), sources))
+        summary_started.set()
+        return {"overview": "speculative"}
+
+    def slow_s2(*args, **kwargs):
+        # Returns only once the summary is underway, i.e. the two overlapped.
+        summary_started.wait(2)
+        return [{"paperId": "s2", "title": "Late", "source": "Semantic Scholar"}]
+
+    monkeypatch.setattr(mod, "generate_search_summary", fake_summary)
+    monkeypatch.setattr(mod, "search_openalex", lambda *a, **kw: _papers(4))
+    monkeypatch.setattr(mod, "search_semantic_scholar", slow_s2)
+
+    resp = mod.lambda_handler({"body": json.dumps({"query": "q", "includeCrossref": False})}, None)
+    body = json.loads(resp["body"])
+
+    assert summary_started.is_set()
+    assert summary_calls == [(4, ["OpenAlex"])]
+    assert body["summary"] == {"overview": "speculative"}
+
+
+def test_create_response_gzips_large_bodies_when_accepted():
+    import base64
+    import gzip
+
+    mod = load_module("search_lambda", "backend/lambda/search_papers/lambda_function_multisource.py")
+    body = {"papers": [{"title": "x" * 100} for _ in range(100)]}
+
+    plain = mod.create_response(200, body)
+    packed = mod.create_response(200, body, gzip_ok=True)
+    small = mod.create_response(200, {"ok": True}, gzip_ok=True)
+
+    assert "isBase64Encoded" not in plain and json.loads(plain["body"]) == body
+    assert packed["isBase64Encoded"] is True and packed["headers"]["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(base64.b64decode(packed["body"]))) == body
+    assert json.loads(small["body"]) == {"ok": True}
+    assert mod.accepts_gzip({"headers": {"Accept-Encoding": "gzip, deflate, br"}})
+    assert not mod.accepts_gzip({"headers": None})
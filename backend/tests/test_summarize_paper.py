@@ -28,8 +28,10 @@ def load_module(module_name: str, relative_path: str):
 def mod(monkeypatch):
     module = load_module("summarize_lambda", "backend/lambda/summarize_paper/lambda_function.py")
     # Always neutralize DynamoDB so tests don't touch AWS.
-    monkeypatch.setattr(module, "check_cache", lambda paper_id: None)
-    monkeypatch.setattr(module, "cache_summary", lambda paper_id, summary: None)
+    monkeypatch.setattr(module, "check_cache", lambda paper_id, abstract_hash=None: None)
+    monkeypatch.setattr(module, "check_cache_batch", lambda paper_ids, abstract_hashes=None: {})
+    monkeypatch.setattr(module, "cache_summary", lambda paper_id, summary, abstract_hash=None: None)
+    monkeypatch.setattr(module, "cache_summaries_bulk", lambda items, abstract_hashes=None: None)
     return module
 
 
@@ -61,6 +63,14 @@ def test_generate_summary_falls_back_when_no_api_key(mod, monkeypatch):
     assert summary["methodology"] == "Detailed in full paper"
 
 
+def test_summary_prompt_prefix_is_identical_across_papers(mod):
+    first = mod.build_summary_payload("Paper one", "First abstract.")["messages"]
+    second = mod.build_summary_payload("Paper two", "Second abstract.")["messages"]
+    assert first[0] == second[0]
+    assert "Paper one" not in first[0]["content"]
+    assert first[1]["content"] == "Title: Paper one\n\nAbstract: First abstract."
+
+
 def test_lambda_handler_rejects_missing_title(mod):
     result = _invoke(mod, {"abstract": "some text"})
     assert result["status"] == 400
@@ -76,7 +86,7 @@ def test_lambda_handler_rejects_missing_abstract(mod):
 def test_lambda_handler_does_not_cache_failed_summaries(mod, monkeypatch):
     monkeypatch.setenv("OPENAI_API_KEY", "sk-test-key")
     cache_calls: List[Dict[str, Any]] = []
-    monkeypatch.setattr(mod, "cache_summary", lambda pid, s: cache_calls.append({"id": pid, "summary": s}))
+    monkeypatch.setattr(mod, "cache_summary", lambda pid, s, h=None: cache_calls.append({"id": pid, "summary": s}))
 
     class FailingResponse:
         status_code = 500
@@ -89,7 +99,11 @@ def test_lambda_handler_does_not_cache_failed_summaries(mod, monkeypatch):
             import requests
             raise requests.exceptions.HTTPError("500 server error", response=self)
 
-    monkeypatch.setattr(mod.requests, "post", lambda *a, **k: FailingResponse())
+        def close(self):
+            pass
+
+    monkeypatch.setattr(mod.SESSION, "post", lambda *a, **k: FailingResponse())
+    monkeypatch.setattr(mod.time, "sleep", lambda s: None)
 
     result = _invoke(mod, {"paperId": "p-1", "title": "T", "abstract": "An abstract here."})
     assert result["status"] == 200
@@ -101,7 +115,7 @@ def test_lambda_handler_does_not_cache_failed_summaries(mod, monkeypatch):
 def test_lambda_handler_caches_successful_summaries(mod, monkeypatch):
     monkeypatch.setenv("OPENAI_API_KEY", "sk-test-key")
     cache_calls: List[Dict[str, Any]] = []
-    monkeypatch.setattr(mod, "cache_summary", lambda pid, s: cache_calls.append({"id": pid, "summary": s}))
+    monkeypatch.setattr(mod, "cache_summary", lambda pid, s, h=None: cache_calls.append({"id": pid, "summary": s}))
 
     ai_payload = {
         "key_findings": ["Finding A", "Finding B"],
@@ -113,18 +127,18 @@ def test_lambda_handler_caches_successful_summaries(mod, monkeypatch):
     class OkResponse:
         status_code = 200
         text = ""
+        encoding = None
 
-        def json(self):
-            return {
-                "choices": [
-                    {"message": {"content": json.dumps(ai_payload)}}
-                ]
-            }
+        def iter_lines(self, decode_unicode=False):
+            content = json.dumps(ai_payload)
+            for piece in (content[:10], content[10:]):
+                yield "data: " + json.dumps({"choices": [{"delta": {"content": piece}}]})
+            yield "data: [DONE]"
 
         def raise_for_status(self):
             return None
 
-    monkeypatch.setattr(mod.requests, "post", lambda *a, **k: OkResponse())
+    monkeypatch.setattr(mod.SESSION, "post", lambda *a, **k: OkResponse())
 
     result = _invoke(mod, {"paperId": "p-2", "title": "T", "abstract": "An abstract here."})
     assert result["status"] == 200
@@ -133,11 +147,425 @@ def test_lambda_handler_caches_successful_summaries(mod, monkeypatch):
     assert cache_calls[0]["id"] == "p-2"
 
 
+def test_lambda_handler_does_not_cache_truncated_summaries(mod, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test-key")
+    cache_calls: List[str] = []
+    monkeypatch.setattr(mod, "cache_summary", lambda pid, s, h=None: cache_calls.append(pid))
+
+    class TruncatedResponse:
+        status_code = 200
+        text = ""
+        encoding = None
+
+        def iter_lines(self, decode_unicode=False):
+            yield "data: " + json.dumps({"choices": [{"delta": {"content": '{"key_findings": ["cut'}}]})
+            yield "data: " + json.dumps({"choices": [{"delta": {}, "finish_reason": "length"}]})
+            yield "data: [DONE]"
+
+        def raise_for_status(self):
+            return None
+
+    monkeypatch.setattr(mod.SESSION, "post", lambda *a, **k: TruncatedResponse())
+
+    result = _invoke(mod, {"paperId": "p-4", "title": "T", "abstract": "An abstract here.", "debug": True})
+    assert result["status"] == 200
+    assert result["body"]["summary"]["methodology"] == "Detailed in full paper"
+    assert "truncated" in result["body"]["meta"]["openaiError"]
+    assert cache_calls == []
+
+
 def test_force_refresh_bypasses_cache(mod, monkeypatch):
     monkeypatch.delenv("OPENAI_API_KEY", raising=False)
-    monkeypatch.setattr(mod, "check_cache", lambda pid: {"key_findings": ["cached"], "methodology": "x", "significance": "y", "limitations": "z"})
+    monkeypatch.setattr(mod, "check_cache", lambda pid, h=None: {"key_findings": ["cached"], "methodology": "x", "significance": "y", "limitations": "z"})
 
     result = _invoke(mod, {"paperId": "p-3", "title": "T", "abstract": "abc.", "forceRefresh": True})
     assert result["status"] == 200
     # forceRefresh skips the cache hit and falls back to extract_simple_summary.
     assert result["body"]["summary"]["methodology"] == "Detailed in full paper"
+
+
+def test_batch_summarizes_papers_concurrently(mod, monkeypatch):
+    import threading
+
+    lookups: List[List[str]] = []
+
+    def fake_batch(paper_ids, abstract_hashes=None):
+        lookups.append(sorted(paper_ids))
+        return {"p-cached": {"cached": "p-cached"}}
+
+    monkeypatch.setattr(mod, "check_cache_batch", fake_batch)
+    monkeypatch.setattr(mod, "check_cache", lambda pid, h=None: pytest.fail("per-paper cache lookup in batch mode"))
+    cache_calls: List[str] = []
+    monkeypatch.setattr(mod, "cache_summary", lambda pid, s, h=None: cache_calls.append(pid))
+
+    barrier = threading.Barrier(2, timeout=5)
+
+    def fake_generate(title, abstract):
+        # Both uncached papers must be in flight at once to pass the barrier.
+        barrier.wait()
+        return {"title": title}, {"usedAI": True}
+
+    monkeypatch.setattr(mod, "generate_summary", fake_generate)
+
+    result = _invoke(mod, {"papers": [
+        {"paperId": "p-1", "title": "One", "abstract": "A."},
+        {"paperId": "p-2", "title": "Two", "abstract": "B."},
+        {"paperId": "p-cached", "title": "Three", "abstract": "C."},
+        {"paperId": "p-bad", "title": "Four"},
+    ]})
+    assert result["status"] == 200
+    assert result["body"]["summaries"] == {
+        "p-1": {"title": "One"},
+        "p-2": {"title": "Two"},
+        "p-cached": {"cached": "p-cached"},
+    }
+    assert set(result["body"]["errors"]) == {"p-bad"}
+    assert sorted(cache_calls) == ["p-1", "p-2"]
+    assert lookups == [["p-1", "p-2", "p-cached"]]
+
+
+def _full_summary(paper_id, methodology):
+    return {
+        "id": paper_id,
+        "key_findings": ["finding"],
+        "methodology": methodology,
+        "significance": "matters",
+        "limitations": "none",
+    }
+
+
+def test_batch_packs_papers_into_one_completion(mod, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test-key")
+    monkeypatch.setattr(mod, "PAPERS_PER_REQUEST", 4)
+    bulk_cached: List[str] = []
+    monkeypatch.setattr(mod, "cache_summaries_bulk", lambda items, hashes=None: bulk_cached.extend(pid for pid, _ in items))
+    payloads: List[Dict[str, Any]] = []
+    single = json.dumps({"methodology": "single"})
+
+    # Paper 2 is missing from the model's answer and paper 4 lacks fields.
+    results = [_full_summary(1, "one"), {"id": 4, "methodology": "four"}, _full_summary(3, "three")]
+    bulk = json.dumps({"results": results})
+
+    class Resp:
+        status_code = 200
+        headers: Dict[str, str] = {}
+        encoding = None
+
+        def __init__(self, content):
+            self.content = content
+
+        def raise_for_status(self):
+            pass
+
+        def iter_lines(self, decode_unicode=False):
+            yield "data: " + json.dumps({"choices": [{"delta": {"content": self.content}}]})
+            yield "data: [DONE]"
+
+    def fake_post(url, headers=None, json=None, **kwargs):
+        payloads.append(json)
+        is_bulk = json["messages"][0]["content"] == mod.BULK_SUMMARY_SYSTEM_PROMPT
+        return Resp(bulk if is_bulk else single)
+
+    monkeypatch.setattr(mod.SESSION, "post", fake_post)
+
+    result = _invoke(mod, {"papers": [
+        {"paperId": f"p-{n}", "title": f"T{n}", "abstract": f"Abstract {n}."} for n in (1, 2, 3, 4)
+    ]})
+    summaries = result["body"]["summaries"]
+    assert summaries["p-1"]["methodology"] == "one"
+    assert summaries["p-3"]["methodology"] == "three"
+    assert "id" not in summaries["p-1"]
+    assert summaries["p-2"] == {"methodology": "single"}
+    assert summaries["p-4"] == {"methodology": "single"}
+    assert len(payloads) == 3
+    assert "3. Title: T3" in payloads[0]["messages"][1]["content"]
+    assert payloads[0]["stream"] is True
+    assert payloads[0]["max_tokens"] == 4 * mod.SUMMARY_MAX_TOKENS
+    assert payloads[1]["stream"] is True
+    assert sorted(bulk_cached) == ["p-1", "p-3"]
+
+
+def test_bulk_completion_stays_within_the_output_token_limit(monkeypatch):
+    monkeypatch.setenv("SUMMARIZE_PAPERS_PER_REQUEST", "50")
+    module = load_module("summarize_lambda_capped", "backend/lambda/summarize_paper/lambda_function.py")
+    assert module.PAPERS_PER_REQUEST * module.SUMMARY_MAX_TOKENS <= module.OPENAI_MAX_COMPLETION_TOKENS
+    payload = module.build_bulk_summary_payload([("T", "A.")] * 10)
+    assert payload["max_tokens"] == module.OPENAI_MAX_COMPLETION_TOKENS
+
+
+def test_batch_rejects_oversized_or_empty_lists(mod):
+    assert _invoke(mod, {"papers": []})["status"] == 400
+    too_many = [{"paperId": str(i), "title": "T", "abstract": "A."} for i in range(mod.BATCH_MAX_PAPERS + 1)]
+    assert _invoke(mod, {"papers": too_many})["status"] == 400
+
+
+def test_check_cache_batch_retries_unprocessed_keys(monkeypatch):
+    from datetime import datetime, timedelta
+
+    mod = load_module("summarize_lambda", "backend/lambda/summarize_paper/lambda_function.py")
+    monkeypatch.setattr(mod.time, "sleep", lambda s: None)
+    fresh = datetime.now().isoformat()
+    stale = (datetime.now() - timedelta(days=31)).isoformat()
+    table = mod.table_name
+    calls: List[Dict[str, Any]] = []
+
+    def fake_batch_get_item(RequestItems):
+        calls.append(RequestItems)
+        if len(calls) == 1:
+            return {
+                "Responses": {table: [
+                    {"searchKey": "summary:a", "timestamp": fresh, "summary": {"s": "a"}},
+                    {"searchKey": "summary:b", "timestamp": stale, "summary": {"s": "b"}},
+                ]},
+                "UnprocessedKeys": {table: {"Keys": [{"searchKey": "summary:c"}]}},
+            }
+        return {"Responses": {table: [{"searchKey": "summary:c", "timestamp": fresh, "summary": {"s": "c"}}]}}
+
+    monkeypatch.setattr(mod.dynamodb, "batch_get_item", fake_batch_get_item)
+
+    found = mod.check_cache_batch(["a", "b", "c", "a"])
+    assert found == {"a": {"s": "a"}, "c": {"s": "c"}}
+    assert len(calls[0][table]["Keys"]) == 3
+    assert calls[1] == {table: {"Keys": [{"searchKey": "summary:c"}]}}
+
+
+def test_check_cache_serves_repeat_lookups_from_memory():
+    from datetime import datetime
+
+    mod = load_module("summarize_lambda", "backend/lambda/summarize_paper/lambda_function.py")
+    gets: List[Dict[str, Any]] = []
+
+    class FakeTable:
+        def get_item(self, Key):
+            gets.append(Key)
+            return {"Item": {"searchKey": Key["searchKey"], "timestamp": datetime.now().isoformat(), "summary": {"s": "x"}}}
+
+    mod._TABLE = FakeTable()
+
+    assert mod.check_cache("p1") == {"s": "x"}
+    assert mod.check_cache("p1") == {"s": "x"}
+    assert len(gets) == 1
+
+    # Batch lookups reuse the same in-memory entries and only query DynamoDB for the rest.
+    batch_calls: List[Dict[str, Any]] = []
+    mod.dynamodb.batch_get_item = lambda RequestItems: batch_calls.append(RequestItems) or {"Responses": {}}
+    assert mod.check_cache_batch(["p1", "p2"]) == {"p1": {"s": "x"}}
+    assert batch_calls[0][mod.table_name]["Keys"] == [{"searchKey": "summary:p2"}]
+
+
+def test_check_cache_misses_when_abstract_changed():
+    mod = load_module("summarize_lambda", "backend/lambda/summarize_paper/lambda_function.py")
+    old_hash = mod.abstract_hash("Old abstract.")
+    items = {
+        "summary:p1": mod.summary_item("p1", {"s": "old"}, old_hash),
+        "summary:legacy": mod.summary_item("legacy", {"s": "legacy"}),
+    }
+
+    class FakeTable:
+        def get_item(self, Key):
+            return {"Item": items[Key["searchKey"]]}
+
+    mod._TABLE = FakeTable()
+
+    assert mod.check_cache("p1", old_hash) == {"s": "old"}
+    assert mod.check_cache("p1", mod.abstract_hash("Re-crawled, better abstract.")) is None
+    # Items cached before abstract hashes were stored still count as hits.
+    assert mod.check_cache("legacy", mod.abstract_hash("Anything.")) == {"s": "legacy"}
+
+def test_cache_summaries_bulk_uses_batch_writer():
+    mod = load_module("summarize_lambda", "backend/lambda/summarize_paper/lambda_function.py")
+    written: List[Dict[str, Any]] = []
+    opened: List[Any] = []
+
+    class FakeBatch:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def put_item(self, Item):
+            written.append(Item)
+
+    class FakeTable:
+        def batch_writer(self, overwrite_by_pkeys=None):
+            opened.append(overwrite_by_pkeys)
+            return FakeBatch()
+
+        def get_item(self, Key):
+            raise AssertionError("should be served from memory")
+
+    mod._TABLE = FakeTable()
+    mod.cache_summaries_bulk([("a", {"s": "a"}), ("b", {"s": "b"})])
+    assert opened == [["searchKey"]]
+    assert [item["searchKey"] for item in written] == ["summary:a", "summary:b"]
+    assert all(item["ttl"] > 0 for item in written)
+    assert mod.check_cache("b") == {"s": "b"}
+
+
+def test_generate_summary_falls_back_when_stream_exceeds_deadline(mod, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test-key")
+    clock = {"t": 0.0}
+    monkeypatch.setattr(mod.time, "monotonic", lambda: clock["t"])
+
+    class SlowResponse:
+        status_code = 200
+        encoding = None
+        closed = False
+
+        def iter_lines(self, decode_unicode=False):
+            while True:
+                clock["t"] += 10
+                yield "data: " + json.dumps({"choices": [{"delta": {"content": "x"}}]})
+
+        def raise_for_status(self):
+            return None
+
+        def close(self):
+            SlowResponse.closed = True
+
+    monkeypatch.setattr(mod.SESSION, "post", lambda *a, **k: SlowResponse())
+
+    summary, meta = mod.generate_summary("T", "First. Second.")
+    assert meta["usedAI"] is False
+    assert "TimeoutError" in meta["openaiError"]
+    assert SlowResponse.closed
+    assert summary["methodology"] == "Detailed in full paper"
+
+
+def test_batch_api_submit_and_collect(mod, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test-key")
+    cache_calls: List[str] = []
+    cached_hashes: Dict[str, str] = {}
+
+    def fake_bulk(items, abstract_hashes=None):
+        cache_calls.extend(pid for pid, _ in items)
+        cached_hashes.update(abstract_hashes or {})
+
+    monkeypatch.setattr(mod, "cache_summaries_bulk", fake_bulk)
+    uploads: List[bytes] = []
+
+    class Resp:
+        def __init__(self, payload=None, text=""):
+            self._payload = payload
+            self.text = text
+
+        def json(self):
+            return self._payload
+
+        def raise_for_status(self):
+            return None
+
+    def fake_post(url, headers=None, json=None, data=None, files=None, timeout=None, **kwargs):
+        if url.endswith("/files"):
+            uploads.append(files["file"][1])
+            return Resp({"id": "file-1"})
+        assert json["input_file_id"] == "file-1"
+        return Resp({"id": "batch-1", "status": "validating"})
+
+    monkeypatch.setattr(mod.SESSION, "post", fake_post)
+
+    result = _invoke(mod, {"useBatchApi": True, "papers": [
+        {"paperId": "p-1", "title": "One", "abstract": "A."},
+        {"paperId": "p-2", "title": "Two", "abstract": "B."},
+        {"paperId": "p-3", "title": "Three", "abstract": "C."},
+        {"paperId": "p-4", "title": "Four", "abstract": "D."},
+    ]})
+    assert result["body"]["batch"] == {"batchId": "batch-1", "status": "validating", "count": 4}
+    lines = [json.loads(line) for line in uploads[0].decode().splitlines()]
+    custom_ids = [line["custom_id"] for line in lines]
+    assert custom_ids[:2] == [f"p-1#abstract={mod.abstract_hash('A.')}", f"p-2#abstract={mod.abstract_hash('B.')}"]
+    assert "stream" not in lines[0]["body"]
+
+    def full(pid):
+        return {"key_findings": [pid], "methodology": pid, "significance": "s", "limitations": "l"}
+
+    # p-2 stands in for a batch queued before custom_ids carried the abstract hash;
+    # p-3 returned malformed JSON and p-4 a summary missing fields.
+    output = "\n".join(
+        json.dumps({"custom_id": cid, "response": {"body": {"choices": [{"message": {"content": content}}]}}})
+        for cid, content in (
+            (custom_ids[0], json.dumps(full("p-1"))),
+            ("p-2", json.dumps(full("p-2"))),
+            (custom_ids[2], '{"key_findings": ["cut'),
+            (custom_ids[3], json.dumps({"methodology": "p-4"})),
+        )
+    )
+
+    def fake_get(url, headers=None, timeout=None, **kwargs):
+        if url.endswith("/batches/batch-1"):
+            return Resp({"status": "completed", "output_file_id": "file-out"})
+        return Resp(text=output)
+
+    monkeypatch.setattr(mod.SESSION, "get", fake_get)
+
+    collected = _invoke(mod, {"batchId": "batch-1"})["body"]
+    assert collected["status"] == "completed"
+    assert collected["summaries"] == {"p-1": full("p-1"), "p-2": full("p-2")}
+    assert set(collected["errors"]) == {"p-3", "p-4"}
+    assert sorted(cache_calls) == ["p-1", "p-2"]
+    assert cached_hashes == {"p-1": mod.abstract_hash("A.")}
+
+
+def test_generate_summary_retries_transient_openai_errors(mod, monkeypatch):
+    import requests
+
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test-key")
+    sleeps: List[float] = []
+    monkeypatch.setattr(mod.time, "sleep", sleeps.append)
+    content = json.dumps({"keyFindings": "k", "methodology": "m", "significance": "s"})
+
+    class Resp:
+        def __init__(self, status_code, headers=None):
+            self.status_code = status_code
+            self.headers = headers or {}
+
+        def json(self):
+            return {"error": {"type": "server_error"}}
+
+        def close(self):
+            pass
+
+        def raise_for_status(self):
+            pass
+
+        def iter_lines(self, decode_unicode=False):
+            yield "data: " + json.dumps({"choices": [{"delta": {"content": content}}]})
+            yield "data: [DONE]"
+
+    outcomes = [requests.exceptions.ConnectionError("reset"), Resp(503, {"Retry-After": "2"}), Resp(200)]
+
+    def fake_post(*a, **k):
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(mod.SESSION, "post", fake_post)
+    summary, meta = mod.generate_summary("T", "An abstract here.")
+    assert meta["usedAI"] is True
+    assert meta["retries"] == 2
+    assert summary["keyFindings"] == "k"
+    assert len(sleeps) == 2 and sleeps[1] == 2.0
+
+
+def test_generate_summary_does_not_retry_quota_errors(mod, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test-key")
+    calls: List[int] = []
+
+    class QuotaResponse:
+        status_code = 429
+        headers: Dict[str, str] = {}
+        text = "quota"
+
+        def json(self):
+            return {"error": {"type": "insufficient_quota", "code": "insufficient_quota"}}
+
+        def raise_for_status(self):
+            import requests
+            raise requests.exceptions.HTTPError("429", response=self)
+
+    monkeypatch.setattr(mod.SESSION, "post", lambda *a, **k: calls.append(1) or QuotaResponse())
+    summary, meta = mod.generate_summary("T", "An abstract here.")
+    assert meta["usedAI"] is False
+    assert len(calls) == 1
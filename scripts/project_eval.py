@@ -3,33 +3,58 @@ from __future__ import annotations
 
 import argparse
 import json
+import random
 import re
 import statistics
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Callable, Dict, List, Tuple
 from urllib.error import HTTPError, URLError
 from urllib.request import Request, urlopen
 
 
-def post_json(url: str, payload: Dict[str, Any], timeout: int = 90) -> Tuple[int, Dict[str, Any]]:
+RETRY_STATUSES = {0, 429, 500, 502, 503, 504}
+CITATION_RE = re.compile(r"\[(\d+)\]")
+
+
+def post_json(
+    url: str, payload: Dict[str, Any], timeout: int = 90, attempts: int = 3
+) -> Tuple[int, Dict[str, Any]]:
+    """POST JSON, retrying network errors and 429/5xx with jittered exponential backoff."""
+    for attempt in range(1, attempts + 1):
+        status, data, retry_after = _post_json_once(url, payload, timeout)
+        if status not in RETRY_STATUSES or attempt == attempts:
+            break
+        delay = random.uniform(0, min(20.0, 0.5 * (2 ** attempt)))
+        if retry_after:
+            try:
+                delay = min(float(retry_after), 20.0)
+            except ValueError:
+                pass
+        time.sleep(delay)
+    return status, data
+
+
+def _post_json_once(url: str, payload: Dict[str, Any], timeout: int) -> Tuple[int, Dict[str, Any], str]:
     body = json.dumps(payload).encode("utf-8")
     request = Request(url, data=body, headers={"Content-Type": "application/json"}, method="POST")
     try:
         with urlopen(request, timeout=timeout) as response:
             raw = response.read().decode("utf-8")
             data = json.loads(raw) if raw else {}
-            return int(response.status), data
+            return int(response.status), data, ""
     except HTTPError as e:
         raw = e.read().decode("utf-8") if e.fp else ""
         try:
             payload_out = json.loads(raw) if raw else {}
         except Exception:
             payload_out = {"raw": raw}
-        return int(e.code), payload_out
-    except URLError as e:
-        return 0, {"error": str(e)}
+        return int(e.code), payload_out, e.headers.get("Retry-After", "") if e.headers else ""
+    except (URLError, TimeoutError) as e:
+        return 0, {"error": str(e)}, ""
 
 
 def mean(values: List[float]) -> float:
@@ -38,11 +63,22 @@ def mean(values: List[float]) -> float:
     return float(statistics.mean(values))
 
 
-def run_search_eval(api_url: str, cases: List[Dict[str, Any]]) -> Dict[str, Any]:
+def run_cases(
+    run_case: Callable[[Dict[str, Any]], Dict[str, Any]],
+    cases: List[Dict[str, Any]],
+    concurrency: int,
+) -> List[Dict[str, Any]]:
+    """Run cases on up to `concurrency` threads; results keep the case order."""
+    if concurrency <= 1 or len(cases) <= 1:
+        return [run_case(case) for case in cases]
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(cases))) as pool:
+        return list(pool.map(run_case, cases))
+
+
+def run_search_eval(api_url: str, cases: List[Dict[str, Any]], concurrency: int = 1) -> Dict[str, Any]:
     endpoint = api_url.rstrip("/") + "/search"
-    results: List[Dict[str, Any]] = []
 
-    for case in cases:
+    def run_case(case: Dict[str, Any]) -> Dict[str, Any]:
         payload = {
             "query": case["query"],
             "limit": int(case.get("limit", 12)),
@@ -61,20 +97,19 @@ def run_search_eval(api_url: str, cases: List[Dict[str, Any]]) -> Dict[str, Any]
         distinct_sources = sum(1 for _, v in source_breakdown.items() if int(v or 0) > 0)
         crossref_hits = int(source_breakdown.get("Crossref", 0) or 0)
 
-        results.append(
-            {
-                "name": case.get("name", case["query"]),
-                "query": case["query"],
-                "status": status,
-                "count": int(body.get("count", 0) or 0) if isinstance(body, dict) else 0,
-                "distinctSources": distinct_sources,
-                "crossrefHits": crossref_hits,
-                "passNonEmpty": status == 200 and len(papers) > 0,
-                "sourceBreakdown": source_breakdown,
-                "error": body.get("error") if isinstance(body, dict) else None,
-            }
-        )
+        return {
+            "name": case.get("name", case["query"]),
+            "query": case["query"],
+            "status": status,
+            "count": int(body.get("count", 0) or 0) if isinstance(body, dict) else 0,
+            "distinctSources": distinct_sources,
+            "crossrefHits": crossref_hits,
+            "passNonEmpty": status == 200 and len(papers) > 0,
+            "sourceBreakdown": source_breakdown,
+            "error": body.get("error") if isinstance(body, dict) else None,
+        }
 
+    results = run_cases(run_case, cases, concurrency)
     total = len(results)
     non_empty_rate = sum(1 for r in results if r["passNonEmpty"]) / total if total else 0.0
     avg_source_diversity = mean([float(r["distinctSources"]) for r in results])
@@ -97,9 +132,10 @@ def run_search_eval(api_url: str, cases: List[Dict[str, Any]]) -> Dict[str, Any]
 
 def run_rag_eval(api_url: str, cases: List[Dict[str, Any]], namespace: str) -> Dict[str, Any]:
     endpoint = api_url.rstrip("/") + "/rag"
-    results: List[Dict[str, Any]] = []
 
-    for case in cases:
+    # Cases run one at a time: they share one namespace, so a concurrent ingest would change
+    # what another case's ask retrieves and make scores incomparable between runs.
+    def run_case(case: Dict[str, Any]) -> Dict[str, Any]:
         ingest_payload = {
             "action": "ingest",
             "namespace": namespace,
@@ -126,7 +162,7 @@ def run_rag_eval(api_url: str, cases: List[Dict[str, Any]], namespace: str) -> D
 
         answer = ask_body.get("answer", "") if isinstance(ask_body, dict) else ""
         references = ask_body.get("references", []) if isinstance(ask_body, dict) else []
-        citation_matches = re.findall(r"\[(\d+)\]", answer or "")
+        citation_matches = CITATION_RE.findall(answer or "")
         words = len((answer or "").split())
         citation_density = (len(citation_matches) / max(1.0, words / 100.0)) if words else 0.0
 
@@ -139,31 +175,30 @@ def run_rag_eval(api_url: str, cases: List[Dict[str, Any]], namespace: str) -> D
             and words >= int(case.get("minAnswerWords", 40))
         )
 
-        results.append(
-            {
-                "name": case.get("name", case["question"]),
-                "query": case["query"],
-                "question": case["question"],
-                "ingestStatus": ingest_status,
-                "askStatus": ask_status,
-                "ingestedPapers": int(ingest_body.get("ingestedPapers", 0) or 0)
-                if isinstance(ingest_body, dict)
-                else 0,
-                "retrievedReferences": len(references),
-                "inlineCitationCount": len(citation_matches),
-                "answerWords": words,
-                "citationDensityPer100Words": round(citation_density, 4),
-                "passGroundedProxy": pass_grounded_proxy,
-                "ingestTimedOut": bool(ingest_body.get("timedOut", False))
-                if isinstance(ingest_body, dict)
-                else False,
-                "errors": {
-                    "ingest": ingest_body.get("error") if isinstance(ingest_body, dict) else None,
-                    "ask": ask_body.get("error") if isinstance(ask_body, dict) else None,
-                },
-            }
-        )
+        return {
+            "name": case.get("name", case["question"]),
+            "query": case["query"],
+            "question": case["question"],
+            "ingestStatus": ingest_status,
+            "askStatus": ask_status,
+            "ingestedPapers": int(ingest_body.get("ingestedPapers", 0) or 0)
+            if isinstance(ingest_body, dict)
+            else 0,
+            "retrievedReferences": len(references),
+            "inlineCitationCount": len(citation_matches),
+            "answerWords": words,
+            "citationDensityPer100Words": round(citation_density, 4),
+            "passGroundedProxy": pass_grounded_proxy,
+            "ingestTimedOut": bool(ingest_body.get("timedOut", False))
+            if isinstance(ingest_body, dict)
+            else False,
+            "errors": {
+                "ingest": ingest_body.get("error") if isinstance(ingest_body, dict) else None,
+                "ask": ask_body.get("error") if isinstance(ask_body, dict) else None,
+            },
+        }
 
+    results = [run_case(case) for case in cases]
     total = len(results)
     pass_rate = sum(1 for r in results if r["passGroundedProxy"]) / total if total else 0.0
     avg_citation_density = mean([float(r["citationDensityPer100Words"]) for r in results])
@@ -202,6 +237,12 @@ def main() -> int:
     )
     parser.add_argument("--namespace", default="project-eval", help="Pinecone namespace for RAG eval")
     parser.add_argument("--skip-rag", action="store_true", help="Only run search evaluation")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Search cases run in parallel (1 = sequential); keep low to stay under upstream rate limits. RAG cases always run sequentially",
+    )
     parser.add_argument(
         "--output",
         default="benchmarks/eval/latest_report.json",
@@ -218,7 +259,7 @@ def main() -> int:
     report: Dict[str, Any] = {
         "timestampUtc": datetime.now(timezone.utc).isoformat(),
         "apiUrl": api_url,
-        "search": run_search_eval(api_url, search_cases),
+        "search": run_search_eval(api_url, search_cases, args.concurrency),
     }
 
     if not args.skip_rag: